@@ -1,79 +1,72 @@
 # player.py
 """
 Handles determining the AI's move. Human input is handled in main_gui.py.
+
+The move logic lives in strategies.py; get_ai_move is kept as the
+difficulty-based entry point and resolves the difficulty through the registry.
+get_ai_moves_batch answers many simultaneous games in one call.
 """
-import random
-import time
+from strategies import get_strategy, strategy_class
+from instrumentation import get_logger
 
-# Need to import from the correct modules now
-from board import is_cell_empty, get_empty_cells
-from game_logic import check_win as check_win_logic # Rename to avoid clash if needed
+logger = get_logger("ai_player")
 
 # --- AI Logic ---
-def get_ai_move(board, ai_mark, human_mark, difficulty="hard"): # Add difficulty parameter with default
-    """Determines the AI's next move based on the chosen difficulty."""
-    print(f"AI ({ai_mark}) thinking (Difficulty: {difficulty})...") # Add difficulty to log
-
-    empty_cells_indices = get_empty_cells(board) # Get 0-based indices
-
-    if not empty_cells_indices:
-        print("Error: AI couldn't find a valid move (no empty cells).")
-        return None # No moves possible
-
-    # --- Easy Difficulty ---
-    if difficulty == "easy":
-        move_index = random.choice(empty_cells_indices)
-        print(f"AI (Easy) chooses random move: {move_index + 1}")
-        return move_index + 1 # Return 1-based position
-
-    # --- Hard Difficulty (Existing Logic) ---
-    elif difficulty == "hard":
-        # 1. Check if AI can win
-        for index in empty_cells_indices:
-            temp_board = board[:]
-            temp_board[index] = ai_mark
-            if check_win_logic(temp_board, ai_mark): # Use the imported check_win
-                print(f"AI (Hard) chooses winning move: {index + 1}")
-                return index + 1 # Return 1-based position
-
-        # 2. Check if Human can win and block
-        for index in empty_cells_indices:
-            temp_board = board[:]
-            temp_board[index] = human_mark
-            if check_win_logic(temp_board, human_mark):
-                 print(f"AI (Hard) blocks human at: {index + 1}")
-                 return index + 1
-
-        # 3. Try center
-        center_index = 4
-        if center_index in empty_cells_indices:
-            print("AI (Hard) takes center")
-            return center_index + 1
+def _strategy_for(difficulty, time_budget_ms=None, node_budget=None):
+    """Returns the shared strategy for a difficulty, falling back to easy if it is unknown."""
+    try:
+        options = strategy_class(difficulty).defaults
+    except ValueError:
+        # Fallback for unknown difficulty - default to easy
+        logger.warning("Unknown difficulty '%s'. Defaulting to easy.", difficulty)
+        difficulty, options = "easy", {}
+    config = {}
+    if time_budget_ms is not None and "time_budget_ms" in options:
+        config["time_budget_ms"] = time_budget_ms
+    if node_budget is not None and "node_budget" in options:
+        config["node_budget"] = node_budget
+    return get_strategy(difficulty, **config)
 
-        # 4. Try corners
-        corner_indices = [0, 2, 6, 8]
-        available_corners = [i for i in corner_indices if i in empty_cells_indices]
-        if available_corners:
-            move = random.choice(available_corners) # Keep random choice among corners
-            print(f"AI (Hard) takes corner: {move + 1}")
-            return move + 1
+def get_ai_move(board, ai_mark, human_mark, difficulty="hard", time_budget_ms=None, node_budget=None, rng=None):
+    """
+    Determines the AI's next move based on the chosen difficulty (any strategy
+    name or alias from strategies.py). The "search" difficulty is an anytime
+    search limited by time_budget_ms and/or node_budget (see search.py).
+    rng (random.Random) breaks ties; the default is the random module.
+    """
+    return _strategy_for(difficulty, time_budget_ms, node_budget).get_move(board, ai_mark, human_mark, rng)
 
-        # 5. Try sides
-        side_indices = [1, 3, 5, 7]
-        available_sides = [i for i in side_indices if i in empty_cells_indices]
-        if available_sides:
-            move = random.choice(available_sides) # Keep random choice among sides
-            print(f"AI (Hard) takes side: {move + 1}")
-            return move + 1
+def get_ai_moves_batch(boards, ai_marks, difficulties="hard", rngs=None):
+    """
+    Returns the AI's moves (1-based, None for full boards) for many games at
+    once. ai_marks and difficulties are either one value for every game or a
+    list with one per game; rngs is an optional list with a random.Random per
+    game. Games are grouped by strategy, identical positions within a group
+    are evaluated once, and the "hard" rules run in one vectorized pass when
+    NumPy is installed. Each game's tie-break is still drawn from its own rng,
+    so the result equals get_ai_move(board, mark, other, difficulty, rng=rng)
+    game by game.
+    """
+    count = len(boards)
+    if isinstance(ai_marks, str):
+        ai_marks = [ai_marks] * count
+    if isinstance(difficulties, str):
+        difficulties = [difficulties] * count
+    if rngs is None:
+        rngs = [None] * count
 
-        # Fallback (Should only happen if board is full, handled above)
-        # If we reach here with empty cells, something is wrong, but let's be safe
-        print(f"AI (Hard) choosing random from remaining: {empty_cells_indices}")
-        move_index = random.choice(empty_cells_indices)
-        return move_index + 1
+    groups = {} # strategy -> indices of its games, in order
+    strategies = {}
+    for n, difficulty in enumerate(difficulties):
+        strategy = strategies.get(difficulty)
+        if strategy is None:
+            strategy = strategies[difficulty] = _strategy_for(difficulty)
+        groups.setdefault(strategy, []).append(n)
 
-    else:
-        # Fallback for unknown difficulty - default to easy? Or raise error?
-        print(f"Warning: Unknown difficulty '{difficulty}'. Defaulting to easy.")
-        move_index = random.choice(empty_cells_indices)
-        return move_index + 1 
\ No newline at end of file
+    moves = [None] * count
+    for strategy, indices in groups.items():
+        results = strategy.get_moves_batch([boards[n] for n in indices], [ai_marks[n] for n in indices],
+                                           [rngs[n] for n in indices])
+        for n, move in zip(indices, results):
+            moves[n] = move
+    return moves
@@ -0,0 +1,73 @@
+# ai_worker.py
+"""
+Runs AI move computation off the render thread.
+
+AIWorker hands move computations (ai_player.get_ai_move by default) to a
+background executor - a thread by default, or worker processes for
+CPU-heavy searches - and reports each result through an
+on_result(position, token) callback. In the pygame front ends that callback
+posts a custom event (see pygame_adapter.ai_result_poster), so the main loop
+keeps ticking at a steady frame rate while the AI thinks.
+
+The token identifies the request (Game uses its round number). cancel()
+drops requests that have not started yet; callers ignore results whose
+token is stale, so a "Play Again?" click mid-think never applies an old move.
+"""
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from ai_player import get_ai_move
+from instrumentation import get_logger
+
+logger = get_logger("ai_worker")
+
+
+class AIWorker:
+    """Computes AI moves in the background and reports them via a callback."""
+    def __init__(self, on_result, move_function=get_ai_move, use_processes=False, max_workers=1):
+        """
+        on_result(position, token) is called from the worker side with each move.
+        move_function(board, *args) computes the move (must be picklable for processes).
+        """
+        self.on_result = on_result
+        self.move_function = move_function
+        if use_processes: # Sidesteps the GIL for expensive searches
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-worker")
+        self._pending = set()
+
+    def submit(self, token, board, *args, move_function=None):
+        """
+        Starts computing move_function(snapshot of board, *args) for request `token`.
+        move_function overrides the worker's default (e.g. a Game's strategy.get_move).
+        """
+        future = self._executor.submit(move_function or self.move_function, list(board), *args)
+        self._pending.add(future)
+        future.add_done_callback(lambda done: self._finish(done, token))
+        return future
+
+    def _finish(self, future, token):
+        """Done-callback (runs on the worker side): forwards the result unless cancelled."""
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("AI worker failed: %r", error)
+            self.on_result(None, token)
+            return
+        self.on_result(future.result(), token)
+
+    def cancel(self):
+        """Cancels requests that have not started; running ones finish but callers drop them."""
+        for future in list(self._pending):
+            future.cancel()
+
+    def is_busy(self):
+        """Checks if a move is still being computed."""
+        return any(not future.done() for future in self._pending)
+
+    def shutdown(self):
+        """Stops the executor without waiting for a move in progress."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
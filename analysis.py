@@ -0,0 +1,103 @@
+# analysis.py
+"""
+Position analysis for hint overlays and coaching tools.
+
+analyze(board, to_move) evaluates every legal move with the perfect-play
+solver (solver.py). For each move it gives the result for the player to move
+(win/draw/loss) and the number of plies until the game ends under perfect
+play. It also returns the best moves and the principal variation.
+
+Results are immutable and sit behind a bounded LRU cache keyed by the board
+contents, so asking again for the same position (e.g. every frame) is a
+dictionary lookup. cache_info() reports hits/misses; set_cache_size()
+changes the bound.
+"""
+import functools
+from collections import namedtuple
+
+from board import get_empty_cells
+from game_logic import check_win
+from game_state import GameState
+import solver
+
+WIN, DRAW, LOSS = 'win', 'draw', 'loss'
+_FLIP = {WIN: LOSS, LOSS: WIN, DRAW: DRAW} # A result seen from the other player's side
+DEFAULT_CACHE_SIZE = 4096 # There are only 5478 reachable positions; this holds most of them
+
+# Value of one move for the player making it
+MoveEvaluation = namedtuple('MoveEvaluation', ['position', 'result', 'plies'])
+
+# result/plies: value of the position for to_move; cells: a MoveEvaluation per
+# cell (index 0-8, None if occupied); best_moves and principal_variation hold
+# 1-based positions (the variation alternates players, starting with to_move)
+Analysis = namedtuple('Analysis', ['to_move', 'result', 'plies', 'cells', 'best_moves', 'principal_variation'])
+
+def _other(mark):
+    return 'O' if mark == 'X' else 'X'
+
+def _solved_value(cells, to_move):
+    """Returns (result, plies) for the player to move on a list board."""
+    if check_win(cells, _other(to_move)):
+        return LOSS, 0
+    if check_win(cells, to_move):
+        return WIN, 0 # Not reachable in a real game, but well defined
+    empty = cells.count(' ')
+    if not empty:
+        return DRAW, 0
+    score = solver.evaluate(cells, to_move) # >0 win, larger = sooner (see solver.py)
+    if score == 0:
+        return DRAW, empty
+    return (WIN if score > 0 else LOSS), empty - abs(score) + 1
+
+def _analyze(cells, to_move):
+    """Uncached analysis of a board given as a tuple of cells."""
+    board = list(cells)
+    result, plies = _solved_value(board, to_move)
+    evaluations = [None] * len(board)
+    if plies: # Game not over
+        other = _other(to_move)
+        for index in get_empty_cells(board):
+            board[index] = to_move
+            child_result, child_plies = _solved_value(board, other)
+            board[index] = ' '
+            evaluations[index] = MoveEvaluation(index + 1, _FLIP[child_result], child_plies + 1)
+    best_moves = tuple(e.position for e in evaluations
+                       if e is not None and e.result == result and e.plies == plies)
+
+    # Principal variation: from each position, play the lowest-numbered best move
+    variation = []
+    mark, line_result, line_plies = to_move, result, plies
+    while line_plies:
+        other = _other(mark)
+        for index in get_empty_cells(board):
+            board[index] = mark
+            child_result, child_plies = _solved_value(board, other)
+            if child_result == _FLIP[line_result] and child_plies == line_plies - 1:
+                break
+            board[index] = ' '
+        variation.append(index + 1)
+        mark, line_result, line_plies = other, child_result, child_plies
+    return Analysis(to_move, result, plies, tuple(evaluations), best_moves, tuple(variation))
+
+_cached_analyze = functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_analyze)
+
+def analyze(board, to_move):
+    """
+    Returns an Analysis of `board` (list, BitBoard or GameState) for the player
+    `to_move`. Results are cached; treat them as read-only.
+    """
+    if isinstance(board, GameState):
+        board = board.board
+    return _cached_analyze(tuple(board), to_move)
+
+def cache_info():
+    """Returns the cache statistics (hits, misses, maxsize, currsize)."""
+    return _cached_analyze.cache_info()
+
+def clear_cache():
+    _cached_analyze.cache_clear()
+
+def set_cache_size(maxsize):
+    """Replaces the cache with an empty one holding up to maxsize positions (None: unbounded)."""
+    global _cached_analyze
+    _cached_analyze = functools.lru_cache(maxsize=maxsize)(_analyze)
@@ -0,0 +1,76 @@
+# animation.py
+"""
+Time-based tweens for the pygame front ends.
+
+An animation's progress comes from the time elapsed since it started, not
+from a frame count. It takes the same time at any frame rate, and a late
+frame just jumps ahead. Animator keeps the running tweens by key (e.g.
+('mark', 4) or 'win_line'). A renderer calls frame() once per render to
+get every tween's eased progress. The main loop passes animator.active() to
+FrameLoop.wait(animating=...), so it only runs at full FPS while something
+is moving and sleeps otherwise.
+
+Pure logic (no pygame), like game.py; gui.RetainedRenderer does the drawing.
+"""
+import time
+
+# --- Easing functions: map linear progress 0..1 to eased progress 0..1 ---
+def linear(t):
+    return t
+
+def ease_out_cubic(t):
+    """Fast start, gentle stop."""
+    return 1.0 - (1.0 - t) ** 3
+
+def ease_in_out_cubic(t):
+    return 4.0 * t ** 3 if t < 0.5 else 1.0 - (-2.0 * t + 2.0) ** 3 / 2.0
+
+
+class Tween:
+    """One animation: starts at `start` (clock seconds) and lasts duration_ms."""
+    __slots__ = ('start', 'duration', 'easing')
+
+    def __init__(self, start, duration_ms, easing=ease_out_cubic):
+        self.start = start
+        self.duration = duration_ms / 1000.0
+        self.easing = easing
+
+    def progress(self, now):
+        """Returns the eased progress at time `now` (1.0 once finished)."""
+        if self.duration <= 0:
+            return 1.0
+        t = (now - self.start) / self.duration
+        return self.easing(min(1.0, max(0.0, t)))
+
+    def done(self, now):
+        return now - self.start >= self.duration
+
+
+class Animator:
+    """Keeps the running tweens by key; clock() returns the time in seconds (default: perf_counter)."""
+    def __init__(self, clock=None):
+        self.clock = clock or time.perf_counter
+        self._tweens = {}
+
+    def start(self, key, duration_ms, easing=ease_out_cubic):
+        """Starts (or restarts) the tween `key`."""
+        self._tweens[key] = Tween(self.clock(), duration_ms, easing)
+
+    def frame(self):
+        """
+        Returns {key: eased progress} for the current frame. A tween that has
+        finished is reported once with 1.0 (so its final state gets drawn) and
+        then dropped.
+        """
+        now = self.clock()
+        progress = {key: tween.progress(now) for key, tween in self._tweens.items()}
+        for key in [key for key, tween in self._tweens.items() if tween.done(now)]:
+            del self._tweens[key]
+        return progress
+
+    def active(self):
+        """True while any tween still has frames to draw."""
+        return bool(self._tweens)
+
+    def clear(self):
+        self._tweens.clear()
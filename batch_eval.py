@@ -0,0 +1,148 @@
+# batch_eval.py
+"""
+Vectorized NumPy evaluation of many boards at once.
+
+Boards are an (N, 9) int8 array using EMPTY=0, X=1, O=2 in the same flat
+order as board.py. evaluate_batch() returns, for every board, the results
+of check_win/check_draw/get_empty_cells and optionally the "hard" move from
+ai_player.get_ai_move - without a Python loop over boards.
+test_batch_eval.py checks the results against the scalar functions on every
+possible 3x3 board.
+
+Requires NumPy (pip install numpy).
+"""
+try:
+    import numpy as np
+except ImportError as exc: # pragma: no cover - depends on environment
+    raise ImportError("batch_eval requires NumPy: pip install numpy") from exc
+
+from game_logic import WINNING_COMBINATIONS_INFO
+
+EMPTY, X, O = 0, 1, 2
+MARK_CODES = {' ': EMPTY, 'X': X, 'O': O}
+CODE_MARKS = {code: mark for mark, code in MARK_CODES.items()}
+
+# (8, 3) cell indices of each line, in WINNING_COMBINATIONS_INFO order
+LINES = np.array([combo for _, _, combo in WINNING_COMBINATIONS_INFO], dtype=np.intp)
+# (24, 9) one-hot map from (line, slot) to cell, used to scatter line results back to cells
+_LINE_SLOT_TO_CELL = np.zeros((LINES.size, 9), dtype=np.int8)
+_LINE_SLOT_TO_CELL[np.arange(LINES.size), LINES.ravel()] = 1
+
+CENTER_MASK = np.zeros(9, dtype=bool)
+CENTER_MASK[4] = True
+CORNER_MASK = np.zeros(9, dtype=bool)
+CORNER_MASK[[0, 2, 6, 8]] = True
+SIDE_MASK = np.zeros(9, dtype=bool)
+SIDE_MASK[[1, 3, 5, 7]] = True
+
+# Which rule of the "hard" AI picked the move
+BRANCH_NONE, BRANCH_WIN, BRANCH_BLOCK, BRANCH_CENTER, BRANCH_CORNER, BRANCH_SIDE = range(6)
+BRANCH_NAMES = ("none", "win", "block", "center", "corner", "side")
+
+def boards_to_array(boards):
+    """Converts an iterable of list boards (' ', 'X', 'O') to an (N, 9) int8 array."""
+    return np.array([[MARK_CODES[cell] for cell in board] for board in boards], dtype=np.int8).reshape(-1, 9)
+
+def array_to_boards(array):
+    """Converts an (N, 9) int8 array back to a list of list boards."""
+    return [[CODE_MARKS[int(code)] for code in row] for row in array]
+
+def _first_true(mask):
+    """Returns the index of the first True per row, or -1 for rows with none."""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), -1).astype(np.int8)
+
+def _completing_cells(line_cells, empty, code):
+    """
+    (N, 9) mask of empty cells after which `code` has a line - like the scalar
+    place-and-check_win scan, any cell counts if a line is already complete.
+    """
+    own = (line_cells == code).sum(axis=2)
+    empty_slots = line_cells == EMPTY
+    two_and_gap = (own == 2) & (empty_slots.sum(axis=2) == 1)
+    slots = empty_slots & two_and_gap[:, :, None] # (N, 8, 3)
+    cells = (slots.reshape(len(line_cells), -1).astype(np.int8) @ _LINE_SLOT_TO_CELL) > 0
+    already_won = (own == 3).any(axis=1)
+    return cells | (empty & already_won[:, None])
+
+def hard_candidates(boards, ai_code):
+    """
+    Deterministic part of the "hard" strategy (win, block, center, corner, side).
+    Returns (branch, candidates): branch holds the BRANCH_* code of the rule
+    that applies and candidates the (N, 9) mask of the cells it allows.
+    """
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, 9)
+    human_code = O if ai_code == X else X
+    count = len(boards)
+    empty = boards == EMPTY
+    line_cells = boards[:, LINES]
+
+    win_cells = _completing_cells(line_cells, empty, ai_code)
+    block_cells = _completing_cells(line_cells, empty, human_code)
+    center_cells = empty & CENTER_MASK
+    corner_cells = empty & CORNER_MASK
+    side_cells = empty & SIDE_MASK
+
+    branch = np.full(count, BRANCH_NONE, dtype=np.int8)
+    candidates = np.zeros((count, 9), dtype=bool)
+    undecided = np.ones(count, dtype=bool)
+    # Rules are applied in priority order; each only fills still-undecided boards
+    for code, cells in ((BRANCH_WIN, win_cells), (BRANCH_BLOCK, block_cells),
+                        (BRANCH_CENTER, center_cells), (BRANCH_CORNER, corner_cells),
+                        (BRANCH_SIDE, side_cells)):
+        fires = undecided & cells.any(axis=1)
+        branch[fires] = code
+        candidates[fires] = cells[fires]
+        undecided &= ~fires
+    return branch, candidates
+
+def hard_moves(boards, ai_code, rng=None):
+    """
+    Vectorized "hard" strategy. Returns (move, branch, candidates): move is a
+    0-based index (-1 when the board is full), branch and candidates come from
+    hard_candidates(). Corner/side ties are broken with rng (a numpy
+    Generator, default np.random.default_rng()).
+    """
+    branch, candidates = hard_candidates(boards, ai_code)
+
+    # Win/block take the lowest cell (like the scalar scan); corner/side pick at random
+    move = _first_true(candidates)
+    random_rows = (branch == BRANCH_CORNER) | (branch == BRANCH_SIDE)
+    if random_rows.any():
+        if rng is None:
+            rng = np.random.default_rng()
+        keys = rng.random((int(random_rows.sum()), 9))
+        keys[~candidates[random_rows]] = -1.0
+        move[random_rows] = keys.argmax(axis=1)
+    return move, branch, candidates
+
+def evaluate_batch(boards, ai_mark=None, rng=None):
+    """
+    Evaluates an (N, 9) int8 array of boards. Returns a dict of arrays:
+      'winner'      int8 (N,)   0 none, 1 X, 2 O (X is checked first)
+      'win_line'    int8 (N,)   index into WINNING_COMBINATIONS_INFO of the winner's line, -1 if none
+      'draw'        bool (N,)   board full and nobody has won
+      'legal_moves' bool (N, 9) empty cells
+    With ai_mark ('X' or 'O') also 'hard_move' (-1 for full or won boards),
+    'hard_branch' and 'hard_candidates' from hard_moves().
+    """
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, 9)
+    line_cells = boards[:, LINES]
+    x_lines = (line_cells == X).all(axis=2)
+    o_lines = (line_cells == O).all(axis=2)
+    x_line = _first_true(x_lines)
+    o_line = _first_true(o_lines)
+
+    winner = np.where(x_line >= 0, X, np.where(o_line >= 0, O, EMPTY)).astype(np.int8)
+    legal_moves = boards == EMPTY
+    result = {
+        'winner': winner,
+        'win_line': np.where(x_line >= 0, x_line, o_line).astype(np.int8),
+        'draw': ~legal_moves.any(axis=1) & (winner == EMPTY),
+        'legal_moves': legal_moves,
+    }
+    if ai_mark is not None:
+        move, branch, candidates = hard_moves(boards, MARK_CODES[ai_mark], rng)
+        result['hard_move'] = np.where(winner == EMPTY, move, -1) # Like get_ai_move: no move once won
+        result['hard_branch'] = branch
+        result['hard_candidates'] = candidates
+    return result
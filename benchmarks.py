@@ -0,0 +1,215 @@
+# benchmarks.py
+"""
+Microbenchmarks and regression check for the engine hot paths.
+
+Each benchmark runs a fixed operation over a fixed set of representative
+positions with a fixed RNG seed, and reports operations per second. Results
+can be written to JSON and compared with a stored baseline; any benchmark
+slower than the baseline by more than the threshold is a regression and
+makes the command exit with status 1.
+
+Usage:
+    python benchmarks.py --save-baseline            # record bench_baseline.json
+    python benchmarks.py --threshold 0.10           # compare against it
+    python benchmarks.py --filter ai_ --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+from board import place_mark, get_empty_cells
+from game_logic import check_win, check_draw
+import ai_player
+import player
+import simulate
+from seeding import game_rng
+
+SEED = 12345
+DEFAULT_BASELINE = 'bench_baseline.json'
+DEFAULT_THRESHOLD = 0.10 # 10% slower than baseline counts as a regression
+
+def _board(cells):
+    """Builds a list board from a 9-character string ('.' for empty)."""
+    return [' ' if c == '.' else c for c in cells]
+
+# Representative positions (X to move when counts are equal, else O)
+POSITIONS = [
+    _board("........."), # Empty board
+    _board("....X...."), # Center opening
+    _board("X...O...."), # Corner vs center
+    _board("X.......O"), # Opposite corners
+    _board("XO..X...."), # X threatens the diagonal
+    _board("X.O.X...O"), # Mid-game, O has blocked
+    _board("XX.OO...."), # Both sides have a winning move
+    _board("X...O...X"), # Fork setup against "hard"
+    _board("XOXOXO..."), # Late game
+    _board("XOXXOOOX."), # One cell left
+]
+
+def _mover(board):
+    """Returns (to_move, other) for a position where X moved first."""
+    return ('X', 'O') if board.count('X') == board.count('O') else ('O', 'X')
+
+# --- Benchmark bodies: each returns (callable, operations per call) ---
+def _bench_place_mark():
+    boards = [b[:] for b in POSITIONS]
+    moves = [(b, get_empty_cells(b)[0] + 1) for b in boards if get_empty_cells(b)]
+    def run():
+        for board, position in moves:
+            place_mark(board, position, 'X')
+            board[position - 1] = ' ' # Undo so the next call sees the same positions
+    return run, len(moves)
+
+def _bench_get_empty_cells():
+    def run():
+        for board in POSITIONS:
+            get_empty_cells(board)
+    return run, len(POSITIONS)
+
+def _bench_check_win():
+    def run():
+        for board in POSITIONS:
+            check_win(board, 'X')
+            check_win(board, 'O')
+    return run, 2 * len(POSITIONS)
+
+def _bench_check_draw():
+    def run():
+        for board in POSITIONS:
+            check_draw(board)
+    return run, len(POSITIONS)
+
+def _open_positions():
+    return [b for b in POSITIONS if get_empty_cells(b)]
+
+def _bench_ai_player(difficulty):
+    def make():
+        positions = [(b, *_mover(b)) for b in _open_positions()]
+        rng = random.Random(SEED)
+        def run():
+            for board, to_move, other in positions:
+                ai_player.get_ai_move(board, to_move, other, difficulty, rng=rng)
+        return run, len(positions)
+    return make
+
+def _bench_ai_player_batch(difficulty, games=1024):
+    def make():
+        # Many simultaneous games cycling through the positions (so some repeat)
+        open_positions = _open_positions()
+        positions = [open_positions[n % len(open_positions)] for n in range(games)]
+        marks = [_mover(b)[0] for b in positions]
+        rngs = [game_rng(SEED, n) for n in range(games)]
+        def run():
+            ai_player.get_ai_moves_batch(positions, marks, difficulty, rngs)
+        return run, games
+    return make
+
+def _bench_player():
+    positions = [(b, *_mover(b)) for b in _open_positions()]
+    rng = random.Random(SEED)
+    def run():
+        for board, to_move, other in positions:
+            player.get_ai_move(board, to_move, other, rng)
+    return run, len(positions)
+
+def _bench_headless_games(x_difficulty, o_difficulty):
+    def make():
+        rng = random.Random(SEED)
+        def run():
+            simulate.play_game(x_difficulty, o_difficulty, rng=rng)
+        return run, 1
+    return make
+
+BENCHMARKS = {
+    'board.place_mark': _bench_place_mark,
+    'board.get_empty_cells': _bench_get_empty_cells,
+    'game_logic.check_win': _bench_check_win,
+    'game_logic.check_draw': _bench_check_draw,
+    'ai_player.get_ai_move[easy]': _bench_ai_player("easy"),
+    'ai_player.get_ai_move[hard]': _bench_ai_player("hard"),
+    'ai_player.get_ai_move[impossible]': _bench_ai_player("impossible"),
+    'ai_player.get_ai_moves_batch[hard]': _bench_ai_player_batch("hard"),
+    'player.get_ai_move': _bench_player,
+    'games[hard_vs_hard]': _bench_headless_games("hard", "hard"),
+    'games[easy_vs_hard]': _bench_headless_games("easy", "hard"),
+    'games[impossible_vs_impossible]': _bench_headless_games("impossible", "impossible"),
+}
+
+def run_benchmark(name, repeat=5):
+    """Runs one benchmark; returns its best-of-`repeat` throughput."""
+    random.seed(SEED) # For anything still drawing from the module-level RNG
+    func, ops_per_call = BENCHMARKS[name]()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange() # Calls per sample so one sample takes >= 0.2s
+    best = min(timer.repeat(repeat=repeat, number=number))
+    ops_per_sec = number * ops_per_call / best
+    return {'ops_per_sec': ops_per_sec, 'ns_per_op': 1e9 / ops_per_sec}
+
+def run_benchmarks(names=None, repeat=5):
+    """Runs the selected benchmarks (all by default) and returns {name: result}."""
+    return {name: run_benchmark(name, repeat) for name in (names or BENCHMARKS)}
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares results with baseline results. Returns a list of
+    (name, baseline ops/s, current ops/s, change) for regressions beyond threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['ops_per_sec']
+        change = result['ops_per_sec'] / before - 1.0
+        if change < -threshold:
+            regressions.append((name, before, result['ops_per_sec'], change))
+    return regressions
+
+def _environment():
+    """Describes where the numbers came from (stored with every results file)."""
+    return {'python': sys.version.split()[0], 'implementation': platform.python_implementation(),
+            'machine': platform.machine(), 'seed': SEED}
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the Tic-Tac-Toe hot paths.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark (best is kept)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    for name in names:
+        results[name] = result = run_benchmark(name, args.repeat)
+        line = f"{name:<36} {result['ops_per_sec']:>14,.0f} ops/s {result['ns_per_op']:>12,.0f} ns/op"
+        if name in baseline:
+            line += f"  ({result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1.0:+.1%} vs baseline)"
+        print(line)
+
+    document = {'environment': _environment(), 'results': results}
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Wrote {path}")
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:,.0f} -> {after:,.0f} ops/s ({change:+.1%})")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# bitboard.py
+"""
+Compact Tic-Tac-Toe board built on two 9-bit integers, one per mark.
+
+Bit i (0-8) of x_bits/o_bits is set when cell i holds that mark, using the
+same flat indexing as board.py. BitBoard also behaves like the list board
+(indexing, assignment, iteration, `' ' in board`) so Game, main_gui.py and
+gui.draw_figures keep working when handed one.
+"""
+from game_logic import WINNING_COMBINATIONS_INFO
+
+FULL_MASK = 0b111111111 # All nine cells occupied
+EMPTY = ' '
+X_MARK = 'X'
+O_MARK = 'O'
+
+# Win masks in the same order as WINNING_COMBINATIONS_INFO: (mask, (win_type, index))
+WIN_MASKS = [
+    (sum(1 << i for i in combo), (win_type, index))
+    for win_type, index, combo in WINNING_COMBINATIONS_INFO
+]
+
+def _first_win(bits):
+    """Returns the (win_type, index) of the first win mask covered by bits, else None."""
+    for mask, info in WIN_MASKS:
+        if bits & mask == mask:
+            return info
+    return None
+
+# Every 9-bit pattern resolved once, so lookups are a single index
+WIN_TABLE = [_first_win(bits) for bits in range(FULL_MASK + 1)]
+EMPTY_CELLS_TABLE = [
+    tuple(i for i in range(9) if not occupied >> i & 1)
+    for occupied in range(FULL_MASK + 1)
+]
+
+
+class BitBoard:
+    """A 3x3 board stored as two 9-bit integers (X and O)."""
+    __slots__ = ('x_bits', 'o_bits')
+
+    def __init__(self, x_bits=0, o_bits=0):
+        """Creates a board from raw bit patterns (empty by default)."""
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+
+    # --- Conversion layer ---
+    @classmethod
+    def from_list(cls, board):
+        """Builds a BitBoard from a list board of ' ', 'X' and 'O'."""
+        x_bits = o_bits = 0
+        for i, cell in enumerate(board):
+            if cell == X_MARK:
+                x_bits |= 1 << i
+            elif cell == O_MARK:
+                o_bits |= 1 << i
+        return cls(x_bits, o_bits)
+
+    def to_list(self):
+        """Returns the equivalent list board (as produced by board.initialize_board)."""
+        return [self[i] for i in range(9)]
+
+    def copy(self):
+        """Returns an independent copy of this board."""
+        return BitBoard(self.x_bits, self.o_bits)
+
+    # --- Board operations (mirror board.py / game_logic.py) ---
+    def bits_for(self, mark):
+        """Returns the bit pattern of the given mark ('X' or 'O')."""
+        if mark == X_MARK:
+            return self.x_bits
+        if mark == O_MARK:
+            return self.o_bits
+        raise ValueError(f"Unknown mark: {mark!r}")
+
+    def occupied(self):
+        """Returns the bit pattern of all occupied cells."""
+        return self.x_bits | self.o_bits
+
+    def is_cell_empty(self, position):
+        """Checks if the cell at the given position (1-9) is empty."""
+        if 1 <= position <= 9:
+            return not (self.x_bits | self.o_bits) >> (position - 1) & 1
+        return False
+
+    def place_mark(self, position, mark):
+        """Places the mark at the given position (1-9). Returns True on success."""
+        if not self.is_cell_empty(position):
+            return False
+        bit = 1 << (position - 1)
+        if mark == X_MARK:
+            self.x_bits |= bit
+        elif mark == O_MARK:
+            self.o_bits |= bit
+        else:
+            raise ValueError(f"Unknown mark: {mark!r}")
+        return True
+
+    def get_empty_cells(self):
+        """Returns a tuple of indices (0-8) of empty cells."""
+        return EMPTY_CELLS_TABLE[self.x_bits | self.o_bits]
+
+    def is_board_full(self):
+        """Checks if the board has any empty cells left."""
+        return self.x_bits | self.o_bits == FULL_MASK
+
+    def check_win(self, mark):
+        """Returns (win_type, index) if the given mark has won, else None."""
+        return WIN_TABLE[self.bits_for(mark)]
+
+    def check_draw(self):
+        """Checks if the board is full (same contract as game_logic.check_draw)."""
+        return self.x_bits | self.o_bits == FULL_MASK
+
+    # --- List-like behaviour so list-based callers keep working ---
+    def __len__(self):
+        return 9
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index == slice(None):
+                return self.copy() # board[:] stays a cheap BitBoard copy
+            return self.to_list()[index]
+        if index < 0:
+            index += 9
+        if not 0 <= index < 9:
+            raise IndexError("board index out of range")
+        if self.x_bits >> index & 1:
+            return X_MARK
+        if self.o_bits >> index & 1:
+            return O_MARK
+        return EMPTY
+
+    def __setitem__(self, index, mark):
+        if index < 0:
+            index += 9
+        if not 0 <= index < 9:
+            raise IndexError("board index out of range")
+        bit = 1 << index
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        if mark == X_MARK:
+            self.x_bits |= bit
+        elif mark == O_MARK:
+            self.o_bits |= bit
+        elif mark != EMPTY:
+            raise ValueError(f"Unknown mark: {mark!r}")
+
+    def __iter__(self):
+        return (self[i] for i in range(9))
+
+    def __contains__(self, mark):
+        if mark == EMPTY:
+            return self.x_bits | self.o_bits != FULL_MASK
+        if mark == X_MARK:
+            return self.x_bits != 0
+        if mark == O_MARK:
+            return self.o_bits != 0
+        return False
+
+    def __eq__(self, other):
+        if isinstance(other, BitBoard):
+            return self.x_bits == other.x_bits and self.o_bits == other.o_bits
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"BitBoard({self.to_list()!r})"
+
+
+def initialize_bitboard():
+    """Creates and returns an empty BitBoard."""
+    return BitBoard()
@@ -0,0 +1,84 @@
+# event_loop.py
+"""
+Event-driven frame pacing for the pygame main loops.
+
+Instead of spinning at a fixed FPS, the loop sleeps in pygame.event.wait
+until input, a timer or an AI-result event arrives, so an unattended window
+uses next to no CPU. While an animation runs, wait() wakes at the active
+frame rate instead. FrameLoop also records process CPU use, wake-ups and
+the latency from wake-up to the display update, so the savings can be
+measured (see report()).
+"""
+
+import time
+
+import pygame
+
+ACTIVE_FPS = 30 # Frame rate while something is animating
+IDLE_TIMEOUT_MS = 1000 # Longest sleep when idle (only wakes to keep stats fresh)
+
+
+class FrameLoop:
+    """Waits for events with a timeout and keeps idle/latency statistics."""
+    def __init__(self, active_fps=ACTIVE_FPS, idle_timeout_ms=IDLE_TIMEOUT_MS):
+        self.frame_ms = 1000.0 / active_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self._next_frame = time.perf_counter()
+        self._wake_time = None
+        # Statistics
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self.wakeups = 0
+        self.idle_timeouts = 0 # Wake-ups with no events
+        self.frames = 0 # Display updates
+        self._latency_total = 0.0
+
+    def wait(self, animating=False):
+        """
+        Sleeps until events arrive (or the next animation frame is due) and
+        returns all pending events.
+        """
+        if animating:
+            now = time.perf_counter()
+            timeout_ms = max(0, int((self._next_frame - now) * 1000))
+            self._next_frame = max(self._next_frame + self.frame_ms / 1000.0, now)
+        else:
+            timeout_ms = self.idle_timeout_ms
+            self._next_frame = time.perf_counter()
+
+        # wait(0) would block forever; a frame that is already due only polls
+        event = pygame.event.wait(timeout_ms) if timeout_ms > 0 else pygame.event.poll()
+        self._wake_time = time.perf_counter()
+        self.wakeups += 1
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get()) # Drain anything that arrived meanwhile
+        if not events:
+            self.idle_timeouts += 1
+        return events
+
+    def frame_presented(self):
+        """Records that the display was updated in response to the last wake-up."""
+        if self._wake_time is not None:
+            self.frames += 1
+            self._latency_total += time.perf_counter() - self._wake_time
+
+    def stats(self):
+        """Returns a dict of loop statistics since construction."""
+        wall = time.perf_counter() - self._start_wall
+        cpu = time.process_time() - self._start_cpu
+        return {
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'cpu_percent': 100.0 * cpu / wall if wall else 0.0,
+            'wakeups': self.wakeups,
+            'idle_timeouts': self.idle_timeouts,
+            'frames': self.frames,
+            'avg_frame_latency_ms': 1000.0 * self._latency_total / self.frames if self.frames else 0.0,
+        }
+
+    def report(self):
+        """Returns a one-line summary of the loop statistics."""
+        s = self.stats()
+        return (f"Loop stats: {s['cpu_percent']:.1f}% CPU over {s['wall_s']:.1f}s, "
+                f"{s['wakeups']} wake-ups ({s['idle_timeouts']} idle), {s['frames']} frames, "
+                f"avg frame latency {s['avg_frame_latency_ms']:.2f} ms")
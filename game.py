@@ -1,79 +1,146 @@
 """
 Contains the Game class that manages the overall state and flow of Tic-Tac-Toe.
+
+Game is pure logic: it has no pygame dependency. Timing of the AI move is
+delegated to a scheduler and drawing/click mapping to a renderer, so pygame
+(see pygame_adapter.py) is just one possible front end.
 """
 
-import pygame # Needed for timer event
+import random
 
 # Import game components
-from board import initialize_board, place_mark, is_cell_empty
-from game_logic import check_win, check_draw
-from ai_player import get_ai_move
-import gui # Might need constants from here initially
+from game_state import GameState
+from strategies import create_strategy
+from instrumentation import get_logger, metrics
+from seeding import child_rng
+
+logger = get_logger("game")
 
 # Player marks (can be moved to constants.py later)
 HUMAN_PLAYER = 'X'
 AI_PLAYER = 'O'
 AI_DELAY_MS = 500 # Delay before AI makes a move
 
+
+class ImmediateScheduler:
+    """
+    Default scheduler: runs the callback straight away, ignoring the delay.
+
+    A scheduler needs two methods: schedule(delay_ms, callback), which arranges
+    for callback() to run once after roughly delay_ms, and cancel(), which drops
+    anything still pending.
+    """
+    def schedule(self, delay_ms, callback):
+        callback()
+
+    def cancel(self):
+        pass
+
+
 class Game:
     """Manages the Tic-Tac-Toe game state and logic."""
-    def __init__(self, difficulty="hard"):
-        """Initializes a new game."""
-        self.board = initialize_board()
+    def __init__(self, difficulty="hard", scheduler=None, renderer=None, ai_worker=None,
+                 ai_delay_ms=AI_DELAY_MS, recorder=None, rng=None, **strategy_config):
+        """
+        Initializes a new game.
+        difficulty is a strategy name or alias from strategies.py (e.g. "hard",
+        "perfect", "search") or a Strategy instance; strategy_config is passed
+        to the strategy when it is created by name.
+        renderer (optional) needs draw(screen, game) and board_position_at(pos).
+        ai_worker (optional, see ai_worker.py) computes AI moves in the background;
+        its results must be passed back to apply_ai_move.
+        ai_delay_ms is the pause before the AI moves.
+        recorder (optional, a game_record.GameRecorder) receives every game played.
+        Callbacks added with add_listener() are told about every move and reset.
+        rng (a random.Random, default: unseeded) drives the AI's random choices;
+        each AI turn gets a child RNG drawn from it, so a seeded rng replays the
+        same games whether moves are computed inline, in a thread or in another process.
+        """
+        self.state = GameState() # Incremental win/draw tracking
+        self.board = self.state.board # List board shared with the tracker (used for drawing)
         self.current_player = HUMAN_PLAYER # Human starts
         self.game_over = False
         self.winner = None
         self.winning_line_info = None # (type, index) or None
-        self.ai_move_event = pygame.USEREVENT + 1 # Custom event for AI move timer
-        self.difficulty = difficulty # Store the difficulty
+        if isinstance(difficulty, str):
+            self.strategy = create_strategy(difficulty, **strategy_config) # One instance per game session
+        else:
+            self.strategy = difficulty
+        self.difficulty = difficulty if isinstance(difficulty, str) else self.strategy.name
+        self.scheduler = scheduler if scheduler is not None else ImmediateScheduler()
+        self.renderer = renderer
+        self.ai_worker = ai_worker
+        self.ai_delay_ms = ai_delay_ms
+        self.recorder = recorder
+        self.rng = rng if rng is not None else random.Random()
+        self.listeners = [] # callback(event, *args), see add_listener
+        self._recorded = False # True once the current game has been written to the recorder
+        self.round = 0 # Bumped on reset so late AI results from an old round are dropped
 
     def reset(self):
-        """Resets the game to the initial state."""
-        self.board = initialize_board()
+        """Resets the game to the initial state (recording the old one first)."""
+        self.save_record()
+        self._recorded = False
+        self.state = GameState()
+        self.board = self.state.board
         self.current_player = HUMAN_PLAYER
         self.game_over = False
         self.winner = None
         self.winning_line_info = None
         # We keep the difficulty selected for the session unless changed elsewhere
-        pygame.time.set_timer(self.ai_move_event, 0)
+        self.scheduler.cancel()
+        self.round += 1
+        self.strategy.new_game()
+        if self.ai_worker:
+            self.ai_worker.cancel() # Any move still being computed is now stale
+        self._notify('reset', self.current_player)
+
+    def add_listener(self, callback):
+        """
+        Registers callback(event, *args) for state changes (e.g. relay.GameRelay):
+        ('move', index, mark) after each move (0-based index) and
+        ('reset', first_player) when a new game starts.
+        """
+        self.listeners.append(callback)
+
+    def _notify(self, event, *args):
+        for callback in self.listeners:
+            callback(event, *args)
 
     def handle_click(self, pos):
-        """Handles a mouse click event at the given (x, y) position."""
-        if self.game_over or self.current_player != HUMAN_PLAYER:
-            return # Ignore clicks if game over or not human's turn
+        """Handles a mouse click event at the given (x, y) position (needs a renderer)."""
+        self.handle_position(self.renderer.board_position_at(pos))
 
-        clicked_position = self._get_clicked_board_pos(pos)
-        if clicked_position and is_cell_empty(self.board, clicked_position):
-            self._make_move(clicked_position, HUMAN_PLAYER)
-
-    def _get_clicked_board_pos(self, pos):
-        """Converts mouse click coordinates (x, y) to board position (1-9)."""
-        x, y = pos
-        # Check if click is within the board area (adjust based on gui constants)
-        if y > gui.HEIGHT - 100: # Example: Clicked below board/status area
-            return None
-
-        # Assuming gui.SQUARE_SIZE, gui.BOARD_ROWS, gui.BOARD_COLS are available
-        row = y // gui.SQUARE_SIZE
-        col = x // gui.SQUARE_SIZE
+    def handle_position(self, position):
+        """Handles the human choosing a board position (1-9)."""
+        if self.game_over or self.current_player != HUMAN_PLAYER:
+            return # Ignore input if game over or not human's turn
 
-        if 0 <= row < gui.BOARD_ROWS and 0 <= col < gui.BOARD_COLS:
-            return row * gui.BOARD_COLS + col + 1
-        else:
-            return None
+        if position and self.state.is_cell_empty(position):
+            self._make_move(position, HUMAN_PLAYER)
 
     def _make_move(self, position, player):
         """Places a mark on the board and checks the game status."""
-        if place_mark(self.board, position, player):
-            win_info = check_win(self.board, player)
+        if self.state.place_mark(position, player):
+            if metrics.enabled:
+                metrics.incr("game.moves")
+            if self.listeners:
+                self._notify('move', position - 1, player)
+            win_info = self.state.check_win(player) # O(1): updated by place_mark
             if win_info:
                 self.winner = player
                 self.winning_line_info = win_info
                 self.game_over = True
-                print(f"Game Over! Winner: {self.winner}")
-            elif check_draw(self.board):
+                logger.info("Game Over! Winner: %s", self.winner)
+                self.save_record()
+                if metrics.enabled:
+                    metrics.incr(f"game.result.{player}")
+            elif self.state.check_draw():
                 self.game_over = True
-                print("Game Over! It's a Draw!")
+                logger.info("Game Over! It's a Draw!")
+                self.save_record()
+                if metrics.enabled:
+                    metrics.incr("game.result.draw")
             else:
                 self._switch_player()
 
@@ -81,42 +148,48 @@ class Game:
         """Switches the current player and triggers AI move if necessary."""
         if self.current_player == HUMAN_PLAYER:
             self.current_player = AI_PLAYER
-            # Start a timer for the AI's move
-            pygame.time.set_timer(self.ai_move_event, AI_DELAY_MS, 1) # 1 means run once
-            print(f"Switched to AI ({AI_PLAYER}). Starting timer.")
+            logger.debug("Switched to AI (%s). Starting timer.", AI_PLAYER)
+            # Ask the scheduler to run the AI's move after the delay
+            self.scheduler.schedule(self.ai_delay_ms, self.handle_ai_turn)
         else:
             self.current_player = HUMAN_PLAYER
-            print(f"Switched to Human ({HUMAN_PLAYER}).")
+            logger.debug("Switched to Human (%s).", HUMAN_PLAYER)
 
 
     def handle_ai_turn(self):
         """Handles the AI's turn when triggered by the timer event."""
         if not self.game_over and self.current_player == AI_PLAYER:
-            # Pass the stored difficulty to the AI
-            ai_position = get_ai_move(self.board, AI_PLAYER, HUMAN_PLAYER, self.difficulty)
-            if ai_position:
-                print(f"AI ({self.difficulty}) chooses position {ai_position}") # Log difficulty
-                self._make_move(ai_position, AI_PLAYER)
-            else:
-                # Handle case where AI fails to move (should not happen)
-                print("Error: AI failed to find a valid move.")
-                self.game_over = True # Force game over? Or maybe a draw?
+            rng = child_rng(self.rng)
+            if self.ai_worker:
+                # Compute in the background; the result comes back via apply_ai_move
+                self.ai_worker.submit(self.round, self.board, AI_PLAYER, HUMAN_PLAYER, rng,
+                                      move_function=self.strategy.get_move)
+                return
+            # The strategy reuses our GameState for its win/block checks
+            ai_position = self.strategy.get_move(self.state, AI_PLAYER, HUMAN_PLAYER, rng)
+            self.apply_ai_move(ai_position, self.round)
+
+    def apply_ai_move(self, ai_position, round_number):
+        """Plays an AI move computed for the given round (stale rounds are ignored)."""
+        if round_number != self.round or self.game_over or self.current_player != AI_PLAYER:
+            logger.debug("Discarding stale AI move %s.", ai_position)
+            if metrics.enabled:
+                metrics.incr("game.stale_ai_moves")
+            return
+        if ai_position:
+            logger.debug("AI (%s) chooses position %s", self.difficulty, ai_position) # Log difficulty
+            self._make_move(ai_position, AI_PLAYER)
+        else:
+            # Handle case where AI fails to move (should not happen)
+            logger.error("AI failed to find a valid move.")
+            self.game_over = True # Force game over? Or maybe a draw?
+
+    def save_record(self):
+        """Writes the current game to the recorder once (unfinished games are marked as such)."""
+        if self.recorder and not self._recorded and self.state.move_count:
+            self.recorder.record_state(self.state, self.winner, self.game_over)
+            self._recorded = True
 
     def draw(self, screen):
-        """Calls the GUI functions to draw the current game state."""
-        # Clear screen (might be done in main loop)
-        # screen.fill(gui.BG_COLOR) # Decide if clearing happens here or in main.py
-
-        gui.draw_lines(screen)
-        gui.draw_figures(screen, self.board)
-
-        if self.game_over:
-            message = f"Player {self.winner} Wins!" if self.winner else "It's a Draw!"
-            gui.draw_game_over(screen, message, self.winning_line_info)
-            # The button drawing/rect handling might stay in main.py or move here
-            # play_again_button_rect = gui.draw_play_again_button(screen)
-            # return play_again_button_rect # Return rect if needed by main
-        else:
-            status_message = f"Player {self.current_player}'s Turn"
-            gui.draw_status(screen, status_message)
-        # return None # Return None if no button rect needed 
\ No newline at end of file
+        """Asks the renderer to draw the current game state; returns what the renderer returns."""
+        return self.renderer.draw(screen, self)
@@ -0,0 +1,251 @@
+# game_record.py
+"""
+Compact, append-only game records.
+
+A record file is MAGIC followed by fixed-size 5-byte records, one per game.
+Each record is a 40-bit little-endian integer made of ten 4-bit nibbles:
+
+    nibble 0     bit 0: first player (0 = X, 1 = O)
+                 bits 1-2: result (0 unfinished, 1 X won, 2 O won, 3 draw)
+    nibbles 1-9  moves in order as 1-based positions; 0 ends the game early
+
+Marks alternate from the first player, so they are not stored. Since records
+have a fixed size, files can be appended from many sources, split at any
+multiple of RECORD_SIZE, and streamed in large blocks.
+
+read_games() streams a file as GameRecord tuples without loading it into
+memory. replay() re-validates a record with board.place_mark and
+game_logic.check_win, and analyze() aggregates statistics.
+
+Usage:
+    python game_record.py stats games.rec
+    python game_record.py show games.rec --index 0
+"""
+import argparse
+import os
+from collections import Counter, namedtuple
+
+from board import initialize_board, place_mark
+from game_logic import check_win, check_draw
+
+MAGIC = b'TTTREC01'
+RECORD_SIZE = 5
+MAX_MOVES = 9
+RESULT_UNFINISHED, RESULT_X, RESULT_O, RESULT_DRAW = 0, 1, 2, 3
+RESULT_NAMES = {RESULT_UNFINISHED: 'unfinished', RESULT_X: 'X', RESULT_O: 'O', RESULT_DRAW: 'draw'}
+READ_BLOCK_RECORDS = 1 << 16 # Records per read() when streaming
+
+# moves is a tuple of 1-based positions; result is one of the RESULT_* codes
+GameRecord = namedtuple('GameRecord', ['first_player', 'moves', 'result'])
+
+
+class InvalidRecord(ValueError):
+    """Raised when a record is not a legal game or its stored result is wrong."""
+
+
+def result_code(winner, finished):
+    """Returns the RESULT_* code for a winner mark (or None) and whether the game ended."""
+    if winner == 'X':
+        return RESULT_X
+    if winner == 'O':
+        return RESULT_O
+    return RESULT_DRAW if finished else RESULT_UNFINISHED
+
+def encode(moves, first_player='X', result=RESULT_UNFINISHED):
+    """Packs a game into RECORD_SIZE bytes."""
+    if len(moves) > MAX_MOVES:
+        raise ValueError(f"too many moves: {len(moves)}")
+    value = (first_player == 'O') | result << 1
+    for n, position in enumerate(moves, start=1):
+        if not 1 <= position <= 9:
+            raise ValueError(f"invalid position {position!r}")
+        value |= position << (4 * n)
+    return value.to_bytes(RECORD_SIZE, 'little')
+
+def decode(data):
+    """Unpacks RECORD_SIZE bytes into a GameRecord (InvalidRecord for a position above 9)."""
+    value = int.from_bytes(data, 'little')
+    moves = []
+    for shift in range(4, 4 * (MAX_MOVES + 1), 4):
+        position = value >> shift & 0xF
+        if not position:
+            break
+        if position > 9:
+            raise InvalidRecord(f"invalid position {position} in move {len(moves) + 1}")
+        moves.append(position)
+    return GameRecord('O' if value & 1 else 'X', tuple(moves), value >> 1 & 0b11)
+
+def encode_state(state, winner=None, finished=None):
+    """Packs the moves made on a game_state.GameState (defaults: its own winner/full board)."""
+    history = state.history
+    first_player = history[0][1] if history else 'X'
+    winner = state.winner() if winner is None else winner
+    finished = (winner is not None or state.check_draw()) if finished is None else finished
+    return encode([index + 1 for index, _ in history], first_player, result_code(winner, finished))
+
+
+def _create_record_file(path):
+    """
+    Creates path holding just MAGIC, unless it already exists. The header is
+    written to a temporary file that is then linked into place, so a
+    concurrent writer never appends to a file whose header is still missing.
+    """
+    if os.path.exists(path):
+        return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+    try:
+        os.link(tmp_path, path) # Fails if another writer created it first
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+
+
+class GameRecorder:
+    """
+    Appends records to a file (created with its header if it doesn't exist).
+    Several processes may append to the same file: it is opened in append
+    mode and only whole records are written.
+    """
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = path
+        _create_record_file(path)
+        self._file = open(path, 'ab', buffering=buffer_size)
+        self.count = 0
+
+    def write(self, record_bytes):
+        """Appends one or more already encoded records."""
+        self._file.write(record_bytes)
+        self.count += len(record_bytes) // RECORD_SIZE
+
+    def record(self, moves, first_player='X', result=RESULT_UNFINISHED):
+        self.write(encode(moves, first_player, result))
+
+    def record_state(self, state, winner=None, finished=None):
+        """Records the game played on a GameState (see encode_state); empty games are skipped."""
+        if state.history:
+            self.write(encode_state(state, winner, finished))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_recorder_from_environment():
+    """Returns a GameRecorder for $TTT_RECORD_FILE, or None if it isn't set."""
+    path = os.environ.get("TTT_RECORD_FILE")
+    return GameRecorder(path) if path else None
+
+def iter_record_bytes(path, start=0, block_records=READ_BLOCK_RECORDS):
+    """Yields the raw bytes of each record, starting at record index `start`."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a game record file")
+        f.seek(len(MAGIC) + start * RECORD_SIZE)
+        while True:
+            block = f.read(block_records * RECORD_SIZE)
+            if not block:
+                return
+            usable = len(block) - len(block) % RECORD_SIZE # Ignore a torn final record
+            for offset in range(0, usable, RECORD_SIZE):
+                yield block[offset:offset + RECORD_SIZE]
+
+def read_games(path, start=0):
+    """Streams the games in a record file as GameRecord tuples."""
+    for data in iter_record_bytes(path, start):
+        yield decode(data)
+
+def count_records(path):
+    """Returns the number of complete records in a file (without reading them)."""
+    return (os.path.getsize(path) - len(MAGIC)) // RECORD_SIZE
+
+def replay(record):
+    """
+    Replays a record on a list board with place_mark/check_win and returns the
+    final board. Raises InvalidRecord if a move is illegal, a move follows a
+    win, or the stored result disagrees with the replay.
+    """
+    board = initialize_board()
+    player = record.first_player
+    other = 'O' if player == 'X' else 'X'
+    winner = None
+    for n, position in enumerate(record.moves):
+        if winner:
+            raise InvalidRecord(f"move {n + 1} played after {winner} won")
+        if not place_mark(board, position, player):
+            raise InvalidRecord(f"move {n + 1} ({position}) is on an occupied cell")
+        if check_win(board, player):
+            winner = player
+        player, other = other, player
+    expected = result_code(winner, winner is not None or check_draw(board))
+    if record.result != expected:
+        raise InvalidRecord(f"stored result {RESULT_NAMES[record.result]}, replay gives {RESULT_NAMES[expected]}")
+    return board
+
+def analyze(games):
+    """
+    Validates and aggregates an iterable of GameRecords or raw record bytes
+    (e.g. iter_record_bytes(path), so undecodable records count as invalid).
+    Returns a dict of counts: games, invalid, results, lengths, openings.
+    """
+    stats = {'games': 0, 'invalid': 0, 'results': Counter(), 'lengths': Counter(), 'openings': Counter()}
+    for record in games:
+        stats['games'] += 1
+        try:
+            if isinstance(record, bytes):
+                record = decode(record)
+            replay(record)
+        except InvalidRecord:
+            stats['invalid'] += 1
+            continue
+        stats['results'][RESULT_NAMES[record.result]] += 1
+        stats['lengths'][len(record.moves)] += 1
+        if record.moves:
+            stats['openings'][record.moves[0]] += 1
+    return stats
+
+def format_stats(stats):
+    """Formats analyze() output as a short report."""
+    games = stats['games'] or 1
+    lines = [f"{stats['games']} games, {stats['invalid']} invalid"]
+    for name in ('X', 'O', 'draw', 'unfinished'):
+        count = stats['results'][name]
+        lines.append(f"  {name:<10} {count:>12}  ({100.0 * count / games:5.1f}%)")
+    total_moves = sum(length * count for length, count in stats['lengths'].items())
+    valid = sum(stats['lengths'].values()) or 1
+    lines.append(f"  average length {total_moves / valid:.2f} moves")
+    lines.append("  openings: " + ", ".join(f"{pos}: {count}" for pos, count in sorted(stats['openings'].items())))
+    return "\n".join(lines)
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Validate, summarize or replay game record files.")
+    parser.add_argument("command", choices=["stats", "show"])
+    parser.add_argument("path")
+    parser.add_argument("--index", type=int, default=0, help="record to show")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(format_stats(analyze(iter_record_bytes(args.path))))
+    else:
+        record = next(read_games(args.path, start=args.index), None)
+        if record is None:
+            raise SystemExit(f"{args.path} has {count_records(args.path)} records")
+        print(f"Game {args.index}: {record.first_player} first, moves {list(record.moves)}, "
+              f"result {RESULT_NAMES[record.result]}")
+        board = replay(record)
+        for row in range(3):
+            print(" " + " | ".join(board[row * 3:row * 3 + 3]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# game_state.py
+"""
+Stateful game-state tracker with incremental win/draw detection.
+
+GameState keeps, for each player, how many of their marks sit on every
+winning line, plus a move counter. A move only touches the lines through
+its cell, win/draw questions are O(1), and moves can be undone - so search
+code can make/unmake moves instead of copying boards with board[:].
+
+By default it tracks the 3x3 lines in WINNING_COMBINATIONS_INFO and
+check_win returns the same (win_type, index) tuples as game_logic. Other
+line sets (e.g. mnk.winning_lines) can be passed in.
+"""
+from game_logic import WINNING_COMBINATIONS_INFO
+
+MARKS = ('X', 'O')
+
+# (win_info, cells) for the classic 3x3 board
+DEFAULT_LINES = [((win_type, index), combo) for win_type, index, combo in WINNING_COMBINATIONS_INFO]
+
+
+class GameState:
+    """Tracks a board plus per-line counts for incremental win/draw checks."""
+    def __init__(self, board=None, lines=None, size=9):
+        """
+        Creates a tracker for `size` cells, optionally seeded from a list board.
+        lines is a list of (win_info, cells); earlier lines take priority when
+        several are complete, as in game_logic.check_win.
+        """
+        lines = DEFAULT_LINES if lines is None else lines
+        self.size = size
+        self.lines = lines # Kept so an equivalent tracker can be rebuilt (e.g. in a worker process)
+        self.board = [' ' for _ in range(size)]
+        self.move_count = 0
+        self._line_info = [info for info, _ in lines]
+        self._line_lengths = [len(cells) for _, cells in lines]
+        lines_through = [[] for _ in range(size)]
+        for line_id, (_, cells) in enumerate(lines):
+            for cell in cells:
+                lines_through[cell].append(line_id)
+        self._lines_through = [tuple(ids) for ids in lines_through]
+        self._counts = {mark: [0] * len(lines) for mark in MARKS}
+        self._completed = {mark: [] for mark in MARKS} # Completed line ids per mark
+        self._history = [] # (index, mark, lines completed by that move)
+
+        if board is not None:
+            for index, cell in enumerate(board):
+                if cell != ' ':
+                    self.make_move(index, cell)
+
+    # --- Make / unmake ---
+    def make_move(self, index, mark):
+        """Places `mark` on the empty cell `index` (0-based). O(lines through the cell)."""
+        self.board[index] = mark
+        self.move_count += 1
+        counts = self._counts[mark]
+        lengths = self._line_lengths
+        completed = self._completed[mark]
+        newly_completed = 0
+        for line_id in self._lines_through[index]:
+            counts[line_id] += 1
+            if counts[line_id] == lengths[line_id]:
+                completed.append(line_id)
+                newly_completed += 1
+        self._history.append((index, mark, newly_completed))
+
+    def unmake_move(self):
+        """Undoes the most recent make_move and returns its cell index."""
+        index, mark, newly_completed = self._history.pop()
+        self.board[index] = ' '
+        self.move_count -= 1
+        counts = self._counts[mark]
+        for line_id in self._lines_through[index]:
+            counts[line_id] -= 1
+        if newly_completed:
+            del self._completed[mark][-newly_completed:]
+        return index
+
+    def place_mark(self, position, mark):
+        """Places the mark at the given position (1-based) if empty, like board.place_mark."""
+        if 1 <= position <= self.size and self.board[position - 1] == ' ':
+            self.make_move(position - 1, mark)
+            return True
+        return False
+
+    # --- Queries ---
+    def is_cell_empty(self, position):
+        """Checks if the cell at the given position (1-based) is empty."""
+        if 1 <= position <= self.size:
+            return self.board[position - 1] == ' '
+        return False
+
+    def get_empty_cells(self):
+        """Returns a list of indices (0-based) of empty cells."""
+        return [i for i, cell in enumerate(self.board) if cell == ' ']
+
+    def check_win(self, mark):
+        """Returns the win info of the first completed line for `mark`, else None."""
+        completed = self._completed[mark]
+        if not completed:
+            return None
+        return self._line_info[min(completed)]
+
+    def check_draw(self):
+        """Checks if the board is full (same contract as game_logic.check_draw)."""
+        return self.move_count == self.size
+
+    def is_draw(self):
+        """Checks if the board is full and nobody has won."""
+        return self.move_count == self.size and not self._completed['X'] and not self._completed['O']
+
+    def winner(self):
+        """Returns the mark that has a completed line, or None."""
+        for mark in MARKS:
+            if self._completed[mark]:
+                return mark
+        return None
+
+    def wins_with(self, index, mark):
+        """Checks if placing `mark` at the empty cell `index` would complete a line."""
+        counts = self._counts[mark]
+        lengths = self._line_lengths
+        for line_id in self._lines_through[index]:
+            if counts[line_id] + 1 == lengths[line_id]:
+                return True
+        return False
+
+    def line_counts(self, mark):
+        """Returns the per-line mark counts for `mark` (read-only view for evaluators)."""
+        return self._counts[mark]
+
+    @property
+    def history(self):
+        """Moves made so far as (index, mark) pairs, oldest first."""
+        return [(index, mark) for index, mark, _ in self._history]
+
+    @property
+    def lines_through(self):
+        """Line ids through each cell."""
+        return self._lines_through
@@ -1,13 +1,22 @@
 # gui.py
 """
 Handles all Pygame drawing operations and GUI constants.
+
+Positions on screen (cell rects and centers, win-line endpoints) come from a
+geometry table built once per layout (get_geometry). RetainedRenderer
+animates marks appearing and the win line drawing itself with time-based
+tweens (animation.py).
 """
+from collections import namedtuple
 
 import pygame
 
+from animation import Animator, ease_out_cubic, ease_in_out_cubic
+
 # --- Constants ---
-# Screen dimensions
+# Screen dimensions (the sizes below are for 3x3; configure_board() rescales them)
 WIDTH, HEIGHT = 450, 550  # Increased height for status message
+STATUS_HEIGHT = 100 # Status/button area below the board
 LINE_WIDTH = 15
 BOARD_ROWS, BOARD_COLS = 3, 3
 SQUARE_SIZE = WIDTH // BOARD_COLS # // for integer division
@@ -31,101 +40,240 @@ BUTTON_COLOR = (211, 211, 211) # Light grey
 BUTTON_TEXT_COLOR = (0, 0, 0)   # Black
 HIGHLIGHT_COLOR = (255, 255, 0, 150) # Yellow, semi-transparent for winning line
 
-# Fonts
-pygame.font.init() # Initialize font module
-STATUS_FONT = pygame.font.SysFont('consolas', 30, bold=True)
-GAMEOVER_FONT = pygame.font.SysFont('impact', 50)
-BUTTON_FONT = pygame.font.SysFont('arial', 25)
+# Animation durations
+MARK_ANIMATION_MS = 150 # A new mark grows to full size
+WIN_LINE_ANIMATION_MS = 400 # The winning line draws itself from end to end
+
+# Fonts (name -> SysFont arguments). Loaded lazily on first draw, since
+# scanning system fonts is slow and headless users never need them.
+FONT_SPECS = {
+    'STATUS_FONT': ('consolas', 30, True),
+    'GAMEOVER_FONT': ('impact', 50, False),
+    'BUTTON_FONT': ('arial', 25, False),
+}
+_fonts = {}
+# Caches of pre-rendered surfaces and text (cleared when the layout changes)
+_surface_cache = {}
+_text_cache = {}
+_geometry = None
 # -----------------
 
+# Layout table, built once per layout: the board area, each cell's Rect and
+# center (by 0-based index), and the endpoints of every 3x3 win line keyed
+# like game_logic.check_win results, e.g. ('row', 1) or ('diag2', 1)
+Geometry = namedtuple('Geometry', ['board_rect', 'cell_rects', 'cell_centers', 'win_lines'])
+
+def _build_geometry():
+    board_height = HEIGHT - STATUS_HEIGHT
+    half_sq = SQUARE_SIZE // 2
+    inset = half_sq // 2 # Win lines stop short of the window edges
+    cell_rects = []
+    cell_centers = []
+    for row in range(BOARD_ROWS):
+        for col in range(BOARD_COLS):
+            cell_rects.append(pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+            cell_centers.append((col * SQUARE_SIZE + half_sq, row * SQUARE_SIZE + half_sq))
+    win_lines = {}
+    for row in range(BOARD_ROWS):
+        y = row * SQUARE_SIZE + half_sq
+        win_lines[('row', row)] = ((inset, y), (WIDTH - inset, y))
+    for col in range(BOARD_COLS):
+        x = col * SQUARE_SIZE + half_sq
+        win_lines[('col', col)] = ((x, inset), (x, board_height - inset))
+    win_lines[('diag1', 0)] = ((inset, inset), (WIDTH - inset, board_height - inset)) # Top-left to bottom-right
+    win_lines[('diag2', 1)] = ((WIDTH - inset, inset), (inset, board_height - inset)) # Top-right to bottom-left
+    return Geometry(pygame.Rect(0, 0, WIDTH, board_height), tuple(cell_rects), tuple(cell_centers), win_lines)
+
+def get_geometry():
+    """Returns the Geometry table for the current layout (rebuilt after configure_board)."""
+    global _geometry
+    if _geometry is None:
+        _geometry = _build_geometry()
+    return _geometry
+
+def get_font(name):
+    """Returns the font registered under name in FONT_SPECS, loading it on first use."""
+    font = _fonts.get(name)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init() # Initialize font module
+        family, size, bold = FONT_SPECS[name]
+        font = _fonts[name] = pygame.font.SysFont(family, size, bold=bold)
+    return font
+
+def render_text(font_name, message, color):
+    """Returns the rendered text surface, rendering each (font, message, color) only once."""
+    key = (font_name, message, color)
+    text = _text_cache.get(key)
+    if text is None:
+        text = _text_cache[key] = get_font(font_name).render(message, True, color)
+    return text
+
+def _cached_surface(key, build):
+    """Returns the surface stored under key, calling build() the first time."""
+    surface = _surface_cache.get(key)
+    if surface is None:
+        surface = _surface_cache[key] = build()
+    return surface
+
+def clear_caches():
+    """Drops pre-rendered surfaces, text and the geometry table (needed after the layout changes)."""
+    global _geometry
+    _surface_cache.clear()
+    _text_cache.clear()
+    _geometry = None
+
+def __getattr__(name):
+    """Keeps gui.STATUS_FONT and friends working while loading them lazily."""
+    if name in FONT_SPECS:
+        return get_font(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def configure_board(rows, cols, width=450):
+    """
+    Sizes the window and drawing constants for a rows x cols board (see mnk.py).
+    Square size comes from the window width; the height follows from the rows.
+    """
+    global WIDTH, HEIGHT, BOARD_ROWS, BOARD_COLS, SQUARE_SIZE, LINE_WIDTH
+    global CIRCLE_RADIUS, CIRCLE_WIDTH, CROSS_WIDTH, SPACE
+    BOARD_ROWS, BOARD_COLS = rows, cols
+    SQUARE_SIZE = width // cols
+    WIDTH = SQUARE_SIZE * cols
+    HEIGHT = SQUARE_SIZE * rows + STATUS_HEIGHT
+    # Scale stroke widths relative to the 150px squares of the 3x3 layout
+    scale = SQUARE_SIZE / 150
+    LINE_WIDTH = max(1, round(15 * scale))
+    CIRCLE_RADIUS = SQUARE_SIZE // 3
+    CIRCLE_WIDTH = max(1, round(15 * scale))
+    CROSS_WIDTH = max(1, round(25 * scale))
+    SPACE = SQUARE_SIZE // 4
+    clear_caches()
+
 def draw_lines(screen):
-    """Draws the Tic-Tac-Toe grid lines."""
+    """Draws the grid lines."""
     # Horizontal lines
-    pygame.draw.line(screen, LINE_COLOR, (0, SQUARE_SIZE), (WIDTH, SQUARE_SIZE), LINE_WIDTH)
-    pygame.draw.line(screen, LINE_COLOR, (0, 2 * SQUARE_SIZE), (WIDTH, 2 * SQUARE_SIZE), LINE_WIDTH)
+    for row in range(1, BOARD_ROWS):
+        pygame.draw.line(screen, LINE_COLOR, (0, row * SQUARE_SIZE), (WIDTH, row * SQUARE_SIZE), LINE_WIDTH)
     # Vertical lines
-    pygame.draw.line(screen, LINE_COLOR, (SQUARE_SIZE, 0), (SQUARE_SIZE, HEIGHT - 100), LINE_WIDTH) # Adjusted height
-    pygame.draw.line(screen, LINE_COLOR, (2 * SQUARE_SIZE, 0), (2 * SQUARE_SIZE, HEIGHT - 100), LINE_WIDTH)
+    for col in range(1, BOARD_COLS):
+        pygame.draw.line(screen, LINE_COLOR, (col * SQUARE_SIZE, 0), (col * SQUARE_SIZE, HEIGHT - 100), LINE_WIDTH) # Adjusted height
+
+def _draw_mark(surface, mark, x, y):
+    """Draws an 'X' or 'O' in the square whose top-left corner is (x, y)."""
+    if mark == 'O':
+        # Draw Circle (O) - center calculation is key
+        center = (int(x + SQUARE_SIZE // 2), int(y + SQUARE_SIZE // 2))
+        pygame.draw.circle(surface, CIRCLE_COLOR, center, CIRCLE_RADIUS, CIRCLE_WIDTH)
+    elif mark == 'X':
+        # Draw Cross (X) - requires two lines
+        # Top-left to bottom-right
+        pygame.draw.line(surface, CROSS_COLOR, (x + SPACE, y + SPACE),
+                         (x + SQUARE_SIZE - SPACE, y + SQUARE_SIZE - SPACE), CROSS_WIDTH)
+        # Top-right to bottom-left
+        pygame.draw.line(surface, CROSS_COLOR, (x + SPACE, y + SQUARE_SIZE - SPACE),
+                         (x + SQUARE_SIZE - SPACE, y + SPACE), CROSS_WIDTH)
 
 def draw_figures(screen, board):
     """Draws X's and O's based on the board state."""
     for row in range(BOARD_ROWS):
         for col in range(BOARD_COLS):
-            index = row * BOARD_COLS + col
-            if board[index] == 'O':
-                # Draw Circle (O) - center calculation is key
-                center_x = int(col * SQUARE_SIZE + SQUARE_SIZE // 2)
-                center_y = int(row * SQUARE_SIZE + SQUARE_SIZE // 2)
-                pygame.draw.circle(screen, CIRCLE_COLOR, (center_x, center_y), CIRCLE_RADIUS, CIRCLE_WIDTH)
-            elif board[index] == 'X':
-                # Draw Cross (X) - requires two lines
-                # Top-left to bottom-right
-                start_desc = (col * SQUARE_SIZE + SPACE, row * SQUARE_SIZE + SPACE)
-                end_desc = (col * SQUARE_SIZE + SQUARE_SIZE - SPACE, row * SQUARE_SIZE + SQUARE_SIZE - SPACE)
-                pygame.draw.line(screen, CROSS_COLOR, start_desc, end_desc, CROSS_WIDTH)
-                # Top-right to bottom-left
-                start_asc = (col * SQUARE_SIZE + SPACE, row * SQUARE_SIZE + SQUARE_SIZE - SPACE)
-                end_asc = (col * SQUARE_SIZE + SQUARE_SIZE - SPACE, row * SQUARE_SIZE + SPACE)
-                pygame.draw.line(screen, CROSS_COLOR, start_asc, end_asc, CROSS_WIDTH)
+            _draw_mark(screen, board[row * BOARD_COLS + col], col * SQUARE_SIZE, row * SQUARE_SIZE)
+
+def get_mark_surface(mark):
+    """Returns a pre-rendered, transparent square-sized surface with an 'X' or 'O'."""
+    def build():
+        surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        _draw_mark(surface, mark, 0, 0)
+        return surface
+    return _cached_surface(('mark', mark), build)
+
+def get_scaled_mark_surface(mark, scale):
+    """Returns the mark surface scaled by `scale` (0-1) around its center, and its offset in the square."""
+    size = max(1, round(SQUARE_SIZE * scale))
+    surface = get_mark_surface(mark)
+    if size != SQUARE_SIZE:
+        surface = pygame.transform.smoothscale(surface, (size, size))
+    offset = (SQUARE_SIZE - size) // 2
+    return surface, (offset, offset)
+
+def get_grid_surface():
+    """Returns a pre-rendered board: background plus grid lines."""
+    def build():
+        surface = pygame.Surface((WIDTH, HEIGHT - 100))
+        surface.fill(BG_COLOR)
+        draw_lines(surface)
+        return surface
+    return _cached_surface('grid', build)
+
+def get_overlay_surface():
+    """Returns the semi-transparent overlay shown over the board at game over."""
+    def build():
+        overlay = pygame.Surface((WIDTH, HEIGHT - 100), pygame.SRCALPHA)
+        overlay.fill((40, 40, 40, 180)) # Dark grey, semi-transparent
+        return overlay
+    return _cached_surface('overlay', build)
 
 def draw_status(screen, message):
     """Displays the current game status (whose turn)."""
-    text = STATUS_FONT.render(message, True, TEXT_COLOR)
+    text = render_text('STATUS_FONT', message, TEXT_COLOR)
     text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT - 50)) # Position at the bottom center
     # Add a background rectangle for better visibility
     bg_rect = pygame.Rect(0, HEIGHT - 100, WIDTH, 100)
     pygame.draw.rect(screen, LINE_COLOR, bg_rect) # Use line color for status background
     screen.blit(text, text_rect)
 
-def draw_winning_line(screen, start_pos, end_pos):
-    """Draws a line through the winning combination."""
+def draw_winning_line(screen, start_pos, end_pos, progress=1.0):
+    """Draws a line through the winning combination (only its first `progress` share while animating)."""
     if start_pos and end_pos:
-        # Create a slightly transparent surface for the line
-        line_surf = pygame.Surface((WIDTH, HEIGHT - 100), pygame.SRCALPHA) # Use SRCALPHA for transparency
-        pygame.draw.line(line_surf, HIGHLIGHT_COLOR, start_pos, end_pos, LINE_WIDTH + 5)
-        screen.blit(line_surf, (0,0))
+        if progress >= 1.0:
+            # A slightly transparent surface for the line, built once per line
+            def build():
+                line_surf = pygame.Surface((WIDTH, HEIGHT - 100), pygame.SRCALPHA) # Use SRCALPHA for transparency
+                pygame.draw.line(line_surf, HIGHLIGHT_COLOR, start_pos, end_pos, LINE_WIDTH + 5)
+                return line_surf
+            screen.blit(_cached_surface(('win_line', start_pos, end_pos), build), (0, 0))
+            return
+        if progress <= 0.0:
+            return
+        # Partial line: redrawn on one reusable transparent layer each frame
+        layer = _cached_surface('win_line_layer', lambda: pygame.Surface((WIDTH, HEIGHT - 100), pygame.SRCALPHA))
+        layer.fill((0, 0, 0, 0))
+        tip = (start_pos[0] + (end_pos[0] - start_pos[0]) * progress,
+               start_pos[1] + (end_pos[1] - start_pos[1]) * progress)
+        pygame.draw.line(layer, HIGHLIGHT_COLOR, start_pos, tip, LINE_WIDTH + 5)
+        screen.blit(layer, (0, 0))
 
 
 def get_win_line_coords(row_or_col_or_diag_index, win_type):
-    """Calculates start and end coordinates for the winning line."""
-    half_sq = SQUARE_SIZE // 2
+    """
+    Returns the start and end coordinates of the winning line (from the
+    geometry table). win_type 'line' (from mnk.py) takes a (start_index,
+    end_index) cell pair.
+    """
+    geometry = get_geometry()
+    if win_type == 'line':
+        start_index, end_index = row_or_col_or_diag_index
+        return geometry.cell_centers[start_index], geometry.cell_centers[end_index]
+    return geometry.win_lines.get((win_type, row_or_col_or_diag_index), (None, None))
 
-    if win_type == 'row':
-        y = row_or_col_or_diag_index * SQUARE_SIZE + half_sq
-        start_pos = (half_sq // 2, y)
-        end_pos = (WIDTH - half_sq // 2, y)
-    elif win_type == 'col':
-        x = row_or_col_or_diag_index * SQUARE_SIZE + half_sq
-        start_pos = (x, half_sq // 2)
-        end_pos = (x, HEIGHT - 100 - half_sq // 2) # Adjusted height
-    elif win_type == 'diag1': # Top-left to bottom-right
-        start_pos = (half_sq // 2, half_sq // 2)
-        end_pos = (WIDTH - half_sq // 2, HEIGHT - 100 - half_sq // 2)
-    elif win_type == 'diag2': # Top-right to bottom-left
-        start_pos = (WIDTH - half_sq // 2, half_sq // 2)
-        end_pos = (half_sq // 2, HEIGHT - 100 - half_sq // 2)
-    else:
-        return None, None
-
-    return start_pos, end_pos
-
-
-def draw_game_over(screen, message, winning_line_info):
-    """Displays the game over message and highlights the win."""
+
+def draw_game_over(screen, message, winning_line_info, line_progress=1.0):
+    """Displays the game over message and highlights the win (line_progress: see draw_winning_line)."""
 
     # Draw semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, HEIGHT - 100), pygame.SRCALPHA)
-    overlay.fill((40, 40, 40, 180)) # Dark grey, semi-transparent
-    screen.blit(overlay, (0, 0))
+    screen.blit(get_overlay_surface(), (0, 0))
 
     # Draw winning line if applicable
     if winning_line_info:
         win_type, index = winning_line_info
         start_pos, end_pos = get_win_line_coords(index, win_type)
-        draw_winning_line(screen, start_pos, end_pos)
+        draw_winning_line(screen, start_pos, end_pos, line_progress)
+
+    draw_game_over_message(screen, message)
 
-    # Draw game over text
-    text = GAMEOVER_FONT.render(message, True, GAMEOVER_COLOR)
+def draw_game_over_message(screen, message):
+    """Draws the game over text centered on the board."""
+    text = render_text('GAMEOVER_FONT', message, GAMEOVER_COLOR)
     text_rect = text.get_rect(center=(WIDTH // 2, (HEIGHT - 100) // 2)) # Center on game board area
     screen.blit(text, text_rect)
 
@@ -139,8 +287,115 @@ def draw_play_again_button(screen):
     button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_COLOR, button_rect, border_radius=10)
 
-    button_text = BUTTON_FONT.render("Play Again?", True, BUTTON_TEXT_COLOR)
+    button_text = render_text('BUTTON_FONT', "Play Again?", BUTTON_TEXT_COLOR)
     text_rect = button_text.get_rect(center=button_rect.center)
     screen.blit(button_text, text_rect)
 
-    return button_rect # Return the rect for click detection
\ No newline at end of file
+    return button_rect # Return the rect for click detection
+
+
+class RetainedRenderer:
+    """
+    Retained-mode renderer: remembers what is on screen and redraws only what
+    changed (a cell, the status bar, or everything when the game ends/restarts).
+    render() returns the dirty rects to pass to pygame.display.update; an empty
+    list means nothing changed and the display need not be touched.
+
+    With animate (the default), new marks grow into place and the winning
+    line draws itself. While `animating` is True, render() must be called
+    every frame (pass it to FrameLoop.wait).
+    """
+    def __init__(self, animate=True, clock=None):
+        self.play_again_button_rect = None # Set while the game-over screen is shown
+        self.animator = Animator(clock) if animate else None
+        self.invalidate()
+
+    @property
+    def animating(self):
+        return self.animator is not None and self.animator.active()
+
+    def invalidate(self):
+        """Forces a full redraw on the next render (e.g. after the window is exposed)."""
+        self._cells = None
+        self._status = None
+        self._game_over = None
+        self._game_over_background = None # Board with marks and overlay, under the animated line
+
+    def _cell_rect(self, index):
+        return get_geometry().cell_rects[index]
+
+    def render(self, screen, board, status_message, game_over, winning_line_info):
+        """Brings the screen up to date and returns the list of dirty rects."""
+        cells = tuple(board)
+        scene = (game_over, winning_line_info, status_message if game_over else None)
+        if self._cells is None or scene != self._game_over or len(cells) != len(self._cells):
+            return self._render_full(screen, cells, status_message, game_over, winning_line_info, scene)
+
+        dirty = []
+        grid = get_grid_surface()
+        for index, mark in enumerate(cells):
+            if mark != self._cells[index]:
+                rect = self._cell_rect(index)
+                screen.blit(grid, rect, area=rect) # Restore background and grid lines
+                if mark != ' ':
+                    if self.animator:
+                        self.animator.start(('mark', index), MARK_ANIMATION_MS, ease_out_cubic)
+                    else:
+                        screen.blit(get_mark_surface(mark), rect)
+                dirty.append(rect)
+        if not game_over and status_message != self._status:
+            draw_status(screen, status_message)
+            dirty.append(pygame.Rect(0, HEIGHT - 100, WIDTH, 100))
+        self._cells = cells
+        self._status = status_message
+        if self.animator:
+            dirty.extend(self._render_animations(screen, cells, status_message, winning_line_info))
+        return dirty
+
+    def _render_animations(self, screen, cells, status_message, winning_line_info):
+        """Draws this frame of every running animation; returns the dirty rects."""
+        dirty = []
+        grid = get_grid_surface()
+        for key, progress in self.animator.frame().items():
+            if key == 'win_line':
+                board_rect = get_geometry().board_rect
+                screen.blit(self._game_over_background, board_rect)
+                start_pos, end_pos = get_win_line_coords(winning_line_info[1], winning_line_info[0])
+                draw_winning_line(screen, start_pos, end_pos, progress)
+                draw_game_over_message(screen, status_message)
+                dirty.append(board_rect)
+            else: # ('mark', index)
+                index = key[1]
+                rect = self._cell_rect(index)
+                screen.blit(grid, rect, area=rect)
+                surface, (dx, dy) = get_scaled_mark_surface(cells[index], progress)
+                screen.blit(surface, (rect.x + dx, rect.y + dy))
+                dirty.append(rect)
+        return dirty
+
+    def _render_full(self, screen, cells, status_message, game_over, winning_line_info, scene):
+        """Redraws the whole window from the cached surfaces."""
+        screen.fill(BG_COLOR)
+        screen.blit(get_grid_surface(), (0, 0))
+        for index, mark in enumerate(cells):
+            if mark != ' ':
+                screen.blit(get_mark_surface(mark), self._cell_rect(index))
+        if self.animator:
+            self.animator.clear() # Marks are drawn in full; only a new win line animates
+        if game_over:
+            if self.animator and winning_line_info:
+                # Keep the board under the line so each frame is two blits and one line
+                screen.blit(get_overlay_surface(), (0, 0))
+                self._game_over_background = screen.subsurface(get_geometry().board_rect).copy()
+                self.animator.start('win_line', WIN_LINE_ANIMATION_MS, ease_in_out_cubic)
+                draw_game_over_message(screen, status_message)
+            else:
+                draw_game_over(screen, status_message, winning_line_info)
+            self.play_again_button_rect = draw_play_again_button(screen)
+        else:
+            draw_status(screen, status_message)
+            self.play_again_button_rect = None
+        self._cells = cells
+        self._status = status_message
+        self._game_over = scene
+        return [screen.get_rect()]
@@ -0,0 +1,195 @@
+# instrumentation.py
+"""
+Logging, counters and latency histograms for the engine hot paths.
+
+Everything here is off by default and is built to cost almost nothing while
+off. Decision messages go through the standard logging module at DEBUG/INFO
+level, so a disabled logger drops them after one cached level check. Metrics
+are recorded only when `metrics.enabled` is set; callers check that flag
+before they read the clock.
+
+Recorded metrics:
+    counters    e.g. ai.decisions, ai.branch.block,
+                ai.moves_evaluated, game.moves, game.result.draw
+    histograms  e.g. ai.latency_ms.heuristic (decision latency per strategy)
+
+You can turn these on without editing code, through environment variables:
+    TTT_LOG_LEVEL=DEBUG        print every AI decision to stderr
+    TTT_METRICS=1              record counters and histograms
+    TTT_METRICS_FILE=out.json  implies TTT_METRICS; writes a snapshot at exit
+
+From code, call configure_logging(), enable_metrics(), snapshot(), and
+add_export_hook(fn), then export(). Each hook is called with a snapshot dict.
+"""
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+
+ROOT_LOGGER = "tictactoe"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+LATENCY_BUCKETS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+def get_logger(name):
+    """Returns the logger for a module (a child of the 'tictactoe' logger)."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+def configure_logging(level="INFO", stream=None):
+    """Sends messages at `level` and above to stderr (or `stream`)."""
+    logger = logging.getLogger(ROOT_LOGGER)
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/min/max."""
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(0.50),
+            'p99': self.percentile(0.99),
+            'buckets': {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)
+                        } | {'inf': self.counts[-1]},
+        }
+
+    def merge(self, data):
+        """Adds a histogram exported by to_dict() (e.g. from a worker process)."""
+        if not data['count']:
+            return
+        for index, bound in enumerate(self.bounds):
+            self.counts[index] += data['buckets'][f"le_{bound}"]
+        self.counts[-1] += data['buckets']['inf']
+        self.count += data['count']
+        self.total += data['sum']
+        self.min = data['min'] if self.min is None else min(self.min, data['min'])
+        self.max = data['max'] if self.max is None else max(self.max, data['max'])
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms (AI workers record from threads)."""
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def snapshot(self):
+        """Returns a JSON-serializable copy of every counter and histogram."""
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def merge(self, snapshot):
+        """Adds the contents of another snapshot (e.g. from a worker process)."""
+        with self._lock:
+            for name, value in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, data in snapshot['histograms'].items():
+                self.histograms.setdefault(name, Histogram()).merge(data)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+metrics = Metrics() # Process-wide registry used by the engine modules
+_export_hooks = []
+
+def enable_metrics(enabled=True):
+    """Turns metric recording on or off."""
+    metrics.enabled = enabled
+
+def snapshot():
+    """Returns a snapshot of the process-wide metrics."""
+    return metrics.snapshot()
+
+def add_export_hook(hook):
+    """Registers hook(snapshot_dict), called by export()."""
+    _export_hooks.append(hook)
+
+def export():
+    """Takes a snapshot and passes it to every export hook; returns the snapshot."""
+    data = snapshot()
+    for hook in _export_hooks:
+        hook(data)
+    return data
+
+def json_file_hook(path):
+    """Returns an export hook that writes each snapshot to a JSON file."""
+    def write(data):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+    return write
+
+def record_decision(source, strategy, branch, moves_evaluated, elapsed_s):
+    """Records one AI decision (call only when metrics.enabled)."""
+    metrics.incr(f"{source}.decisions")
+    metrics.incr(f"{source}.branch.{branch}")
+    metrics.incr(f"{source}.moves_evaluated", moves_evaluated)
+    metrics.observe(f"{source}.latency_ms.{strategy}", elapsed_s * 1000.0)
+
+def _configure_from_environment():
+    """Applies the TTT_* environment variables (see module docstring)."""
+    level = os.environ.get("TTT_LOG_LEVEL")
+    if level:
+        configure_logging(level)
+    metrics_file = os.environ.get("TTT_METRICS_FILE")
+    if metrics_file or os.environ.get("TTT_METRICS", "") not in ("", "0"):
+        enable_metrics()
+    if metrics_file:
+        add_export_hook(json_file_hook(metrics_file))
+        atexit.register(export)
+
+_configure_from_environment()
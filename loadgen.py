@@ -0,0 +1,144 @@
+# loadgen.py
+"""
+Local load generator for server.py.
+
+Opens --connections client connections. Each one plays complete games back
+to back (new session, random legal human moves, close) until --duration
+seconds have passed. It measures move latency, from sending a move to
+receiving the AI's reply (or the final state), and reports sessions/sec
+plus latency percentiles.
+
+By default it starts its own server in this process, listening on a
+temporary Unix socket. Use --port or --unix to target a running server
+instead.
+
+Usage:
+    python loadgen.py --connections 200 --duration 10 --ai-delay-ms 0
+    python loadgen.py --port 8765 --difficulty mcts --connections 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from server import GameServer, DEFAULT_HOST
+from game import HUMAN_PLAYER
+
+def percentile(sorted_values, fraction):
+    """Returns the value at `fraction` of a sorted list (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def _request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def _play_session(reader, writer, difficulty, rng, latencies):
+    """Plays one game to the end; appends each move's latency in ms."""
+    state = await _request(reader, writer, {'op': 'new', 'difficulty': difficulty})
+    if state['type'] == 'error':
+        raise RuntimeError(state['message'])
+    session = state['session']
+    while not state['game_over']:
+        empty = [i + 1 for i, cell in enumerate(state['board']) if cell == ' ']
+        start = time.perf_counter()
+        state = await _request(reader, writer, {'op': 'move', 'session': session, 'position': rng.choice(empty)})
+        if state['type'] == 'error':
+            raise RuntimeError(state['message'])
+        while not state['game_over'] and state['turn'] != HUMAN_PLAYER:
+            state = json.loads(await reader.readline()) # Wait for the AI's reply
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    await _request(reader, writer, {'op': 'close', 'session': session})
+
+async def _client(connect, difficulty, deadline, seed, latencies):
+    """One connection playing sessions until the deadline; returns sessions played."""
+    reader, writer = await connect()
+    rng = random.Random(seed)
+    played = 0
+    try:
+        while time.perf_counter() < deadline:
+            await _play_session(reader, writer, difficulty, rng, latencies)
+            played += 1
+    finally:
+        writer.close()
+    return played
+
+async def run_load(connect, connections, duration, difficulty="hard", seed=0):
+    """Runs the load and returns a results dict."""
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + duration
+    played = await asyncio.gather(*(_client(connect, difficulty, deadline, seed + i, latencies)
+                                    for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    sessions = sum(played)
+    return {
+        'connections': connections,
+        'sessions': sessions,
+        'moves': len(latencies),
+        'elapsed_s': elapsed,
+        'sessions_per_sec': sessions / elapsed,
+        'moves_per_sec': len(latencies) / elapsed,
+        'latency_ms': {'p50': percentile(latencies, 0.50), 'p90': percentile(latencies, 0.90),
+                       'p99': percentile(latencies, 0.99), 'max': latencies[-1] if latencies else 0.0},
+    }
+
+def format_results(results):
+    """Formats run_load results as a short report."""
+    latency = results['latency_ms']
+    return (f"{results['sessions']} sessions ({results['moves']} moves) over {results['connections']} "
+            f"connections in {results['elapsed_s']:.1f}s: {results['sessions_per_sec']:,.0f} sessions/s, "
+            f"{results['moves_per_sec']:,.0f} moves/s\n"
+            f"Move latency: p50 {latency['p50']:.2f} ms, p90 {latency['p90']:.2f} ms, "
+            f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+
+async def _main(args):
+    if args.port or args.unix:
+        if args.unix:
+            connect = lambda: asyncio.open_unix_connection(args.unix)
+        else:
+            connect = lambda: asyncio.open_connection(args.host, args.port)
+        return await run_load(connect, args.connections, args.duration, args.difficulty, args.seed)
+
+    # Start an in-process server on a temporary Unix socket
+    server = GameServer(workers=args.workers, ai_delay_ms=args.ai_delay_ms, seed=args.seed)
+    path = os.path.join(tempfile.mkdtemp(), "tictactoe.sock")
+    ready = asyncio.Event()
+    serve_task = asyncio.create_task(server.serve(unix_path=path, ready=ready))
+    await ready.wait()
+    try:
+        return await run_load(lambda: asyncio.open_unix_connection(path), args.connections,
+                              args.duration, args.difficulty, args.seed)
+    finally:
+        serve_task.cancel()
+        try:
+            await serve_task
+        except asyncio.CancelledError:
+            pass
+        os.unlink(path)
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate load against the Tic-Tac-Toe server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, help="connect to a running TCP server")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a running Unix-socket server")
+    parser.add_argument("--connections", type=int, default=100, help="concurrent client connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to run")
+    parser.add_argument("--difficulty", default="hard", help="AI strategy for every session")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the simulated human moves (and the in-process server's AI)")
+    parser.add_argument("--workers", type=int, default=None, help="in-process server: worker processes")
+    parser.add_argument("--ai-delay-ms", type=int, default=0, help="in-process server: pause before AI replies")
+    args = parser.parse_args()
+    print(format_results(asyncio.run(_main(args))))
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,31 @@ import sys
 
 # Import the Game class and GUI drawing functions/constants
 from game import Game
+from pygame_adapter import PygameScheduler, RetainedPygameRenderer, ai_result_poster
+from ai_worker import AIWorker
+from event_loop import FrameLoop
+from strategies import available_strategies
+from game_record import open_recorder_from_environment
+from seeding import rng_from_environment
+from relay import open_relay_from_environment
 import gui # We need gui for constants like dimensions and drawing the button
 
 # --- Constants ---
-FPS = 30 # Frames per second
+FPS = 30 # Frame rate while animating (the loop sleeps when idle)
+AI_RESULT_EVENT = pygame.USEREVENT + 2 # Posted by the AI worker thread with the chosen move
 # -----------------
 
 def main():
     """Main game function."""
 
     # --- Difficulty Selection (Console) ---
+    choices = ["easy", "hard", "impossible"] + [name for name in available_strategies()
+                                                if name not in ("easy", "hard", "impossible")]
     difficulty = ""
-    while difficulty not in ["easy", "hard"]:
-        difficulty = input("Choose difficulty (easy/hard): ").lower().strip()
-        if difficulty not in ["easy", "hard"]:
-            print("Invalid choice. Please type 'easy' or 'hard'.")
+    while difficulty not in choices:
+        difficulty = input(f"Choose difficulty ({'/'.join(choices)}): ").lower().strip()
+        if difficulty not in choices:
+            print(f"Invalid choice. Please type one of: {', '.join(choices)}.")
     print(f"Difficulty set to: {difficulty}")
     # -------------------------------------
 
@@ -32,18 +42,33 @@ def main():
     # Use constants from gui module for screen dimensions
     screen = pygame.display.set_mode((gui.WIDTH, gui.HEIGHT))
     pygame.display.set_caption(f'Tic Tac Toe - Human (X) vs AI (O) - {difficulty.capitalize()}') # Add difficulty to title
-    clock = pygame.time.Clock()
+    frame_loop = FrameLoop(active_fps=FPS) # Sleeps until something happens
 
-    # Create the game instance, passing the chosen difficulty
-    game = Game(difficulty=difficulty)
+    # Create the game instance, passing the chosen difficulty and the pygame adapters
+    scheduler = PygameScheduler()
+    ai_worker = AIWorker(on_result=ai_result_poster(AI_RESULT_EVENT)) # Keeps the AI off the render thread
+    renderer = RetainedPygameRenderer() # Redraws only what changed
+    recorder = open_recorder_from_environment() # Records every game if TTT_RECORD_FILE is set
+    game = Game(difficulty=difficulty, scheduler=scheduler, renderer=renderer, ai_worker=ai_worker,
+                recorder=recorder, rng=rng_from_environment()) # TTT_SEED replays the same AI choices
+    relay = open_relay_from_environment() # Mirrors the game to spectator.py displays if TTT_RELAY_SOCKET is set
+    if relay:
+        relay.attach(game)
     play_again_button_rect = None # Store button rect for click detection
 
     running = True
     while running:
         # --- Event Handling ---
-        for event in pygame.event.get():
+        for event in frame_loop.wait(animating=renderer.animating): # Full FPS only while animating
             if event.type == pygame.QUIT:
                 running = False
+                ai_worker.shutdown()
+                if recorder:
+                    game.save_record()
+                    recorder.close()
+                if relay:
+                    relay.close()
+                print(frame_loop.report())
                 pygame.quit()
                 sys.exit()
 
@@ -60,24 +85,27 @@ def main():
                     game.handle_click(event.pos)
 
             # Handle the custom event for AI's turn
-            if event.type == game.ai_move_event:
-                game.handle_ai_turn()
+            if event.type == scheduler.event_type:
+                scheduler.fire() # Runs game.handle_ai_turn, which hands the move to the worker
 
-        # --- Drawing ---
-        screen.fill(gui.BG_COLOR) # Clear screen each frame
+            # The worker finished thinking; stale results from a reset round are ignored
+            if event.type == AI_RESULT_EVENT:
+                game.apply_ai_move(event.position, event.token)
 
-        # Let the game object handle drawing the game state (board, pieces, status/win msg)
-        game.draw(screen)
+            # The window contents were lost (e.g. uncovered); repaint everything
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
 
-        # Draw the "Play Again" button only if the game is over
-        if game.game_over:
-            play_again_button_rect = gui.draw_play_again_button(screen) # Draw and get rect
-        else:
-            play_again_button_rect = None # No button when game is active
+        # --- Drawing ---
+        # The retained renderer redraws only what changed (board, pieces, status/win msg,
+        # and the "Play Again" button once the game is over)
+        dirty_rects = game.draw(screen)
+        play_again_button_rect = renderer.play_again_button_rect
 
         # --- Update Display ---
-        pygame.display.update()
-        clock.tick(FPS) # Limit frame rate
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+            frame_loop.frame_presented()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
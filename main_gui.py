@@ -5,20 +5,27 @@ Handles events, game state, drawing calls, and AI interaction.
 """
 
 import pygame
+import random
 import sys
 import time
 
 # Import game components
-from board import initialize_board, place_mark, is_cell_empty
-from game_logic import check_win, check_draw, switch_player
-from player import get_ai_move
+from game_state import GameState
+from game_logic import switch_player
+from strategies import create_strategy
+from ai_worker import AIWorker
+from event_loop import FrameLoop
+from pygame_adapter import ai_result_poster
+from game_record import open_recorder_from_environment
+from seeding import rng_from_environment, child_rng
 # Import GUI components and constants
 import gui
 
 # --- Constants ---
 HUMAN_PLAYER = 'X'
 AI_PLAYER = 'O'
-FPS = 30 # Frames per second
+FPS = 30 # Frame rate while animating (the loop sleeps when idle)
+AI_RESULT_EVENT = pygame.USEREVENT + 2 # Posted by the AI worker thread with the chosen move
 # -----------------
 
 def get_clicked_pos(pos):
@@ -38,31 +45,48 @@ def get_clicked_pos(pos):
     else:
         return None # Click outside valid grid squares
 
-def reset_game():
-    """Resets the game state for a new round."""
-    board = initialize_board()
+def reset_game(recorder=None, previous_state=None):
+    """
+    Resets the game state for a new round. If a recorder is given, the
+    previous round's moves (previous_state) are recorded first.
+    """
+    if recorder and previous_state is not None:
+        recorder.record_state(previous_state)
+    state = GameState() # Board plus incremental win/draw tracking
     current_player = HUMAN_PLAYER # Human always starts in this version
     game_over = False
     winner = None
     winning_line_info = None # Tuple (type, index) or None
-    return board, current_player, game_over, winner, winning_line_info
+    return state, current_player, game_over, winner, winning_line_info
 
 def main():
     """Main game function."""
     pygame.init()
     screen = pygame.display.set_mode((gui.WIDTH, gui.HEIGHT))
     pygame.display.set_caption('Tic Tac Toe - Human (X) vs AI (O)')
-    clock = pygame.time.Clock()
+    frame_loop = FrameLoop(active_fps=FPS) # Sleeps until something happens
 
-    board, current_player, game_over, winner, winning_line_info = reset_game()
+    recorder = open_recorder_from_environment() # Records every game if TTT_RECORD_FILE is set
+    state, current_player, game_over, winner, winning_line_info = reset_game()
     play_again_button_rect = None # Store button rect for click detection
+    # AI moves are computed off the render thread and come back as AI_RESULT_EVENT
+    strategy = create_strategy("heuristic") # Same rule-based AI as player.get_ai_move
+    ai_worker = AIWorker(on_result=ai_result_poster(AI_RESULT_EVENT), move_function=strategy.get_move)
+    rng = rng_from_environment() or random.Random() # TTT_SEED replays the same AI choices
+    round_number = 0 # Bumped on reset so a move computed for an old round is dropped
+    renderer = gui.RetainedRenderer() # Cached surfaces + dirty-rect updates
 
     running = True
     while running:
         # --- Event Handling ---
-        for event in pygame.event.get():
+        for event in frame_loop.wait(animating=renderer.animating): # Full FPS only while animating
             if event.type == pygame.QUIT:
                 running = False
+                ai_worker.shutdown()
+                if recorder:
+                    recorder.record_state(state)
+                    recorder.close()
+                print(frame_loop.report())
                 pygame.quit()
                 sys.exit()
 
@@ -70,15 +94,15 @@ def main():
                 if current_player == HUMAN_PLAYER:
                     clicked_position = get_clicked_pos(event.pos)
 
-                    if clicked_position and is_cell_empty(board, clicked_position):
-                        if place_mark(board, clicked_position, HUMAN_PLAYER):
+                    if clicked_position and state.is_cell_empty(clicked_position):
+                        if state.place_mark(clicked_position, HUMAN_PLAYER):
                             # Check for win/draw after human move
-                            win_info = check_win(board, HUMAN_PLAYER)
+                            win_info = state.check_win(HUMAN_PLAYER)
                             if win_info:
                                 winner = HUMAN_PLAYER
                                 winning_line_info = win_info
                                 game_over = True
-                            elif check_draw(board):
+                            elif state.check_draw():
                                 game_over = True # It's a draw
                             else:
                                 # Switch to AI player
@@ -89,20 +113,32 @@ def main():
                  # Check if "Play Again" button was clicked
                  if play_again_button_rect and play_again_button_rect.collidepoint(event.pos):
                      print("Resetting game...")
-                     board, current_player, game_over, winner, winning_line_info = reset_game()
+                     state, current_player, game_over, winner, winning_line_info = reset_game(recorder, state)
                      play_again_button_rect = None # Clear button rect
+                     round_number += 1
+                     ai_worker.cancel()
+                     strategy.new_game()
 
             # --- AI Turn Trigger ---
             if event.type == pygame.USEREVENT and not game_over and current_player == AI_PLAYER:
-                 ai_position = get_ai_move(board, AI_PLAYER, HUMAN_PLAYER)
-                 if ai_position and place_mark(board, ai_position, AI_PLAYER):
+                 ai_worker.submit(round_number, state.board, AI_PLAYER, HUMAN_PLAYER, child_rng(rng))
+
+            # The window contents were lost (e.g. uncovered); repaint everything
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+
+            # --- AI Move Ready (ignore results for an old round) ---
+            if (event.type == AI_RESULT_EVENT and event.token == round_number
+                    and not game_over and current_player == AI_PLAYER):
+                 ai_position = event.position
+                 if ai_position and state.place_mark(ai_position, AI_PLAYER):
                       # Check for win/draw after AI move
-                      win_info = check_win(board, AI_PLAYER)
+                      win_info = state.check_win(AI_PLAYER)
                       if win_info:
                           winner = AI_PLAYER
                           winning_line_info = win_info
                           game_over = True
-                      elif check_draw(board):
+                      elif state.check_draw():
                           game_over = True # It's a draw
                       else:
                           # Switch back to Human player
@@ -115,10 +151,6 @@ def main():
 
 
         # --- Drawing ---
-        screen.fill(gui.BG_COLOR)
-        gui.draw_lines(screen)
-        gui.draw_figures(screen, board)
-
         # Display status or game over message
         if game_over:
             message = ""
@@ -126,16 +158,16 @@ def main():
                 message = f"Player {winner} Wins!"
             else:
                 message = "It's a Draw!"
-            gui.draw_game_over(screen, message, winning_line_info)
-            play_again_button_rect = gui.draw_play_again_button(screen) # Draw and get rect
         else:
-            status_message = f"Player {current_player}'s Turn"
-            gui.draw_status(screen, status_message)
-            play_again_button_rect = None # No button when game is active
+            message = f"Player {current_player}'s Turn"
+        # Only what changed since the last frame is redrawn (button included at game over)
+        dirty_rects = renderer.render(screen, state.board, message, game_over, winning_line_info)
+        play_again_button_rect = renderer.play_again_button_rect
 
         # --- Update Display ---
-        pygame.display.update()
-        clock.tick(FPS) # Limit frame rate
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+            frame_loop.frame_presented()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+# main_mnk.py
+"""
+Pygame loop for larger m,n,k variants (Human 'X' vs AI 'O').
+The GUI is sized from the same rows/cols as the board engine in mnk.py.
+
+Usage:
+    python main_mnk.py --rows 7 --cols 7 --k 4
+    python main_mnk.py --rows 15 --cols 15 --k 5 --width 750
+"""
+
+import argparse
+import sys
+
+import pygame
+
+from mnk import MNKBoard, get_mnk_move
+from game_logic import switch_player
+from pygame_adapter import PygameRenderer
+from event_loop import FrameLoop
+import gui
+
+# --- Constants ---
+HUMAN_PLAYER = 'X'
+AI_PLAYER = 'O'
+AI_DELAY_MS = 300
+AI_MOVE_EVENT = pygame.USEREVENT + 1
+FPS = 30 # Frame rate while animating (the loop sleeps when idle)
+# -----------------
+
+
+class MNKGame:
+    """Game state for an m,n,k match, with the attributes PygameRenderer draws."""
+    def __init__(self, rows, cols, k):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.reset()
+
+    def reset(self):
+        """Starts a new round on an empty board."""
+        self.board = MNKBoard(self.rows, self.cols, self.k)
+        self.current_player = HUMAN_PLAYER # Human starts
+        self.game_over = False
+        self.winner = None
+        self.winning_line_info = None
+        pygame.time.set_timer(AI_MOVE_EVENT, 0)
+
+    def make_move(self, position, player):
+        """Places a mark and updates win/draw state; returns True if the move was legal."""
+        if not self.board.place_mark(position, player):
+            return False
+        win_info = self.board.check_win(player) # Only the lines through this move were scanned
+        if win_info:
+            self.winner = player
+            self.winning_line_info = win_info
+            self.game_over = True
+        elif self.board.is_board_full():
+            self.game_over = True
+        else:
+            self.current_player = switch_player(self.current_player, HUMAN_PLAYER, AI_PLAYER)
+            if self.current_player == AI_PLAYER:
+                pygame.time.set_timer(AI_MOVE_EVENT, AI_DELAY_MS, 1) # 1 means run once
+        return True
+
+    def handle_ai_turn(self):
+        """Plays the AI's move."""
+        if not self.game_over and self.current_player == AI_PLAYER:
+            position = get_mnk_move(self.board, AI_PLAYER, HUMAN_PLAYER)
+            if position is None or not self.make_move(position, AI_PLAYER):
+                print("AI move failed or invalid position returned.")
+                self.game_over = True
+
+
+def main():
+    """Main game function."""
+    parser = argparse.ArgumentParser(description="Play an m,n,k game against the AI.")
+    parser.add_argument("--rows", type=int, default=7)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--k", type=int, default=4, help="marks in a row needed to win")
+    parser.add_argument("--width", type=int, default=gui.WIDTH, help="window width in pixels")
+    args = parser.parse_args()
+
+    gui.configure_board(args.rows, args.cols, args.width) # Size the GUI from the board parameters
+    pygame.init()
+    screen = pygame.display.set_mode((gui.WIDTH, gui.HEIGHT))
+    pygame.display.set_caption(f'{args.rows}x{args.cols}, {args.k} in a row - Human (X) vs AI (O)')
+    frame_loop = FrameLoop(active_fps=FPS) # Sleeps until something happens
+
+    game = MNKGame(args.rows, args.cols, args.k)
+    renderer = PygameRenderer()
+    play_again_button_rect = None
+
+    running = True
+    while running:
+        # --- Event Handling ---
+        for event in frame_loop.wait():
+            if event.type == pygame.QUIT:
+                running = False
+                print(frame_loop.report())
+                pygame.quit()
+                sys.exit()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if game.game_over:
+                    if play_again_button_rect and play_again_button_rect.collidepoint(event.pos):
+                        game.reset()
+                        play_again_button_rect = None
+                elif game.current_player == HUMAN_PLAYER:
+                    position = renderer.board_position_at(event.pos)
+                    if position:
+                        game.make_move(position, HUMAN_PLAYER)
+
+            if event.type == AI_MOVE_EVENT:
+                game.handle_ai_turn()
+
+        # --- Drawing ---
+        screen.fill(gui.BG_COLOR)
+        renderer.draw(screen, game)
+        if game.game_over:
+            play_again_button_rect = gui.draw_play_again_button(screen)
+        else:
+            play_again_button_rect = None
+
+        # --- Update Display ---
+        pygame.display.update()
+        frame_loop.frame_presented()
+
+if __name__ == "__main__":
+    main()
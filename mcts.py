@@ -0,0 +1,225 @@
+# mcts.py
+"""
+Monte Carlo Tree Search (UCT) on a GameState.
+
+mcts() grows a search tree from the current position. Each iteration selects
+a path with UCB1, expands one new child and plays a random rollout to the end
+of the game, using make/unmake on the GameState so no boards are copied. The
+move returned is the most visited child of the root. Strength follows the
+iteration and time budget, and the search needs no evaluation function, so it
+works on any GameState line set, including the m,n,k boards from
+mnk.winning_lines.
+
+Extra pieces:
+    reuse_subtree()   finds the node for the current position in the previous
+                      tree, so the next move starts from the visits already gathered
+    parallel_mcts()   root parallelization: independent trees are searched in
+                      worker processes, each with its own seed, and their root
+                      visit counts are merged
+    shutdown_pools()  stops the worker processes kept for parallel_mcts
+                      (also run at interpreter exit)
+"""
+import atexit
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from game_state import GameState
+
+DEFAULT_EXPLORATION = 1.4 # UCB1 constant, about sqrt(2)
+_TIME_CHECK_INTERVAL = 16 # Iterations between clock reads
+
+# move is a 0-based index; value is the mover's average result (win 1, draw 0.5, loss 0)
+MCTSResult = namedtuple('MCTSResult', ['move', 'visits', 'value', 'iterations', 'elapsed_ms', 'root'])
+
+
+class Node:
+    """One position in the tree; `mark` is the player who made `move` to reach it."""
+    __slots__ = ('move', 'mark', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, mark, parent, untried):
+        self.move = move
+        self.mark = mark
+        self.parent = parent
+        self.children = []
+        self.untried = untried # Legal moves not expanded yet ([] for terminal positions)
+        self.visits = 0
+        self.wins = 0.0 # From `mark`'s point of view; a draw counts half
+
+    def best_child(self, exploration):
+        """Returns the child with the highest UCB1 score."""
+        log_visits = math.log(self.visits)
+        best, best_score = None, -1.0
+        for child in self.children:
+            score = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def most_visited(self):
+        return max(self.children, key=lambda child: child.visits)
+
+
+def new_root(state, mark, other):
+    """Returns an empty tree for the GameState with `mark` to move."""
+    untried = [] if state.winner() else state.get_empty_cells()
+    return Node(None, other, None, untried)
+
+def _iterate(state, root, mark, other, exploration, rng):
+    """Runs one select/expand/rollout/backpropagate iteration."""
+    node = root
+    played = 0
+    # Selection: descend through fully expanded nodes
+    while not node.untried and node.children:
+        node = node.best_child(exploration)
+        state.make_move(node.move, node.mark)
+        played += 1
+
+    # Expansion: add one untried move
+    if node.untried:
+        untried = node.untried
+        pick = rng.randrange(len(untried))
+        untried[pick], untried[-1] = untried[-1], untried[pick]
+        move = untried.pop()
+        mover = other if node.mark == mark else mark
+        state.make_move(move, mover)
+        played += 1
+        terminal = state.check_win(mover) or state.move_count == state.size
+        child = Node(move, mover, node, [] if terminal else state.get_empty_cells())
+        node.children.append(child)
+        node = child
+
+    # Rollout: random moves until the game ends
+    winner = state.winner()
+    if winner is None and state.move_count < state.size:
+        to_move = other if node.mark == mark else mark
+        empty = state.get_empty_cells()
+        while empty:
+            pick = rng.randrange(len(empty))
+            empty[pick], empty[-1] = empty[-1], empty[pick]
+            state.make_move(empty.pop(), to_move)
+            played += 1
+            if state.check_win(to_move):
+                winner = to_move
+                break
+            to_move = other if to_move == mark else mark
+
+    # Backpropagation
+    while node is not None:
+        node.visits += 1
+        if winner is None:
+            node.wins += 0.5
+        elif winner == node.mark:
+            node.wins += 1.0
+        node = node.parent
+
+    for _ in range(played):
+        state.unmake_move()
+
+def mcts(state, mark, other, iterations=None, time_budget_ms=None,
+         exploration=DEFAULT_EXPLORATION, rng=None, root=None):
+    """
+    Searches the GameState for `mark` (to move) until `iterations` iterations
+    have run or time_budget_ms has passed (at least one budget is needed).
+    root continues an earlier tree for this position (see reuse_subtree).
+    Returns an MCTSResult; move is None if the game is already over.
+    """
+    if iterations is None and time_budget_ms is None:
+        raise ValueError("mcts needs an iteration or time budget")
+    rng = random if rng is None else rng # Module-level RNG unless the caller passes one
+    start = time.perf_counter()
+    deadline = None if time_budget_ms is None else start + time_budget_ms / 1000.0
+    if root is None:
+        root = new_root(state, mark, other)
+    if not root.untried and not root.children:
+        return MCTSResult(None, 0, 0.0, 0, 0.0, root)
+
+    done = 0
+    while iterations is None or done < iterations:
+        _iterate(state, root, mark, other, exploration, rng)
+        done += 1
+        if deadline is not None and done % _TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            break
+
+    best = root.most_visited()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    return MCTSResult(best.move, best.visits, best.wins / best.visits, done, elapsed_ms, root)
+
+def reuse_subtree(root, root_board, board):
+    """
+    Returns the node of `root`'s tree for `board`, which must be root_board plus
+    the moves played since (e.g. our move and the opponent's reply). Returns
+    None if the position isn't in the tree. The node is detached from its parent.
+    """
+    new_moves = {}
+    for index, (before, after) in enumerate(zip(root_board, board)):
+        if before != after:
+            if before != ' ':
+                return None # Not a continuation of the same game
+            new_moves[index] = after
+    node = root
+    while new_moves:
+        for child in node.children:
+            if new_moves.get(child.move) == child.mark:
+                del new_moves[child.move]
+                node = child
+                break
+        else:
+            return None
+    node.parent = None
+    return node
+
+# --- Root parallelization ---
+_pools = {}
+
+def _get_pool(workers):
+    """Returns a process pool with `workers` processes (kept for later searches)."""
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+def shutdown_pools():
+    """Shuts down the process pools kept by parallel_mcts; later searches start new ones."""
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+atexit.register(shutdown_pools)
+
+def _search_task(task):
+    """Worker entry point: searches its own tree and returns {move: (visits, wins)} at the root."""
+    board, lines, mark, other, iterations, time_budget_ms, exploration, seed = task
+    state = GameState(board, lines, len(board))
+    result = mcts(state, mark, other, iterations, time_budget_ms, exploration, random.Random(seed))
+    return {child.move: (child.visits, child.wins) for child in result.root.children}, result.iterations
+
+def parallel_mcts(state, mark, other, workers, iterations=None, time_budget_ms=None,
+                  exploration=DEFAULT_EXPLORATION, rng=None):
+    """
+    Root-parallel search: each of `workers` processes runs mcts with its own seed
+    (and iterations / workers iterations, so the total budget stays the same).
+    The seeds are drawn from rng (a random.Random, default: the random module),
+    so a seeded rng gives the same search in any process.
+    Returns an MCTSResult built from the merged root statistics (root is None).
+    """
+    start = time.perf_counter()
+    rng = rng or random
+    per_worker = None if iterations is None else max(1, -(-iterations // workers))
+    tasks = [(list(state.board), state.lines, mark, other, per_worker, time_budget_ms, exploration,
+              rng.getrandbits(64)) for _ in range(workers)]
+    totals = {}
+    done = 0
+    for stats, worker_iterations in _get_pool(workers).map(_search_task, tasks):
+        done += worker_iterations
+        for move, (visits, wins) in stats.items():
+            total = totals.setdefault(move, [0, 0.0])
+            total[0] += visits
+            total[1] += wins
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    if not totals:
+        return MCTSResult(None, 0, 0.0, done, elapsed_ms, None)
+    move = max(totals, key=lambda m: totals[m][0])
+    visits, wins = totals[move]
+    return MCTSResult(move, visits, wins / visits, done, elapsed_ms, None)
@@ -0,0 +1,187 @@
+# mnk.py
+"""
+Generalized m,n,k board engine: an m x n board where k marks in a row win
+(3,3,3 is classic Tic-Tac-Toe, 15,15,5 is gomoku).
+
+Cells use the same flat list of ' ', 'X', 'O' as board.py, so gui.py can
+draw an MNKBoard once gui.configure_board(rows, cols) has been called.
+Win detection is incremental: after a move only the four lines through the
+placed cell are scanned. Win info is ('line', (start_index, end_index)),
+which gui.get_win_line_coords understands alongside the 3x3 row/col/diag info.
+"""
+
+# Directions scanned through a cell: (row step, col step)
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class MNKBoard:
+    """An m x n board with k-in-a-row win detection."""
+    def __init__(self, rows=3, cols=3, k=3):
+        if not (1 <= k <= max(rows, cols)):
+            raise ValueError(f"k={k} cannot fit on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = [' ' for _ in range(rows * cols)]
+        self.move_count = 0
+        self.last_move = None # 0-based index of the most recent mark
+        self.win_info = None # Set once a move completes a line
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def is_cell_empty(self, position):
+        """Checks if the cell at the given position (1-based) is empty."""
+        if 1 <= position <= len(self.cells):
+            return self.cells[position - 1] == ' '
+        return False
+
+    def place_mark(self, position, mark):
+        """Places the mark at the given position (1-based) and updates the win state."""
+        if not self.is_cell_empty(position):
+            return False
+        index = position - 1
+        self.cells[index] = mark
+        self.move_count += 1
+        self.last_move = index
+        if self.win_info is None:
+            self.win_info = self.check_win_at(index)
+        return True
+
+    def get_empty_cells(self):
+        """Returns a list of 0-based indices of empty cells."""
+        return [i for i, cell in enumerate(self.cells) if cell == ' ']
+
+    def is_board_full(self):
+        """Checks if every cell is occupied (O(1) via the move counter)."""
+        return self.move_count == len(self.cells)
+
+    def check_win(self, mark):
+        """Returns the win info if `mark` has completed a line, else None."""
+        if self.win_info and self.cells[self.win_info[1][0]] == mark:
+            return self.win_info
+        return None
+
+    def _run_length(self, index, mark, d_row, d_col):
+        """Counts consecutive `mark` cells from index (exclusive) along one direction."""
+        row, col = divmod(index, self.cols)
+        length = 0
+        row += d_row
+        col += d_col
+        while 0 <= row < self.rows and 0 <= col < self.cols and self.cells[row * self.cols + col] == mark:
+            length += 1
+            row += d_row
+            col += d_col
+        return length
+
+    def check_win_at(self, index):
+        """
+        Checks only the lines through `index` for k in a row of its mark.
+        Returns ('line', (start_index, end_index)) or None.
+        """
+        mark = self.cells[index]
+        if mark == ' ':
+            return None
+        row, col = divmod(index, self.cols)
+        for d_row, d_col in DIRECTIONS:
+            forward = self._run_length(index, mark, d_row, d_col)
+            backward = self._run_length(index, mark, -d_row, -d_col)
+            if forward + backward + 1 >= self.k:
+                start = (row - backward * d_row) * self.cols + (col - backward * d_col)
+                end = (row + forward * d_row) * self.cols + (col + forward * d_col)
+                return ('line', (start, end))
+        return None
+
+    def would_win(self, index, mark):
+        """Checks if placing `mark` at the empty cell `index` would complete a line."""
+        self.cells[index] = mark
+        wins = self.check_win_at(index) is not None
+        self.cells[index] = ' '
+        return wins
+
+
+def winning_lines(rows, cols, k):
+    """
+    Returns every k-in-a-row window as (('line', (start_index, end_index)), cells),
+    the line format game_state.GameState accepts.
+    """
+    lines = []
+    for d_row, d_col in DIRECTIONS:
+        for row in range(rows):
+            for col in range(cols):
+                end_row, end_col = row + (k - 1) * d_row, col + (k - 1) * d_col
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    cells = tuple((row + step * d_row) * cols + col + step * d_col for step in range(k))
+                    lines.append((('line', (cells[0], cells[-1])), cells))
+    return lines
+
+
+# --- AI Logic ---
+def _candidate_cells(board, radius=2):
+    """Empty cells within `radius` of an existing mark (the centre cell on an empty board)."""
+    if board.move_count == 0:
+        return [(board.rows // 2) * board.cols + board.cols // 2]
+    candidates = set()
+    for index, cell in enumerate(board.cells):
+        if cell == ' ':
+            continue
+        row, col = divmod(index, board.cols)
+        for r in range(max(0, row - radius), min(board.rows, row + radius + 1)):
+            for c in range(max(0, col - radius), min(board.cols, col + radius + 1)):
+                if board.cells[r * board.cols + c] == ' ':
+                    candidates.add(r * board.cols + c)
+    return sorted(candidates)
+
+def _window_score(board, index, mark, other_mark):
+    """Scores the k-length windows through `index` that `mark` could still complete."""
+    row, col = divmod(index, board.cols)
+    score = 0
+    for d_row, d_col in DIRECTIONS:
+        for offset in range(board.k):
+            start_row, start_col = row - offset * d_row, col - offset * d_col
+            end_row, end_col = start_row + (board.k - 1) * d_row, start_col + (board.k - 1) * d_col
+            if not (0 <= start_row < board.rows and 0 <= end_row < board.rows and
+                    0 <= start_col < board.cols and 0 <= end_col < board.cols):
+                continue
+            own = 0
+            for step in range(board.k):
+                cell = board.cells[(start_row + step * d_row) * board.cols + start_col + step * d_col]
+                if cell == other_mark:
+                    break
+                if cell == mark:
+                    own += 1
+            else:
+                score += 4 ** own # Open window: weight grows with marks already in it
+    return score
+
+def get_mnk_move(board, ai_mark, human_mark):
+    """
+    Chooses a move on an MNKBoard: win, block, then the candidate cell with the
+    best attack + defence window score. Returns a 1-based position, or None.
+    Only empty cells near existing marks are scored, which keeps the AI
+    responsive on large boards.
+    """
+    candidates = _candidate_cells(board) or board.get_empty_cells()
+    if not candidates:
+        return None
+
+    # 1. Win if possible, 2. block the human's winning cell
+    for mark in (ai_mark, human_mark):
+        for index in candidates:
+            if board.would_win(index, mark):
+                return index + 1
+
+    # 3. Best combined attack/defence score, ties go to the cell nearest the centre
+    center_row, center_col = (board.rows - 1) / 2, (board.cols - 1) / 2
+    def score(index):
+        row, col = divmod(index, board.cols)
+        attack = _window_score(board, index, ai_mark, human_mark)
+        defence = _window_score(board, index, human_mark, ai_mark)
+        return (attack + defence, -abs(row - center_row) - abs(col - center_col))
+    return max(candidates, key=score) + 1
@@ -0,0 +1,187 @@
+# opening_book.py
+"""
+Full-game lookup table serialized to a compact binary file.
+
+`python opening_book.py build` enumerates every position reachable from
+board.initialize_board() (X moves first), solves it with solver.py and
+writes one 16-bit entry per base-3 board index:
+
+    bits 0-8   best moves for the player to move (bit i = cell i)
+    bits 9-10  value for the player to move: 0 loss, 1 draw, 2 win
+    bits 11-14 plies until the game ends under perfect play
+    bit 15     set if the position is reachable
+
+At runtime the file is opened with mmap, so any number of processes share one
+page-cached, zero-copy table and answer a move with a single index lookup.
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+
+from board import initialize_board, get_empty_cells
+from game_logic import check_win
+import solver
+
+MAGIC = b'TTTBOOK1'
+HEADER_SIZE = len(MAGIC)
+ENTRY = struct.Struct('<H')
+NUM_ENTRIES = 3 ** 9
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+CELL_CODES = {' ': 0, 'X': 1, 'O': 2}
+POWERS = [3 ** i for i in range(9)]
+LOSS, DRAW, WIN = 0, 1, 2
+REACHABLE_BIT = 1 << 15
+
+def board_index(board):
+    """Returns the base-3 index of a list board (cell i contributes code * 3^i)."""
+    index = 0
+    for power, cell in zip(POWERS, board):
+        index += CELL_CODES[cell] * power
+    return index
+
+def player_to_move(board):
+    """Returns the mark to move, assuming X moved first."""
+    return 'X' if board.count('X') == board.count('O') else 'O'
+
+def pack_entry(best_moves, value, plies):
+    """Packs one table entry (see module docstring)."""
+    mask = 0
+    for index in best_moves:
+        mask |= 1 << index
+    return REACHABLE_BIT | plies << 11 | value << 9 | mask
+
+def unpack_entry(entry):
+    """Returns (best_moves, value, plies) for a packed entry, or None if unreachable."""
+    if not entry & REACHABLE_BIT:
+        return None
+    best_moves = tuple(i for i in range(9) if entry >> i & 1)
+    return best_moves, entry >> 9 & 0b11, entry >> 11 & 0b1111
+
+def _solve_position(board, to_move):
+    """Returns (best_moves, value, plies) for a reachable position."""
+    empty_cells = get_empty_cells(board)
+    other = 'O' if to_move == 'X' else 'X'
+    if check_win(board, other):
+        return (), LOSS, 0
+    if not empty_cells:
+        return (), DRAW, 0
+
+    score = solver.evaluate(board, to_move) # >0 win, larger = sooner; see solver.py
+    best_moves = []
+    for index in empty_cells:
+        board[index] = to_move
+        if -solver.evaluate(board, other) == score:
+            best_moves.append(index)
+        board[index] = ' '
+    value = WIN if score > 0 else (LOSS if score < 0 else DRAW)
+    plies = len(empty_cells) if score == 0 else len(empty_cells) - abs(score) + 1
+    return best_moves, value, plies
+
+def enumerate_positions():
+    """Yields every list board reachable from the empty board (terminal ones included)."""
+    seen = set()
+    stack = [initialize_board()]
+    while stack:
+        board = stack.pop()
+        index = board_index(board)
+        if index in seen:
+            continue
+        seen.add(index)
+        yield board
+        to_move = player_to_move(board)
+        other = 'O' if to_move == 'X' else 'X'
+        if check_win(board, other):
+            continue # Game already over
+        for cell in get_empty_cells(board):
+            child = board[:]
+            child[cell] = to_move
+            stack.append(child)
+
+def build_book(path=DEFAULT_BOOK_PATH):
+    """Builds the table and writes it to path. Returns the number of reachable positions."""
+    entries = [0] * NUM_ENTRIES
+    count = 0
+    for board in enumerate_positions():
+        best_moves, value, plies = _solve_position(board, player_to_move(board))
+        entries[board_index(board)] = pack_entry(best_moves, value, plies)
+        count += 1
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack(f'<{NUM_ENTRIES}H', *entries))
+    os.replace(tmp_path, path) # Readers never see a half-written file
+    return count
+
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a book file."""
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:HEADER_SIZE] != MAGIC or len(self._mmap) != HEADER_SIZE + NUM_ENTRIES * ENTRY.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a valid opening book")
+
+    def close(self):
+        self._mmap.close()
+
+    def lookup(self, board):
+        """Returns (best_moves, value, plies) for a list board, or None if unreachable."""
+        offset = HEADER_SIZE + board_index(board) * ENTRY.size
+        return unpack_entry(ENTRY.unpack_from(self._mmap, offset)[0])
+
+    def best_moves(self, board, ai_mark):
+        """
+        Returns the best moves as 0-based indices, or None if the position is not
+        in the book (unreachable, finished, or not ai_mark's turn in an X-first game).
+        """
+        if player_to_move(board) != ai_mark:
+            return None
+        entry = self.lookup(board)
+        if not entry or not entry[0]:
+            return None
+        return entry[0]
+
+    def best_move(self, board, ai_mark, rng=None):
+        """Returns one of best_moves() as a 1-based position (drawn with rng), or None."""
+        moves = self.best_moves(board, ai_mark)
+        if moves is None:
+            return None
+        return (rng or random).choice(moves) + 1 # Any best move; vary play between equal options
+
+
+_default_book = None
+_default_book_missing = False
+
+def get_default_book():
+    """Returns the shared book at DEFAULT_BOOK_PATH, or None if it hasn't been built."""
+    global _default_book, _default_book_missing
+    if _default_book is None and not _default_book_missing:
+        try:
+            _default_book = OpeningBook(DEFAULT_BOOK_PATH)
+        except (OSError, ValueError):
+            _default_book_missing = True # Callers fall back to the solver
+    return _default_book
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Build or inspect the Tic-Tac-Toe opening book.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--path", default=DEFAULT_BOOK_PATH, help="book file location")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build_book(args.path)
+        print(f"Wrote {count} reachable positions to {args.path} ({os.path.getsize(args.path)} bytes)")
+    else:
+        book = OpeningBook(args.path)
+        best_moves, value, plies = book.lookup(initialize_board())
+        print(f"{args.path}: empty board value {('loss', 'draw', 'win')[value]} in {plies} plies, "
+              f"best moves {[i + 1 for i in best_moves]}")
+        book.close()
+
+if __name__ == "__main__":
+    main()
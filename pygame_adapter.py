@@ -0,0 +1,102 @@
+# pygame_adapter.py
+"""
+Pygame front end for the pure-logic Game class: a timer-based scheduler and
+renderers built on the drawing functions in gui.py.
+"""
+
+import pygame
+
+import gui
+
+class PygameScheduler:
+    """Schedules the AI move with a one-shot pygame timer event."""
+    def __init__(self, event_type=pygame.USEREVENT + 1):
+        self.event_type = event_type # Custom event for AI move timer
+        self._callback = None
+
+    def schedule(self, delay_ms, callback):
+        """Posts event_type once after delay_ms; fire() then runs the callback."""
+        self._callback = callback
+        pygame.time.set_timer(self.event_type, delay_ms, 1) # 1 means run once
+
+    def cancel(self):
+        """Stops a pending timer and forgets its callback."""
+        pygame.time.set_timer(self.event_type, 0)
+        self._callback = None
+
+    def fire(self):
+        """Runs the pending callback. Call this when event_type is received."""
+        callback, self._callback = self._callback, None
+        if callback:
+            callback()
+
+
+def ai_result_poster(event_type=pygame.USEREVENT + 2):
+    """
+    Returns an on_result callback for ai_worker.AIWorker that posts the move as
+    a pygame event with `position` and `token` attributes (safe from other threads).
+    """
+    def post(position, token):
+        pygame.event.post(pygame.event.Event(event_type, position=position, token=token))
+    return post
+
+
+def status_message(game):
+    """Returns the status line (or game-over message) for a game."""
+    if game.game_over:
+        return f"Player {game.winner} Wins!" if game.winner else "It's a Draw!"
+    return f"Player {game.current_player}'s Turn"
+
+
+class PygameRenderer:
+    """Draws a Game with gui.py and maps mouse clicks to board positions."""
+    def draw(self, screen, game):
+        """Draws the board, marks and status/game-over message."""
+        gui.draw_lines(screen)
+        gui.draw_figures(screen, game.board)
+
+        if game.game_over:
+            gui.draw_game_over(screen, status_message(game), game.winning_line_info)
+        else:
+            gui.draw_status(screen, status_message(game))
+
+    def board_position_at(self, pos):
+        """Converts mouse click coordinates (x, y) to board position (1-9), or None."""
+        x, y = pos
+        if y > gui.HEIGHT - 100: # Clicked below board/status area
+            return None
+
+        row = y // gui.SQUARE_SIZE
+        col = x // gui.SQUARE_SIZE
+
+        if 0 <= row < gui.BOARD_ROWS and 0 <= col < gui.BOARD_COLS:
+            return row * gui.BOARD_COLS + col + 1
+        return None
+
+
+class RetainedPygameRenderer(PygameRenderer):
+    """
+    Renderer that only redraws what changed (see gui.RetainedRenderer).
+    draw() returns the dirty rects for pygame.display.update, and also draws
+    the "Play Again?" button, whose rect is kept in play_again_button_rect.
+    """
+    def __init__(self, animate=True):
+        self._retained = gui.RetainedRenderer(animate)
+
+    @property
+    def play_again_button_rect(self):
+        return self._retained.play_again_button_rect
+
+    @property
+    def animating(self):
+        """True while a mark or the win line is animating (draw every frame)."""
+        return self._retained.animating
+
+    def invalidate(self):
+        """Forces a full redraw on the next draw (e.g. after the window is exposed)."""
+        self._retained.invalidate()
+
+    def draw(self, screen, game):
+        """Updates the screen and returns the list of dirty rects (empty if unchanged)."""
+        return self._retained.render(screen, game.board, status_message(game),
+                                     game.game_over, game.winning_line_info)
@@ -0,0 +1,487 @@
+# relay.py
+"""
+Local spectator relay: mirrors one running Game to many display processes on
+the same host over a Unix domain socket.
+
+Only deltas go over the wire. Each move is one small binary frame (sequence
+number, cell, mark), and a new game is a reset frame. Spectators rebuild the
+board and the win/draw state themselves (Mirror uses a GameState), so full
+boards are only sent as the snapshot a subscriber starts from.
+
+Frames (little-endian; the size follows from the kind byte):
+    MOVE      B kind, I seq, B cell (0-based), B mark             7 bytes
+    RESET     B kind, I seq, B first player                       6 bytes
+    SNAPSHOT  B kind, I seq, B player to move, B cell count,
+              then 2 bits per cell (0 empty, 1 X, 2 O)            7 + ceil(cells / 4) bytes
+Sequence numbers go up by one per frame. A subscriber that sees a gap
+raises RelaySyncError and reconnects. A snapshot is always accepted and
+restarts the sequence.
+
+Late joiners: the relay keeps a snapshot (the board at the last reset, or
+when a game was attached) plus the log of deltas since. A new subscriber is
+sent both (outside the publishing lock; frames published meanwhile are
+queued for it) and then follows the live frames. A reset starts a new
+snapshot, so the log is never longer than one game. The relay refuses to
+start on a socket another relay is listening on; a stale one is replaced.
+
+Publishing a move costs one non-blocking send() per subscriber. A
+subscriber whose socket buffer is full (a display that stopped reading) is
+disconnected. It catches up from the snapshot when it reconnects.
+
+Usage:
+    TTT_RELAY_SOCKET=/tmp/ttt.sock python main.py    # publish the game being played
+    python spectator.py /tmp/ttt.sock                # one display per process
+    python relay.py bench --displays 48 --games 500  # headless fan-out check
+"""
+import argparse
+import errno
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+import time
+
+from game_state import GameState
+from instrumentation import get_logger
+
+logger = get_logger("relay")
+
+KIND_MOVE, KIND_RESET, KIND_SNAPSHOT = 1, 2, 3
+MARK_CODES = {' ': 0, 'X': 1, 'O': 2}
+CODE_MARKS = {code: mark for mark, code in MARK_CODES.items()}
+MOVE_FRAME = struct.Struct('<BIBB')
+RESET_FRAME = struct.Struct('<BIB')
+SNAPSHOT_HEADER = struct.Struct('<BIBB')
+SEQ_MODULO = 1 << 32
+CATCH_UP_TIMEOUT_S = 1.0 # A new subscriber must accept the snapshot and log within this time
+RETRY_S = 1.0 # Subscriber reconnect delay
+
+
+class RelaySyncError(ValueError):
+    """Raised when a frame does not follow the previous one (gap or illegal move)."""
+
+
+# --- Encoding ---
+def encode_move(seq, cell, mark):
+    return MOVE_FRAME.pack(KIND_MOVE, seq, cell, MARK_CODES[mark])
+
+def encode_reset(seq, first_player):
+    return RESET_FRAME.pack(KIND_RESET, seq, MARK_CODES[first_player])
+
+def encode_snapshot(seq, board, to_move):
+    packed = 0
+    for index, cell in enumerate(board):
+        packed |= MARK_CODES[cell] << (2 * index)
+    return (SNAPSHOT_HEADER.pack(KIND_SNAPSHOT, seq, MARK_CODES[to_move], len(board))
+            + packed.to_bytes((len(board) + 3) // 4, 'little'))
+
+def decode_frame(data):
+    """
+    Decodes one complete frame into ('move', seq, cell, mark),
+    ('reset', seq, first_player) or ('snapshot', seq, board, to_move).
+    """
+    kind = data[0]
+    if kind == KIND_MOVE:
+        _, seq, cell, mark = MOVE_FRAME.unpack(data)
+        return ('move', seq, cell, CODE_MARKS[mark])
+    if kind == KIND_RESET:
+        _, seq, first_player = RESET_FRAME.unpack(data)
+        return ('reset', seq, CODE_MARKS[first_player])
+    _, seq, to_move, cells = SNAPSHOT_HEADER.unpack_from(data)
+    packed = int.from_bytes(data[SNAPSHOT_HEADER.size:], 'little')
+    board = [CODE_MARKS[packed >> (2 * index) & 0b11] for index in range(cells)]
+    return ('snapshot', seq, board, CODE_MARKS[to_move])
+
+def _frame_size(buffer, offset):
+    """Returns the size of the frame starting at offset, or None if its header is incomplete."""
+    kind = buffer[offset]
+    if kind == KIND_MOVE:
+        return MOVE_FRAME.size
+    if kind == KIND_RESET:
+        return RESET_FRAME.size
+    if kind == KIND_SNAPSHOT:
+        if len(buffer) - offset < SNAPSHOT_HEADER.size:
+            return None
+        return SNAPSHOT_HEADER.size + (buffer[offset + SNAPSHOT_HEADER.size - 1] + 3) // 4
+    raise RelaySyncError(f"unknown frame kind {kind}")
+
+
+class FrameReader:
+    """Splits a byte stream into decoded frames; a partial frame waits for the next feed()."""
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Adds received bytes and returns the list of frames completed by them."""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+        while offset < len(buffer):
+            size = _frame_size(buffer, offset)
+            if size is None or len(buffer) - offset < size:
+                break
+            frames.append(decode_frame(bytes(buffer[offset:offset + size])))
+            offset += size
+        del buffer[:offset]
+        return frames
+
+
+class Mirror:
+    """
+    A spectator's copy of the game, rebuilt from frames. It has the board,
+    current_player, game_over, winner and winning_line_info attributes of
+    game.Game, so pygame_adapter.status_message() works on it.
+    """
+    def __init__(self):
+        self.seq = None # No snapshot yet
+        self._load([' '] * 9, 'X')
+
+    def _load(self, board, to_move):
+        self.state = GameState(board)
+        self.board = self.state.board
+        self.current_player = to_move
+        self._update_result()
+
+    def _update_result(self):
+        self.winner = None
+        self.winning_line_info = None
+        for mark in ('X', 'O'):
+            win_info = self.state.check_win(mark)
+            if win_info:
+                self.winner, self.winning_line_info = mark, win_info
+                break
+        self.game_over = self.winner is not None or self.state.check_draw()
+
+    def apply(self, frame):
+        """Applies one decoded frame (RelaySyncError if it doesn't follow the last one)."""
+        kind, seq = frame[0], frame[1]
+        if kind == 'snapshot':
+            self.seq = seq
+            self._load(frame[2], frame[3])
+            return
+        if self.seq is None or seq != (self.seq + 1) % SEQ_MODULO:
+            raise RelaySyncError(f"frame {seq} after {self.seq}")
+        self.seq = seq
+        if kind == 'reset':
+            self._load([' '] * len(self.board), frame[2])
+            return
+        _, _, cell, mark = frame
+        if not 0 <= cell < len(self.board) or not self.state.place_mark(cell + 1, mark):
+            raise RelaySyncError(f"frame {seq}: illegal move {cell + 1} for {mark}")
+        self.current_player = 'O' if mark == 'X' else 'X'
+        self._update_result()
+
+
+class GameRelay:
+    """Publishes one game to every subscriber of a Unix socket (see module docstring)."""
+    def __init__(self, path, size=9):
+        self.path = path
+        self._size = size
+        self._lock = threading.Lock() # Publishing and new subscribers take turns
+        self._seq = 0
+        self._snapshot = encode_snapshot(0, [' '] * size, 'X')
+        self._log = [] # Delta frames since the snapshot
+        self._subscribers = []
+        self._joining = {} # conn -> live frames published while its catch-up is being sent
+        self.stats = {'subscribers': 0, 'joined': 0, 'dropped': 0, 'frames': 0, 'bytes_sent': 0}
+
+        _remove_stale_socket(path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="relay-accept", daemon=True)
+        self._accept_thread.start()
+        logger.info("Relay listening on %s", path)
+
+    # --- Publishing ---
+    def attach(self, game):
+        """Mirrors a game.Game: publishes its current board, then every move and reset."""
+        self.publish_snapshot(game.board, game.current_player)
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event, *args):
+        """Game listener callback (see Game.add_listener)."""
+        if event == 'move':
+            self.publish_move(*args)
+        elif event == 'reset':
+            self.publish_reset(*args)
+
+    def publish_move(self, cell, mark):
+        with self._lock:
+            frame = encode_move(self._next_seq(), cell, mark)
+            self._log.append(frame)
+            self._broadcast(frame)
+
+    def publish_reset(self, first_player='X'):
+        with self._lock:
+            seq = self._next_seq()
+            self._snapshot = encode_snapshot(seq, [' '] * self._size, first_player) # For late joiners
+            self._log = []
+            self._broadcast(encode_reset(seq, first_player))
+
+    def publish_snapshot(self, board, to_move):
+        """Starts over from a full board (e.g. when attaching to a game in progress)."""
+        with self._lock:
+            self._size = len(board)
+            self._snapshot = encode_snapshot(self._next_seq(), board, to_move)
+            self._log = []
+            self._broadcast(self._snapshot)
+
+    @property
+    def seq(self):
+        """Sequence number of the last frame published."""
+        return self._seq
+
+    def catch_up(self):
+        """Returns what a new subscriber is sent: the snapshot followed by the delta log."""
+        return self._snapshot + b''.join(self._log)
+
+    def _next_seq(self):
+        self._seq = (self._seq + 1) % SEQ_MODULO
+        return self._seq
+
+    def _broadcast(self, frame):
+        """Sends a frame to every subscriber without blocking (caller holds the lock)."""
+        self.stats['frames'] += 1
+        for pending in self._joining.values():
+            pending.append(frame)
+        for conn in list(self._subscribers):
+            try:
+                sent = conn.send(frame)
+            except OSError: # Gone (EPIPE) or not reading (EAGAIN)
+                sent = 0
+            if sent == len(frame):
+                self.stats['bytes_sent'] += sent
+            else: # A partial frame would corrupt its stream; it reconnects and catches up
+                self._drop(conn)
+
+    def _drop(self, conn):
+        self._subscribers.remove(conn)
+        conn.close()
+        self.stats['subscribers'] -= 1
+        self.stats['dropped'] += 1
+
+    # --- Subscribers ---
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return # Listener closed
+            with self._lock:
+                catch_up = self.catch_up()
+                self._joining[conn] = pending = []
+            # Blocking send without the lock, so a slow joiner never stalls publishing
+            try:
+                conn.settimeout(CATCH_UP_TIMEOUT_S)
+                conn.sendall(catch_up)
+                conn.setblocking(False)
+            except OSError:
+                sent = None
+            else:
+                sent = len(catch_up)
+            with self._lock:
+                del self._joining[conn]
+                if sent is not None and pending: # Published meanwhile; sent like any live frame
+                    backlog = b''.join(pending)
+                    try:
+                        backlog_sent = conn.send(backlog)
+                    except OSError:
+                        backlog_sent = 0
+                    sent = sent + backlog_sent if backlog_sent == len(backlog) else None
+                if sent is None:
+                    conn.close() # It reconnects and catches up
+                    continue
+                self._subscribers.append(conn)
+                self.stats['subscribers'] += 1
+                self.stats['joined'] += 1
+                self.stats['bytes_sent'] += sent
+
+    def close(self):
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR) # Wakes the accept thread
+        except OSError:
+            pass
+        self._listener.close()
+        self._accept_thread.join(timeout=1.0)
+        with self._lock:
+            for conn in self._subscribers:
+                conn.close()
+            self._subscribers = []
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(path):
+    """
+    Removes a socket file left behind by a previous run. Raises OSError
+    (EADDRINUSE) if a relay is still listening on it.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return # bind() reports anything else
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path) # Nobody is listening
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "a relay is already listening on this socket", path)
+
+def open_relay_from_environment():
+    """Returns a GameRelay listening on $TTT_RELAY_SOCKET, or None if it isn't set."""
+    path = os.environ.get("TTT_RELAY_SOCKET")
+    return GameRelay(path) if path else None
+
+
+class RelaySubscriber:
+    """
+    Follows a relay in a background thread and keeps `mirror` (a Mirror) up
+    to date. Read it while holding `lock`. on_change() (optional) is called
+    from the thread after each batch of frames. After a disconnect or a
+    RelaySyncError it reconnects and starts again from the snapshot.
+    """
+    def __init__(self, path, on_change=None, retry_s=RETRY_S):
+        self.path = path
+        self.on_change = on_change
+        self.retry_s = retry_s
+        self.mirror = Mirror()
+        self.lock = threading.Lock()
+        self.connected = False
+        self.bytes_received = 0
+        self._stopping = threading.Event()
+        self._sock = None
+        self._thread = threading.Thread(target=self._run, name="relay-subscriber", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._follow()
+            except (OSError, RelaySyncError) as error:
+                logger.debug("Relay subscriber disconnected: %r", error)
+            self.connected = False
+            self._stopping.wait(self.retry_s)
+
+    def _follow(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            self._sock = sock
+            sock.connect(self.path)
+            self.connected = True
+            reader = FrameReader()
+            while True:
+                data = sock.recv(4096)
+                if not data:
+                    return # Relay closed
+                self.bytes_received += len(data)
+                with self.lock:
+                    for frame in reader.feed(data):
+                        self.mirror.apply(frame)
+                if self.on_change:
+                    self.on_change()
+
+    def stop(self):
+        self._stopping.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR) # Wakes recv()
+            except OSError:
+                pass
+        self._thread.join(timeout=1.0)
+
+
+# --- Headless fan-out check ---
+def run_bench(displays, games, seed=0, late_joiners=1):
+    """
+    Publishes `games` AI-vs-AI games to `displays` subscribers (threads in
+    this process) and checks that every mirror, plus late joiners that
+    connect after the last move, ends on the publisher's final board.
+    Returns a results dict.
+    """
+    import simulate
+    from seeding import game_rng
+
+    path = os.path.join(tempfile.mkdtemp(), "relay.sock")
+    relay = GameRelay(path)
+    subscribers = [RelaySubscriber(path).start() for _ in range(displays)]
+    deadline = time.perf_counter() + 5.0
+    while relay.stats['subscribers'] < displays and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+    publish_s = 0.0
+    moves_published = 0
+    cpu_start = time.process_time()
+    for game_index in range(games):
+        moves = []
+        simulate.play_game("hard", "easy", moves, game_rng(seed, game_index))
+        start = time.perf_counter()
+        relay.publish_reset('X')
+        mark = 'X'
+        for position in moves:
+            relay.publish_move(position - 1, mark)
+            mark = 'O' if mark == 'X' else 'X'
+        publish_s += time.perf_counter() - start
+        moves_published += len(moves)
+    reference = Mirror() # The board as the publisher last saw it
+    for frame in FrameReader().feed(relay.catch_up()):
+        reference.apply(frame)
+    final_board, final_seq = reference.board, relay.seq
+
+    subscribers += [RelaySubscriber(path).start() for _ in range(late_joiners)]
+    deadline = time.perf_counter() + 5.0
+    while time.perf_counter() < deadline:
+        if all(s.mirror.seq == final_seq for s in subscribers):
+            break
+        time.sleep(0.01)
+    cpu_s = time.process_time() - cpu_start
+    in_sync = sum(1 for s in subscribers if s.mirror.seq == final_seq and s.mirror.board == final_board)
+    for subscriber in subscribers:
+        subscriber.stop()
+    relay.close()
+    os.rmdir(os.path.dirname(path))
+    return {
+        'displays': displays + late_joiners,
+        'in_sync': in_sync,
+        'games': games,
+        'moves': moves_published,
+        'frames': relay.stats['frames'],
+        'bytes_sent': relay.stats['bytes_sent'],
+        'dropped': relay.stats['dropped'],
+        'publish_us_per_frame': 1e6 * publish_s / max(1, relay.stats['frames']),
+        'cpu_s': cpu_s,
+    }
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Spectator relay tools.")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--displays", type=int, default=48, help="subscribers following the relay")
+    parser.add_argument("--games", type=int, default=200, help="games to publish")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run_bench(args.displays, args.games, args.seed)
+    print(f"{r['in_sync']}/{r['displays']} displays in sync (incl. a late joiner) after {r['games']} games, "
+          f"{r['frames']} frames")
+    print(f"Sent {r['bytes_sent']:,} bytes ({r['bytes_sent'] / max(1, r['frames'] * r['displays']):.1f} per frame "
+          f"per display), {r['dropped']} dropped subscribers")
+    print(f"Publishing: {r['publish_us_per_frame']:.1f} us per frame for all displays; "
+          f"process CPU {r['cpu_s']:.2f}s (publisher plus all subscriber threads)")
+    if r['in_sync'] != r['displays']:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
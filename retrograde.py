@@ -0,0 +1,197 @@
+# retrograde.py
+"""
+Exhaustive state-space enumeration and retrograde (backward-induction) solve.
+
+Every position reachable from board.initialize_board() (X moves first) is
+enumerated ply by ply. Positions are encoded as x_bits | o_bits << 9 (18-bit
+ints, see bitboard.py) and deduplicated with a set. They are then solved
+from the last ply back to the first: each position's value comes from its
+children's values, which are already known, with no recursion. Memory is
+bounded by the 5478 reachable positions.
+
+Values are scores for the player to move: WIN_BASE - plies for a win in
+`plies` plies, -(WIN_BASE - plies) for a loss, 0 for a draw.
+
+The audit checks a strategy against the solved values. At every reachable
+position where it is to move, each move it could choose is compared with
+the position's value, and any move that turns a win into a draw/loss or a
+draw into a loss is a blunder. The heuristic ("hard") AI's possible choices
+come from strategies.heuristic_candidates (it breaks ties among corners/sides
+at random), and the actual get_ai_move result is checked to be among them;
+a move outside them is reported as a mismatch (the CLI exits with status 1).
+
+Usage:
+    python retrograde.py            # per-ply report and audit summary
+    python retrograde.py --list     # also list every blunder
+"""
+import argparse
+import sys
+import time
+
+from bitboard import WIN_TABLE, EMPTY_CELLS_TABLE
+from game_state import GameState
+from strategies import heuristic_candidates, FORCED_BRANCHES
+import ai_player
+import player
+
+WIN_BASE = 10 # Larger than any number of plies
+
+def encode(x_bits, o_bits):
+    return x_bits | o_bits << 9
+
+def decode(key):
+    return key & 0x1FF, key >> 9
+
+def to_list(key):
+    """Returns the list board for an encoded position."""
+    x_bits, o_bits = decode(key)
+    return ['X' if x_bits >> i & 1 else ('O' if o_bits >> i & 1 else ' ') for i in range(9)]
+
+def is_terminal(x_bits, o_bits):
+    return (WIN_TABLE[x_bits] is not None or WIN_TABLE[o_bits] is not None
+            or not EMPTY_CELLS_TABLE[x_bits | o_bits])
+
+def children(key):
+    """Yields the encoded positions one move after a non-terminal position."""
+    x_bits, o_bits = decode(key)
+    x_to_move = bin(x_bits).count('1') == bin(o_bits).count('1')
+    for index in EMPTY_CELLS_TABLE[x_bits | o_bits]:
+        if x_to_move:
+            yield encode(x_bits | 1 << index, o_bits)
+        else:
+            yield encode(x_bits, o_bits | 1 << index)
+
+def enumerate_layers():
+    """Returns a list of lists: the distinct reachable positions at each ply (0-9)."""
+    seen = {0}
+    layers = [[0]]
+    while layers[-1]:
+        next_layer = []
+        for key in layers[-1]:
+            if is_terminal(*decode(key)):
+                continue
+            for child in children(key):
+                if child not in seen:
+                    seen.add(child)
+                    next_layer.append(child)
+        layers.append(next_layer)
+    layers.pop() # Trailing empty layer
+    return layers
+
+def solve(layers):
+    """Backward induction over the layers; returns {position: score for the player to move}."""
+    values = {}
+    for layer in reversed(layers):
+        for key in layer:
+            x_bits, o_bits = decode(key)
+            if WIN_TABLE[x_bits] is not None or WIN_TABLE[o_bits] is not None:
+                values[key] = -WIN_BASE # The player to move has just lost
+            elif not EMPTY_CELLS_TABLE[x_bits | o_bits]:
+                values[key] = 0
+            else:
+                best = None
+                for child in children(key):
+                    score = values[child]
+                    # One ply further from the end, seen from the other side
+                    value = -(score - 1) if score > 0 else (-score - 1 if score < 0 else 0)
+                    if best is None or value > best:
+                        best = value
+                values[key] = best
+    return values
+
+def result_of(score):
+    return 'win' if score > 0 else ('loss' if score < 0 else 'draw')
+
+def ply_report(layers, values):
+    """Returns rows of (ply, positions, terminal, wins, draws, losses) for the player to move."""
+    rows = []
+    for ply, layer in enumerate(layers):
+        terminal = sum(1 for key in layer if is_terminal(*decode(key)))
+        wins = sum(1 for key in layer if values[key] > 0)
+        losses = sum(1 for key in layer if values[key] < 0)
+        rows.append((ply, len(layer), terminal, wins, len(layer) - wins - losses, losses))
+    return rows
+
+def _move_score(values, key, index):
+    """Score for the mover of playing cell `index` in position `key`."""
+    x_bits, o_bits = decode(key)
+    if bin(x_bits).count('1') == bin(o_bits).count('1'):
+        score = values[encode(x_bits | 1 << index, o_bits)]
+    else:
+        score = values[encode(x_bits, o_bits | 1 << index)]
+    return -(score - 1) if score > 0 else (-score - 1 if score < 0 else 0)
+
+def heuristic_choices(board, mark, other):
+    """Returns the 0-based moves the heuristic ("hard") AI can choose in a position."""
+    branch, candidates, _ = heuristic_candidates(GameState(board), mark, other)
+    return candidates[:1] if branch in FORCED_BRANCHES else candidates
+
+def audit(values, choices, move_function=None):
+    """
+    Checks a strategy at every reachable non-terminal position. choices(board,
+    mark, other) returns the 0-based moves it may play; move_function(board,
+    mark, other), if given, is called once per position and its 1-based move
+    should be one of them. Returns (blunders, mismatches): blunders as
+    (board, mark, move, position result, result after the move), mismatches
+    as (board, mark, move, audited choices) for moves outside the choices.
+    """
+    blunders = []
+    mismatches = []
+    for key, score in values.items():
+        x_bits, o_bits = decode(key)
+        if is_terminal(x_bits, o_bits):
+            continue
+        board = to_list(key)
+        mark, other = ('X', 'O') if bin(x_bits).count('1') == bin(o_bits).count('1') else ('O', 'X')
+        possible = choices(board, mark, other)
+        if move_function is not None:
+            move = move_function(board, mark, other)
+            if move is None or move - 1 not in possible:
+                mismatches.append((board, mark, move, [index + 1 for index in possible]))
+        for index in possible:
+            after = _move_score(values, key, index)
+            if result_of(after) != result_of(score):
+                blunders.append((board, mark, index + 1, result_of(score), result_of(after)))
+    return blunders, mismatches
+
+def _cells(board):
+    return ''.join(cell if cell != ' ' else '.' for cell in board)
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Enumerate, solve and audit every reachable position.")
+    parser.add_argument("--list", action="store_true", help="list every blunder")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    layers = enumerate_layers()
+    values = solve(layers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(values)} reachable positions enumerated and solved in {elapsed * 1000:.0f} ms")
+    print(f"{'ply':>3} {'positions':>9} {'terminal':>8} {'win':>6} {'draw':>6} {'loss':>6}  (for the player to move)")
+    for row in ply_report(layers, values):
+        print(f"{row[0]:>3} {row[1]:>9} {row[2]:>8} {row[3]:>6} {row[4]:>6} {row[5]:>6}")
+    print(f"Empty board: {result_of(values[0])} for X")
+
+    audits = [
+        ('ai_player.get_ai_move("hard")',
+         lambda board, mark, other: ai_player.get_ai_move(board, mark, other, "hard")),
+        ('player.get_ai_move', player.get_ai_move),
+    ]
+    mismatched = False
+    for name, move_function in audits:
+        blunders, mismatches = audit(values, heuristic_choices, move_function)
+        positions = len({tuple(board) for board, *_ in blunders})
+        print(f"{name}: {len(blunders)} blunders in {positions} positions")
+        if args.list:
+            for board, mark, move, before, after in sorted(blunders):
+                print(f"  {_cells(board)} {mark} plays {move}: {before} -> {after}")
+        # Always listed: the audit only covers the choices, so these mean the audit is wrong
+        for board, mark, move, possible in mismatches:
+            print(f"  MISMATCH {_cells(board)} {mark} plays {move}, not among the audited choices {possible}")
+        mismatched = mismatched or bool(mismatches)
+    if mismatched:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# search.py
+"""
+Anytime game-tree search for the AI turn.
+
+iterative_deepening() runs negamax with alpha-beta pruning on a GameState
+(make/unmake, no board copies), one depth at a time, until the game tree is
+exhausted or a wall-clock/node budget runs out. It always returns the best
+move from the deepest completed iteration, along with the depth reached and
+the number of nodes searched, so AI strength can be tuned by compute budget.
+
+Works on any GameState line set, including the larger m,n,k boards built
+from mnk.winning_lines.
+"""
+import time
+from collections import namedtuple
+
+WIN_SCORE = 1 << 40 # Score of an immediate win; faster wins score higher
+PROVEN_SCORE = WIN_SCORE - 1000 # Scores beyond this are forced wins/losses, not estimates
+# Clock reads happen every _TIME_CHECK_WORK / (lines + cells) nodes: 240 nodes on
+# 3x3, a handful on 15x15 where each node's evaluation and move ordering cost more
+_TIME_CHECK_WORK = 4096
+
+# move is a 0-based index (None if there are no legal moves); completed is True
+# when the full game tree was searched, so score is exact.
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'completed', 'elapsed_ms'])
+
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+
+
+class _Search:
+    """Holds the budget and counters for one iterative-deepening run."""
+    def __init__(self, state, time_budget_ms, node_budget):
+        self.state = state
+        self.nodes = 0
+        self.node_budget = node_budget
+        self.deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000.0
+        self.time_check_interval = max(1, _TIME_CHECK_WORK // (len(state.lines) + state.size))
+        self.hit_horizon = False # True if any branch was cut off by the depth limit
+
+    def _tick(self):
+        """Counts a node and raises _BudgetExceeded when a budget is spent."""
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise _BudgetExceeded()
+        if self.deadline is not None and self.nodes % self.time_check_interval == 0:
+            if time.perf_counter() > self.deadline:
+                raise _BudgetExceeded()
+
+    def evaluate(self, mark, other):
+        """Static evaluation from `mark`'s point of view: open lines weighted by their fill."""
+        own_counts = self.state.line_counts(mark)
+        other_counts = self.state.line_counts(other)
+        score = 0
+        for own, opp in zip(own_counts, other_counts):
+            if opp == 0 and own:
+                score += 1 << (2 * own)
+            elif own == 0 and opp:
+                score -= 1 << (2 * opp)
+        return score
+
+    def ordered_moves(self, mark, other, first=None):
+        """Empty cells ordered: `first`, immediate wins, blocks, then by line activity."""
+        state = self.state
+        own_counts = state.line_counts(mark)
+        other_counts = state.line_counts(other)
+        def priority(index):
+            if index == first:
+                return 4 << 20
+            if state.wins_with(index, mark):
+                return 3 << 20
+            if state.wins_with(index, other):
+                return 2 << 20
+            return sum(own_counts[line_id] + other_counts[line_id] + 1
+                       for line_id in state.lines_through[index])
+        return sorted(state.get_empty_cells(), key=priority, reverse=True)
+
+    def negamax(self, depth, ply, alpha, beta, mark, other):
+        """Returns the score for `mark` (to move) searched to `depth` plies."""
+        self._tick()
+        state = self.state
+        if state.check_win(other):
+            return -(WIN_SCORE - ply) # Previous move won
+        if state.check_draw():
+            return 0
+        if depth == 0:
+            self.hit_horizon = True
+            return self.evaluate(mark, other)
+
+        best = -WIN_SCORE - 1
+        for index in self.ordered_moves(mark, other):
+            state.make_move(index, mark)
+            try:
+                score = -self.negamax(depth - 1, ply + 1, -beta, -alpha, other, mark)
+            finally:
+                state.unmake_move()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break # Beta cutoff
+        return best
+
+    def root(self, depth, mark, other, first):
+        """Searches all root moves to `depth`; returns (score, best_index)."""
+        state = self.state
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_index = None
+        for index in self.ordered_moves(mark, other, first):
+            state.make_move(index, mark)
+            try:
+                score = -self.negamax(depth - 1, 1, -beta, -alpha, other, mark)
+            finally:
+                state.unmake_move()
+            if best_index is None or score > alpha:
+                alpha, best_index = score, index
+        return alpha, best_index
+
+
+def iterative_deepening(state, mark, other, time_budget_ms=None, node_budget=None, max_depth=None):
+    """
+    Searches the GameState for `mark` (to move) with increasing depth until the
+    tree is exhausted, max_depth is reached or a budget (milliseconds of wall
+    clock / nodes) runs out. Returns a SearchResult for the deepest completed
+    iteration; if not even depth 1 completes, the best-ordered move is returned
+    with depth 0.
+    """
+    start = time.perf_counter()
+    search = _Search(state, time_budget_ms, node_budget)
+    empty_cells = state.get_empty_cells()
+    if not empty_cells or state.winner():
+        return SearchResult(None, 0, 0, 0, True, 0.0)
+
+    max_depth = len(empty_cells) if max_depth is None else min(max_depth, len(empty_cells))
+    best_index = search.ordered_moves(mark, other)[0] # Fallback if depth 1 doesn't finish
+    best_score, depth_reached, completed = 0, 0, False
+
+    for depth in range(1, max_depth + 1):
+        search.hit_horizon = False
+        try:
+            score, index = search.root(depth, mark, other, best_index)
+        except _BudgetExceeded:
+            break # Keep the last completed iteration
+        best_score, best_index, depth_reached = score, index, depth
+        if not search.hit_horizon or abs(score) > PROVEN_SCORE:
+            completed = not search.hit_horizon
+            break # Whole tree seen, or a forced result was proven
+
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    return SearchResult(best_index, best_score, depth_reached, search.nodes, completed, elapsed_ms)
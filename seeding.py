@@ -0,0 +1,45 @@
+# seeding.py
+"""
+Deterministic, counter-based RNG derivation for reproducible runs.
+
+Nothing random in the engine uses the module-level `random` state unless the
+caller leaves the rng out. Tools pass random.Random objects explicitly, and
+derive them from a base seed plus counters (game number, session id, ...)
+instead of from a shared stream:
+
+    derive_seed(seed, *counters)   64-bit seed from a hash of seed and counters
+    derive_rng(seed, *counters)    random.Random(derive_seed(...))
+    game_rng(seed, game_index)     the RNG of game `game_index` in a run
+
+The pygame front ends read a seed from $TTT_SEED (rng_from_environment).
+
+Game n of a run always gets the same RNG, whichever worker plays it, how the
+games are chunked, and in which order the chunks finish. So results are
+bit-identical for any worker count, and a (seed, counters) pair can be used
+as a cache key.
+"""
+import hashlib
+import os
+import random
+
+def derive_seed(seed, *counters):
+    """Returns a 64-bit seed for (seed, *counters); counters are ints or strings."""
+    key = ":".join(str(part) for part in (seed, *counters)).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+def derive_rng(seed, *counters):
+    """Returns a new random.Random seeded with derive_seed(seed, *counters)."""
+    return random.Random(derive_seed(seed, *counters))
+
+def game_rng(seed, game_index):
+    """Returns the RNG for game number game_index of a run seeded with seed."""
+    return derive_rng(seed, "game", game_index)
+
+def rng_from_environment():
+    """Returns a random.Random seeded with $TTT_SEED, or None if it isn't set."""
+    seed = os.environ.get("TTT_SEED")
+    return derive_rng(int(seed), "environment") if seed else None
+
+def child_rng(rng):
+    """Returns a new random.Random seeded from rng (one draw), e.g. to hand to another process."""
+    return random.Random(rng.getrandbits(64))
@@ -0,0 +1,315 @@
+# server.py
+"""
+Asyncio game server: many independent Human-vs-AI sessions over a simple
+line-based JSON protocol (TCP or a Unix socket).
+
+Each session is a game.Game driven by an asyncio scheduler, so the AI's
+reply runs on the event loop after ai_delay_ms instead of a pygame timer.
+Strategies marked cpu_heavy (search, mcts) compute their moves in a shared
+process pool (or a thread with --workers 0); the cheap ones run inline.
+
+Protocol: one JSON object per line in each direction.
+    -> {"op": "new", "difficulty": "hard"}            (plus CLIENT_OPTIONS the strategy takes)
+    <- {"type": "state", "session": 1, "board": [...], "turn": "X", ...}
+    -> {"op": "move", "session": 1, "position": 5}
+    <- {"type": "state", ...}   the human move is applied (AI to move)
+    <- {"type": "state", ...}   later: the AI has replied
+    -> {"op": "reset", "session": 1}   /   {"op": "close", "session": 1}
+    -> {"op": "stats"}
+    <- {"type": "stats", ...}
+Failed requests are answered with {"type": "error", "message": ...}.
+Sessions belong to their connection and are closed with it.
+
+Usage:
+    python server.py --port 8765
+    python server.py --unix /tmp/tictactoe.sock --workers 4 --ai-delay-ms 0
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game import Game, HUMAN_PLAYER, AI_PLAYER, AI_DELAY_MS
+from game_record import GameRecorder
+from instrumentation import get_logger
+from seeding import derive_rng
+from strategies import strategy_class
+import mcts
+
+logger = get_logger("server")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Strategy options a client may set in "new": option -> (type, min, max).
+# Values are clamped to the range; any other key is refused.
+CLIENT_OPTIONS = {
+    'iterations': (int, 1, 20_000),
+    'time_budget_ms': (int, 1, 2_000),
+    'node_budget': (int, 1, 1_000_000),
+    'max_depth': (int, 1, 9),
+    'exploration': (float, 0.0, 10.0),
+    'reuse_tree': (bool, None, None),
+    'workers': (int, 1, 1), # Sessions share the server's pool, never a pool of their own
+}
+
+def client_strategy_options(difficulty, request):
+    """Returns the checked and clamped strategy options of a "new" request (ValueError if refused)."""
+    accepted = strategy_class(difficulty).defaults
+    options = {}
+    for key, value in request.items():
+        if key in ('op', 'difficulty'):
+            continue
+        if key not in CLIENT_OPTIONS or key not in accepted:
+            raise ValueError(f"option {key!r} is not accepted for difficulty {difficulty!r}")
+        kind, low, high = CLIENT_OPTIONS[key]
+        if kind is bool:
+            if not isinstance(value, bool):
+                raise ValueError(f"option {key!r} must be true or false")
+        else:
+            # bool is an int subclass, but true/false is no number
+            if isinstance(value, bool) or not isinstance(value, (int, float) if kind is float else int):
+                raise ValueError(f"option {key!r} must be a number")
+            value = min(max(value, low), high)
+        options[key] = value
+    return options
+
+
+class AsyncioScheduler:
+    """Game scheduler that runs the AI turn with loop.call_later."""
+    def __init__(self, after_callback=None):
+        self._handle = None
+        self._after_callback = after_callback # Runs after each scheduled callback
+
+    def schedule(self, delay_ms, callback):
+        self.cancel()
+        self._handle = asyncio.get_running_loop().call_later(delay_ms / 1000.0, self._fire, callback)
+
+    def _fire(self, callback):
+        self._handle = None
+        callback()
+        if self._after_callback:
+            self._after_callback()
+
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+class ProcessPoolAIWorker:
+    """
+    AIWorker-compatible helper (submit/cancel) that computes moves in a shared
+    process pool and reports them on the event loop via on_result(position, token).
+    With executor None the moves run in the loop's default thread pool.
+    """
+    def __init__(self, executor, on_result):
+        self._executor = executor
+        self.on_result = on_result
+        self._pending = set()
+
+    def submit(self, token, board, *args, move_function):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, move_function, list(board), *args)
+        self._pending.add(future)
+        future.add_done_callback(lambda done: self._finish(done, token))
+        return future
+
+    def _finish(self, future, token):
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("AI worker failed: %r", error)
+            self.on_result(None, token)
+            return
+        self.on_result(future.result(), token)
+
+    def cancel(self):
+        for future in list(self._pending):
+            future.cancel()
+
+
+class Session:
+    """One game on the server; sends its state to `send` whenever it changes."""
+    def __init__(self, session_id, send, difficulty, executor, ai_delay_ms, strategy_config, recorder=None,
+                 rng=None):
+        self.id = session_id
+        self.send = send
+        self.game = Game(difficulty, scheduler=AsyncioScheduler(self._after_ai_turn),
+                         ai_delay_ms=ai_delay_ms, recorder=recorder, rng=rng, **strategy_config)
+        if self.game.strategy.cpu_heavy: # Never block the event loop on a search
+            self.game.ai_worker = ProcessPoolAIWorker(executor, self._ai_result)
+
+    def state_message(self):
+        game = self.game
+        return {
+            'type': 'state',
+            'session': self.id,
+            'board': list(game.board),
+            'turn': game.current_player,
+            'game_over': game.game_over,
+            'winner': game.winner,
+            'moves': game.state.move_count,
+        }
+
+    def _after_ai_turn(self):
+        """Runs after the scheduled AI turn; reports it unless a worker is still computing."""
+        if self.game.game_over or self.game.current_player != AI_PLAYER:
+            self.send(self.state_message())
+
+    def _ai_result(self, position, token):
+        """Receives a move from the process pool."""
+        before = self.game.state.move_count
+        self.game.apply_ai_move(position, token)
+        if self.game.state.move_count != before or self.game.game_over:
+            self.send(self.state_message())
+
+    def move(self, position):
+        """Applies a human move; returns an error string or None."""
+        game = self.game
+        if game.game_over:
+            return "game is over"
+        if game.current_player != HUMAN_PLAYER:
+            return "not your turn"
+        if not isinstance(position, int) or isinstance(position, bool) or not game.state.is_cell_empty(position):
+            return f"invalid position {position!r}"
+        game.handle_position(position)
+        return None
+
+    def close(self):
+        self.game.reset() # Cancels the pending AI turn and any queued worker request
+
+
+class GameServer:
+    """Accepts connections and dispatches protocol requests to sessions."""
+    def __init__(self, workers=None, ai_delay_ms=AI_DELAY_MS, recorder=None, seed=None):
+        self.ai_delay_ms = ai_delay_ms
+        self.recorder = recorder # Optional game_record.GameRecorder shared by all sessions
+        self.seed = seed # If set, session n's AI uses seeding.derive_rng(seed, "session", n)
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+        self._next_id = 1
+        self._connections = {} # handler task -> writer
+        self.stats = {'connections': 0, 'sessions_created': 0, 'sessions_active': 0,
+                      'human_moves': 0, 'errors': 0}
+        self._started = time.perf_counter()
+
+    async def handle_connection(self, reader, writer):
+        self.stats['connections'] += 1
+        self._connections[asyncio.current_task()] = writer
+        sessions = {}
+        def send(message):
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode() + b"\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self.dispatch(request, sessions, send)
+                except (ValueError, KeyError, TypeError) as error:
+                    reply = {'type': 'error', 'message': str(error)}
+                if reply is not None:
+                    if reply['type'] == 'error':
+                        self.stats['errors'] += 1
+                    send(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass # Client went away (cancellation propagates after the cleanup)
+        finally:
+            for session in sessions.values():
+                session.close()
+            self.stats['sessions_active'] -= len(sessions)
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    def dispatch(self, request, sessions, send):
+        """Handles one request; returns the reply message (or None)."""
+        op = request['op']
+        if op == 'new':
+            difficulty = request.get('difficulty', 'hard')
+            options = client_strategy_options(difficulty, request)
+            rng = derive_rng(self.seed, "session", self._next_id) if self.seed is not None else None
+            session = Session(self._next_id, send, difficulty,
+                              self.executor, self.ai_delay_ms, options, self.recorder, rng)
+            self._next_id += 1
+            sessions[session.id] = session
+            self.stats['sessions_created'] += 1
+            self.stats['sessions_active'] += 1
+            return session.state_message()
+        if op == 'stats':
+            return {'type': 'stats', 'uptime_s': time.perf_counter() - self._started, **self.stats}
+
+        session = sessions.get(request.get('session'))
+        if session is None:
+            return {'type': 'error', 'message': f"unknown session {request.get('session')!r}"}
+        if op == 'move':
+            error = session.move(request.get('position'))
+            if error:
+                return {'type': 'error', 'session': session.id, 'message': error}
+            self.stats['human_moves'] += 1
+            return session.state_message()
+        if op == 'reset':
+            session.game.reset()
+            return session.state_message()
+        if op == 'close':
+            session.close()
+            del sessions[session.id]
+            self.stats['sessions_active'] -= 1
+            return {'type': 'closed', 'session': session.id}
+        return {'type': 'error', 'message': f"unknown op {op!r}"}
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, ready=None):
+        """Runs the server until cancelled. ready (optional asyncio.Event) is set once listening."""
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        where = unix_path or f"{host}:{port}"
+        logger.info("Serving on %s", where)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Close the open connections so their handlers read EOF and clean up
+            for writer in list(self._connections.values()):
+                writer.close()
+            if self._connections:
+                await asyncio.wait(list(self._connections))
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            mcts.shutdown_pools()
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve Tic-Tac-Toe games over a line-based JSON protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for CPU-heavy strategies (default: all cores; 0: no processes, "
+                             "compute them in a thread so the event loop is never blocked)")
+    parser.add_argument("--ai-delay-ms", type=int, default=AI_DELAY_MS, help="pause before each AI reply")
+    parser.add_argument("--record", metavar="PATH", help="append every game played to this record file")
+    parser.add_argument("--seed", type=int, default=None, help="seed the AI of every session (reproducible games)")
+    args = parser.parse_args()
+
+    recorder = GameRecorder(args.record) if args.record else None
+    server = GameServer(workers=args.workers, ai_delay_ms=args.ai_delay_ms, recorder=recorder, seed=args.seed)
+    print(f"Serving on {args.unix or f'{args.host}:{args.port}'} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    if recorder:
+        recorder.close()
+    print(f"Stats: {server.stats}")
+
+if __name__ == "__main__":
+    main()
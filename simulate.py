@@ -0,0 +1,173 @@
+# simulate.py
+"""
+Headless AI-vs-AI self-play simulator.
+
+Plays games without pygame using board.py, game_logic.py and the
+strategies registry (strategies.py), spreads them over a ProcessPoolExecutor and
+aggregates win/draw/loss statistics. Every game has its own RNG derived from
+the base seed and the game's number (seeding.game_rng), so results and
+records are bit-identical for a given seed whatever the number of workers
+or the chunk size.
+
+Usage:
+    python simulate.py --x hard --o easy --games 1000000
+"""
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from board import initialize_board, place_mark
+from game_logic import check_win, check_draw, switch_player
+from strategies import available_strategies, create_strategy, resolve_strategy
+from game_record import GameRecorder, encode, result_code
+from instrumentation import metrics, enable_metrics, add_export_hook, json_file_hook, export
+from seeding import game_rng
+
+X_PLAYER = 'X' # X always moves first
+O_PLAYER = 'O'
+DRAW = 'draw'
+DIFFICULTIES = available_strategies() # Strategy names plus the easy/hard/impossible aliases
+DEFAULT_CHUNK_SIZE = 5000 # Games per task sent to a worker
+
+def play_game(x_strategy, o_strategy, moves=None, rng=None):
+    """
+    Plays one AI-vs-AI game and returns the winning mark or DRAW.
+    Each player is a strategy name/alias or a Strategy instance.
+    If a list is passed as moves, the 1-based positions played are appended to it.
+    rng (random.Random, default: the random module) is shared by both players.
+    """
+    board = initialize_board()
+    strategies = {X_PLAYER: resolve_strategy(x_strategy), O_PLAYER: resolve_strategy(o_strategy)}
+    for strategy in strategies.values():
+        strategy.new_game()
+    current_player = X_PLAYER
+    while True:
+        other_player = switch_player(current_player, X_PLAYER, O_PLAYER)
+        position = strategies[current_player].get_move(board, current_player, other_player, rng)
+        if not position or not place_mark(board, position, current_player):
+            raise RuntimeError(f"AI ({current_player}) returned invalid move {position!r}")
+        if moves is not None:
+            moves.append(position)
+        if check_win(board, current_player):
+            return current_player
+        if check_draw(board):
+            return DRAW
+        current_player = other_player
+
+def _play_chunk(task):
+    """
+    Plays games first_game .. first_game + games - 1, each with its own RNG.
+    Returns (results, records), where records holds the packed game records
+    (game_record.py) if requested.
+    """
+    x_difficulty, o_difficulty, first_game, games, seed, record = task
+    x_strategy, o_strategy = create_strategy(x_difficulty), create_strategy(o_difficulty)
+    results = Counter()
+    records = bytearray()
+    for game_index in range(first_game, first_game + games):
+        moves = [] if record else None
+        winner = play_game(x_strategy, o_strategy, moves, game_rng(seed, game_index))
+        results[winner] += 1
+        if record:
+            records += encode(moves, X_PLAYER, result_code(None if winner == DRAW else winner, True))
+    return results, bytes(records)
+
+def _run_chunk(task):
+    """
+    Worker entry point: returns (results, records, metrics snapshot or None). The
+    worker's metrics are reset after each snapshot so the parent can merge them.
+    """
+    results, records = _play_chunk(task)
+    if not metrics.enabled:
+        return results, records, None
+    chunk_metrics = metrics.snapshot()
+    metrics.reset()
+    return results, records, chunk_metrics
+
+def _make_tasks(x_difficulty, o_difficulty, games, seed, chunk_size, record=False):
+    """Splits the run into chunks of consecutive game numbers."""
+    tasks = []
+    for start in range(0, games, chunk_size):
+        chunk_games = min(chunk_size, games - start)
+        tasks.append((x_difficulty, o_difficulty, start, chunk_games, seed, record))
+    return tasks
+
+def run_simulation(x_difficulty, o_difficulty, games, workers=None, seed=0,
+                   chunk_size=DEFAULT_CHUNK_SIZE, recorder=None):
+    """
+    Plays `games` games and returns a Counter of results keyed by 'X', 'O' and 'draw'.
+    workers=None uses every core; workers=1 runs in this process. When metrics
+    are enabled (instrumentation.py), worker metrics are merged into this process.
+    recorder (a game_record.GameRecorder) receives every game, in chunk order.
+    """
+    tasks = _make_tasks(x_difficulty, o_difficulty, games, seed, chunk_size, recorder is not None)
+    for difficulty in (x_difficulty, o_difficulty):
+        create_strategy(difficulty) # Build shared tables once, before workers fork
+    results = Counter({X_PLAYER: 0, O_PLAYER: 0, DRAW: 0})
+    if workers == 1:
+        for task in tasks:
+            chunk_results, records = _play_chunk(task)
+            results.update(chunk_results)
+            if recorder:
+                recorder.write(records)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=enable_metrics,
+                             initargs=(metrics.enabled,)) as executor:
+        for chunk_results, records, chunk_metrics in executor.map(_run_chunk, tasks):
+            results.update(chunk_results)
+            if recorder:
+                recorder.write(records)
+            if chunk_metrics:
+                metrics.merge(chunk_metrics)
+    return results
+
+def format_results(results):
+    """Formats aggregated results as a short report."""
+    total = sum(results.values())
+    lines = []
+    for key, label in ((X_PLAYER, "X wins"), (O_PLAYER, "O wins"), (DRAW, "Draws")):
+        share = 100.0 * results[key] / total if total else 0.0
+        lines.append(f"{label:<7} {results[key]:>10}  ({share:5.1f}%)")
+    return "\n".join(lines)
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Tic-Tac-Toe games.")
+    parser.add_argument("--x", dest="x_difficulty", choices=DIFFICULTIES, default="hard",
+                        help="difficulty of the X player (moves first)")
+    parser.add_argument("--o", dest="o_difficulty", choices=DIFFICULTIES, default="hard",
+                        help="difficulty of the O player")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base RNG seed")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="games per worker task")
+    parser.add_argument("--metrics", metavar="PATH", help="record AI metrics and write a JSON snapshot here")
+    parser.add_argument("--record", metavar="PATH", help="append every game to this record file")
+    args = parser.parse_args()
+
+    if args.metrics:
+        enable_metrics()
+        add_export_hook(json_file_hook(args.metrics))
+
+    recorder = GameRecorder(args.record) if args.record else None
+    start = time.perf_counter()
+    results = run_simulation(args.x_difficulty, args.o_difficulty, args.games,
+                             workers=args.workers, seed=args.seed, chunk_size=args.chunk_size,
+                             recorder=recorder)
+    elapsed = time.perf_counter() - start
+    if recorder:
+        recorder.close()
+
+    print(f"X ({args.x_difficulty}) vs O ({args.o_difficulty}), seed {args.seed}")
+    print(format_results(results))
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:,.0f} games/s)")
+    if args.metrics:
+        export()
+        print(f"Wrote metrics to {args.metrics}")
+    if args.record:
+        print(f"Appended {args.games} games to {args.record}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# solver.py
+"""
+Perfect-play Tic-Tac-Toe solver used by the "impossible" AI difficulty.
+
+Positions are searched with negamax and memoized in a transposition table
+keyed by a side-to-move encoding, own_bits | opp_bits << 9 (see bitboard.py),
+taken in its canonical orientation (see symmetry.py) so symmetric positions
+share one entry. The whole game tree is solved once, on first use, so later
+moves are a single table lookup.
+"""
+from bitboard import BitBoard, WIN_TABLE, EMPTY_CELLS_TABLE
+from symmetry import canonical_key, to_canonical_index, from_canonical_index
+
+# Transposition table: canonical key -> (value, best_index on the canonical board).
+# Value is from the point of view of the player to move: >0 win (larger = sooner),
+# 0 draw, <0 loss.
+_TABLE = {}
+_solved = False
+
+def _negamax(own_bits, opp_bits):
+    """Returns (value, best_index) for the player owning own_bits, who is to move."""
+    key, transform = canonical_key(own_bits, opp_bits)
+    entry = _TABLE.get(key)
+    if entry is not None:
+        value, best_index = entry
+        if best_index is not None:
+            best_index = from_canonical_index(best_index, transform)
+        return value, best_index
+
+    empty_cells = EMPTY_CELLS_TABLE[own_bits | opp_bits]
+    if WIN_TABLE[opp_bits] is not None:
+        entry = (-(len(empty_cells) + 1), None) # Opponent's last move won
+    elif not empty_cells:
+        entry = (0, None) # Draw
+    else:
+        best_value, best_index = None, None
+        best_possible = len(empty_cells) # Winning right now
+        for index in empty_cells:
+            value = -_negamax(opp_bits, own_bits | 1 << index)[0]
+            if best_value is None or value > best_value:
+                best_value, best_index = value, index
+                if value >= best_possible:
+                    break # Beta cutoff: nothing can beat an immediate win
+        entry = (best_value, best_index)
+
+    value, best_index = entry
+    _TABLE[key] = (value, None if best_index is None else to_canonical_index(best_index, transform))
+    return entry
+
+def solve():
+    """Solves the game tree from the empty board (only does work once)."""
+    global _solved
+    if not _solved:
+        _negamax(0, 0)
+        _solved = True
+    return len(_TABLE)
+
+def _to_bitboard(board):
+    """Accepts a list board or a BitBoard and returns a BitBoard."""
+    return board if isinstance(board, BitBoard) else BitBoard.from_list(board)
+
+def evaluate(board, to_move):
+    """Returns the game-theoretic value of the board for the player to move."""
+    solve()
+    bb = _to_bitboard(board)
+    own_bits = bb.bits_for(to_move)
+    return _negamax(own_bits, bb.occupied() ^ own_bits)[0]
+
+def get_best_move(board, ai_mark, human_mark):
+    """Returns a perfect-play move as a 1-based position, or None if no move exists."""
+    solve()
+    bb = _to_bitboard(board)
+    best_index = _negamax(bb.bits_for(ai_mark), bb.bits_for(human_mark))[1]
+    return None if best_index is None else best_index + 1
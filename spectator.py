@@ -0,0 +1,69 @@
+# spectator.py
+"""
+Renderer-only display for a game published by relay.py.
+
+Follows the relay's Unix socket with a relay.RelaySubscriber and draws the
+mirrored board with gui.draw_figures/draw_status (and draw_game_over once
+the game ends). It takes no input. The window sleeps in FrameLoop.wait and
+only redraws when a frame arrives, so dozens of displays cost almost
+nothing. If the relay goes away, the display keeps its last board and
+reconnects.
+
+Usage:
+    python spectator.py /tmp/ttt.sock
+"""
+import argparse
+import sys
+
+import pygame
+
+from event_loop import FrameLoop
+from pygame_adapter import status_message
+from relay import RelaySubscriber
+import gui
+
+RELAY_EVENT = pygame.USEREVENT + 3 # Posted by the subscriber thread when the mirror changed
+
+def draw(screen, mirror):
+    """Draws the full mirrored game."""
+    screen.blit(gui.get_grid_surface(), (0, 0))
+    gui.draw_figures(screen, mirror.board)
+    message = status_message(mirror)
+    gui.draw_status(screen, message)
+    if mirror.game_over:
+        gui.draw_game_over(screen, message, mirror.winning_line_info)
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Watch a game published by relay.py.")
+    parser.add_argument("path", help="relay Unix socket (TTT_RELAY_SOCKET of the publishing game)")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((gui.WIDTH, gui.HEIGHT))
+    pygame.display.set_caption('Tic Tac Toe - Spectator')
+    frame_loop = FrameLoop()
+    subscriber = RelaySubscriber(args.path, on_change=lambda: pygame.event.post(pygame.event.Event(RELAY_EVENT)))
+    subscriber.start()
+
+    redraw = True
+    while True:
+        for event in frame_loop.wait():
+            if event.type == pygame.QUIT:
+                subscriber.stop()
+                print(frame_loop.report())
+                print(f"Received {subscriber.bytes_received} bytes from the relay")
+                pygame.quit()
+                sys.exit()
+            if event.type in (RELAY_EVENT, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                redraw = True
+
+        if redraw:
+            with subscriber.lock: # The subscriber thread updates the mirror
+                draw(screen, subscriber.mirror)
+            pygame.display.update()
+            frame_loop.frame_presented()
+            redraw = False
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+# strategies.py
+"""
+Registry of AI move strategies.
+
+Every AI opponent is a Strategy subclass registered under a name. Game,
+main_gui.py, simulate.py and the other headless tools look strategies up by
+name instead of calling a particular get_ai_move. ai_player.get_ai_move and
+player.get_ai_move remain as thin wrappers.
+
+A strategy:
+    name        registry key
+    defaults    dict of per-strategy configuration; create_strategy(name, **config)
+                overrides it and rejects unknown keys
+    requires    names of shared precomputations (see register_precompute) that
+                are built once per process, before the first move
+    cpu_heavy   True if a move can take long enough that servers should run it
+                in a worker process
+    choose_move(board, ai_mark, human_mark, state=None, rng=None)
+                returns (1-based move, branch name, moves evaluated); state is
+                an optional GameState tracking the same board, rng a
+                random.Random (default: the random module)
+    move_choices(board, ai_mark, human_mark, state=None)
+                optional: returns (branch name, 0-based candidates, moves
+                evaluated) without drawing any random numbers. Strategies that
+                define it get choose_move for free: the first candidate is
+                played for branches in forced_branches, otherwise rng.choice()
+                picks one. It also lets get_moves_batch share the work between
+                identical positions.
+    new_game()  called when a new game starts (for strategies that keep state)
+
+Strategy.get_move(board, ai_mark, human_mark, rng=None) is the common entry
+point. It accepts a list board, a BitBoard or a GameState, and it does the
+logging and metrics (instrumentation.py) for every strategy in one place.
+List boards and BitBoards are classic 3x3 boards; pass a GameState built
+with the line set (e.g. mnk.winning_lines) for larger m,n,k boards.
+Strategy.get_moves_batch answers many games at once (see ai_player.get_ai_moves_batch).
+
+The old difficulty names are aliases: easy -> random, hard -> heuristic,
+impossible -> perfect. "mcts" has no alias; its strength is set by its
+iteration/time budget.
+"""
+import random
+import threading
+import time
+
+from board import get_empty_cells
+from game_logic import WINNING_COMBINATIONS_INFO
+from game_state import GameState, DEFAULT_LINES
+from instrumentation import get_logger, metrics, record_decision
+from opening_book import get_default_book
+from search import iterative_deepening
+import mcts
+import solver
+
+logger = get_logger("strategies")
+
+STRATEGIES = {} # name -> Strategy subclass
+ALIASES = {"easy": "random", "hard": "heuristic", "impossible": "perfect"}
+DEFAULT_SEARCH_BUDGET_MS = 200 # Used by "search" when neither budget is configured
+VECTORIZE_MIN_BOARDS = 32 # Smaller batches aren't worth converting to NumPy arrays
+_OTHER = {'X': 'O', 'O': 'X'}
+
+# --- Shared precomputation ---
+_PRECOMPUTE = {} # name -> build()
+_precomputed = {} # name -> result of build()
+_precompute_lock = threading.Lock()
+
+def register_precompute(name, build):
+    """Registers build() as the shared precomputation `name` (run lazily, once per process)."""
+    _PRECOMPUTE[name] = build
+
+def precomputed(name):
+    """Returns the result of precomputation `name`, building it on first use."""
+    try:
+        return _precomputed[name]
+    except KeyError:
+        with _precompute_lock: # AI worker threads may ask at the same time
+            if name not in _precomputed:
+                _precomputed[name] = _PRECOMPUTE[name]()
+            return _precomputed[name]
+
+def _solve_game_tree():
+    solver.solve()
+    return solver
+
+register_precompute("opening_book", get_default_book) # None if the book file hasn't been built
+register_precompute("solver", _solve_game_tree)
+
+_WIN_LINES = [combo for _, _, combo in WINNING_COMBINATIONS_INFO]
+CLASSIC_SIZE = 9 # Cells of a list board; other sizes need a GameState with their lines
+
+def _check_classic(board):
+    """Raises ValueError unless a board without a GameState has the 3x3 size."""
+    if len(board) != CLASSIC_SIZE:
+        raise ValueError(f"a board without a GameState must have {CLASSIC_SIZE} cells, got {len(board)}; "
+                         "pass a GameState with its line set for m,n,k boards")
+
+def _tracker(board, state=None):
+    """Returns state, or a new GameState for a 3x3 board (ValueError for other sizes)."""
+    if state is None:
+        _check_classic(board)
+        state = GameState(board)
+    return state
+
+def _game_won(board, state=None):
+    """True if either side has a completed line (O(1) with a GameState)."""
+    if state is not None:
+        return state.winner() is not None
+    _check_classic(board)
+    for a, b, c in _WIN_LINES:
+        mark = board[a]
+        if mark != ' ' and mark == board[b] == board[c]:
+            return True
+    return False
+
+_batch_eval_module = False # Not imported yet
+
+def _batch_eval():
+    """Returns the batch_eval module, or None without NumPy (imported on first use)."""
+    global _batch_eval_module
+    if _batch_eval_module is False:
+        try:
+            import batch_eval
+        except ImportError:
+            batch_eval = None # Batches are answered position by position
+        _batch_eval_module = batch_eval
+    return _batch_eval_module
+
+# --- Registry ---
+def register_strategy(cls):
+    """Class decorator: adds a Strategy subclass to the registry under cls.name."""
+    STRATEGIES[cls.name] = cls
+    return cls
+
+def strategy_class(name):
+    """Returns the Strategy subclass for a name or alias (ValueError if unknown)."""
+    try:
+        return STRATEGIES[ALIASES.get(name, name)]
+    except KeyError:
+        raise ValueError(f"Unknown strategy '{name}'") from None
+
+def available_strategies():
+    """Returns every accepted name: registered strategies followed by aliases."""
+    return list(STRATEGIES) + list(ALIASES)
+
+def create_strategy(name, **config):
+    """Returns a new, prepared instance of a strategy (use one per game for stateful strategies)."""
+    strategy = strategy_class(name)(**config)
+    strategy.prepare()
+    return strategy
+
+_shared = {}
+
+def get_strategy(name, **config):
+    """Returns a shared instance for (name, config), creating it on first use."""
+    key = (name, tuple(sorted(config.items())))
+    strategy = _shared.get(key)
+    if strategy is None:
+        strategy = _shared[key] = create_strategy(name, **config)
+    return strategy
+
+def resolve_strategy(strategy):
+    """Accepts a Strategy instance or a name and returns an instance."""
+    return strategy if isinstance(strategy, Strategy) else get_strategy(strategy)
+
+
+class Strategy:
+    """Base class for AI strategies (see module docstring for the protocol)."""
+    name = None
+    defaults = {}
+    requires = ()
+    cpu_heavy = False
+    forced_branches = () # move_choices branches that always play their first candidate
+    move_choices = None
+
+    def __init__(self, **config):
+        unknown = set(config) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown option(s) for strategy '{self.name}': {', '.join(sorted(unknown))}")
+        self.config = {**self.defaults, **config}
+
+    def prepare(self):
+        """Builds the shared precomputations this strategy requires."""
+        for name in self.requires:
+            precomputed(name)
+
+    def new_game(self):
+        """Called when a new game starts. Stateless strategies ignore it."""
+
+    def choose_move(self, board, ai_mark, human_mark, state=None, rng=None):
+        if self.move_choices is None:
+            raise NotImplementedError
+        branch, candidates, evaluated = self.move_choices(board, ai_mark, human_mark, state)
+        move = self.pick(branch, candidates, rng)
+        return (None if move is None else move + 1), branch, evaluated
+
+    def pick(self, branch, candidates, rng=None):
+        """Returns the 0-based move played from a move_choices result (None without candidates)."""
+        if not candidates:
+            return None
+        if branch in self.forced_branches:
+            return candidates[0]
+        return (rng or random).choice(candidates)
+
+    def move_choices_batch(self, boards, ai_mark, human_mark):
+        """move_choices for a list of distinct boards; strategies may vectorize it."""
+        return [self.move_choices(board, ai_mark, human_mark) for board in boards]
+
+    def get_move(self, board, ai_mark, human_mark, rng=None):
+        """Returns the strategy's move as a 1-based position, or None if the board is full or won."""
+        if isinstance(board, GameState): # Reuse the caller's tracker (e.g. Game.state)
+            state, board = board, board.board
+        else:
+            state = None
+        if ' ' not in board:
+            logger.error("AI couldn't find a valid move (no empty cells).")
+            return None
+        if _game_won(board, state):
+            logger.error("AI asked to move after the game was won.")
+            return None
+
+        if not metrics.enabled:
+            move, branch, _ = self.choose_move(board, ai_mark, human_mark, state, rng)
+        else:
+            start = time.perf_counter()
+            move, branch, evaluated = self.choose_move(board, ai_mark, human_mark, state, rng)
+            record_decision("ai", self.name, branch, evaluated, time.perf_counter() - start)
+        logger.debug("AI (%s, %s) plays %s (%s)", ai_mark, self.name, move, branch)
+        return move
+
+    def get_moves_batch(self, boards, ai_marks, rngs=None):
+        """
+        get_move for many games at once. boards are list boards, BitBoards or
+        GameStates; ai_marks and rngs (random.Random per game, default: the
+        random module) are per-game lists. Returns a list of 1-based moves
+        (None for full or already won boards). With move_choices, identical positions are
+        evaluated once and only the final random pick uses each game's rng, so
+        every game gets the move get_move would give it with the same rng.
+        """
+        rngs = rngs or [None] * len(boards)
+        if self.move_choices is None or any(isinstance(board, GameState) and board.lines is not DEFAULT_LINES
+                                            for board in boards): # m,n,k trackers keep their own lines
+            return [self.get_move(board, mark, _OTHER[mark], rng) for board, mark, rng in zip(boards, ai_marks, rngs)]
+        boards = [board.board if isinstance(board, GameState) else board for board in boards]
+
+        start = time.perf_counter()
+        keys = [(tuple(board), mark) for board, mark in zip(boards, ai_marks)]
+        by_mark = {} # ai_mark -> distinct open positions
+        for key in dict.fromkeys(keys):
+            if ' ' in key[0] and not _game_won(key[0]):
+                by_mark.setdefault(key[1], []).append(key[0])
+        choices = {}
+        for mark, positions in by_mark.items():
+            results = self.move_choices_batch([list(cells) for cells in positions], mark, _OTHER[mark])
+            choices.update(((cells, mark), result) for cells, result in zip(positions, results))
+
+        moves = []
+        for key, rng in zip(keys, rngs):
+            if key not in choices:
+                moves.append(None) # Full board, or the game is already won
+                continue
+            move = self.pick(choices[key][0], choices[key][1], rng)
+            moves.append(None if move is None else move + 1)
+        if metrics.enabled:
+            elapsed = time.perf_counter() - start
+            metrics.incr("ai.batches")
+            metrics.incr("ai.batch_positions", len(keys))
+            metrics.incr("ai.batch_unique_positions", len(choices))
+            metrics.observe(f"ai.batch_latency_ms.{self.name}", elapsed * 1000.0)
+        return moves
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.config.items())})"
+
+
+# --- Strategies ---
+@register_strategy
+class RandomStrategy(Strategy):
+    """Uniformly random legal move ("easy")."""
+    name = "random"
+
+    def move_choices(self, board, ai_mark, human_mark, state=None):
+        return "random", get_empty_cells(board), 0
+
+
+CENTER = 4
+CORNERS = (0, 2, 6, 8)
+SIDES = (1, 3, 5, 7)
+FORCED_BRANCHES = ("win", "block", "center")
+
+def heuristic_candidates(state, ai_mark, human_mark, first_only=True):
+    """
+    Runs the rule-based checks (win, block, center, corner, side) and returns
+    (branch, candidate 0-based indices, moves evaluated) for the first rule
+    that applies. With first_only, the win/block scans stop at the first hit.
+    Otherwise every winning/blocking cell is returned (used by analysis tools).
+    """
+    empty = state.get_empty_cells()
+    evaluated = 0
+    for branch, mark in (("win", ai_mark), ("block", human_mark)):
+        if state.check_win(mark): # Line already complete: any move "wins"
+            return branch, (empty[:1] if first_only else empty), evaluated + 1
+        hits = []
+        for index in empty:
+            evaluated += 1
+            if state.wins_with(index, mark):
+                hits.append(index)
+                if first_only:
+                    break
+        if hits:
+            return branch, hits, evaluated
+
+    if CENTER in empty:
+        return "center", [CENTER], evaluated
+    for branch, cells in (("corner", CORNERS), ("side", SIDES)):
+        available = [i for i in cells if i in empty]
+        if available:
+            return branch, available, evaluated
+    return "random", empty, evaluated # Only reachable on non-3x3 line sets
+
+
+@register_strategy
+class HeuristicStrategy(Strategy):
+    """Win, else block, else center, else a random corner, else a random side ("hard")."""
+    name = "heuristic"
+    # Forced moves are taken as found; ties among corners/sides are broken at random
+    forced_branches = FORCED_BRANCHES
+
+    def move_choices(self, board, ai_mark, human_mark, state=None):
+        state = _tracker(board, state)
+        return heuristic_candidates(state, ai_mark, human_mark)
+
+    def move_choices_batch(self, boards, ai_mark, human_mark):
+        batch_eval = _batch_eval()
+        if batch_eval is None or len(boards) < VECTORIZE_MIN_BOARDS:
+            return super().move_choices_batch(boards, ai_mark, human_mark)
+        branches, candidates = batch_eval.hard_candidates(batch_eval.boards_to_array(boards),
+                                                          batch_eval.MARK_CODES[ai_mark])
+        # Same candidate order as heuristic_candidates (ascending cells); no scan counts
+        return [(batch_eval.BRANCH_NAMES[branch], cells.nonzero()[0].tolist(), 0)
+                for branch, cells in zip(branches.tolist(), candidates)]
+
+
+@register_strategy
+class PerfectStrategy(Strategy):
+    """Perfect play: the mmap opening book if built, otherwise the negamax solver ("impossible")."""
+    name = "perfect"
+    requires = ("opening_book",)
+    forced_branches = ("solver",)
+
+    def prepare(self):
+        super().prepare()
+        if precomputed("opening_book") is None: # Every move needs the solver; otherwise built on the first book miss
+            precomputed("solver")
+
+    def move_choices(self, board, ai_mark, human_mark, state=None):
+        if state is not None and state.lines is not DEFAULT_LINES:
+            raise ValueError("perfect play only knows the 3x3 board")
+        _check_classic(board)
+        book = precomputed("opening_book")
+        moves = book.best_moves(board, ai_mark) if book else None
+        if moves is not None:
+            return "book", moves, 0 # Any best move; vary play between equal options
+        # Covers positions the book doesn't (e.g. O moved first)
+        move = precomputed("solver").get_best_move(board, ai_mark, human_mark)
+        return "solver", ([] if move is None else [move - 1]), 0 # None: the game is already over
+
+
+@register_strategy
+class SearchStrategy(Strategy):
+    """Budgeted iterative-deepening alpha-beta (see search.py)."""
+    name = "search"
+    cpu_heavy = True
+    defaults = {"time_budget_ms": None, "node_budget": None, "max_depth": None}
+
+    def choose_move(self, board, ai_mark, human_mark, state=None, rng=None):
+        state = _tracker(board, state)
+        time_budget_ms, node_budget = self.config["time_budget_ms"], self.config["node_budget"]
+        if time_budget_ms is None and node_budget is None:
+            time_budget_ms = DEFAULT_SEARCH_BUDGET_MS
+        result = iterative_deepening(state, ai_mark, human_mark, time_budget_ms, node_budget,
+                                     self.config["max_depth"])
+        logger.debug("Search reached depth %d: %d nodes, %.1f ms",
+                     result.depth, result.nodes, result.elapsed_ms)
+        if result.move is None: # The game is already won
+            return None, "search", result.nodes
+        return result.move + 1, "search", result.nodes
+
+
+@register_strategy
+class MCTSStrategy(Strategy):
+    """
+    Monte Carlo Tree Search (see mcts.py). Options:
+        iterations      rollouts per move (None: limited by time only)
+        time_budget_ms  wall-clock limit per move (None: limited by iterations only)
+        exploration     UCB1 exploration constant
+        reuse_tree      keep the subtree of the position reached between moves
+        workers         >1 searches independent trees in that many processes
+    """
+    name = "mcts"
+    cpu_heavy = True
+    defaults = {"iterations": 2000, "time_budget_ms": None, "exploration": mcts.DEFAULT_EXPLORATION,
+                "reuse_tree": True, "workers": 1}
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.new_game()
+
+    def new_game(self):
+        self._tree = None # Root node of the last search
+        self._tree_board = None # Board at that root
+
+    def choose_move(self, board, ai_mark, human_mark, state=None, rng=None):
+        state = _tracker(board, state)
+        config = self.config
+        if config["workers"] > 1:
+            result = mcts.parallel_mcts(state, ai_mark, human_mark, config["workers"], config["iterations"],
+                                        config["time_budget_ms"], config["exploration"], rng)
+        else:
+            root = None
+            if config["reuse_tree"] and self._tree is not None:
+                root = mcts.reuse_subtree(self._tree, self._tree_board, state.board)
+                if root is not None and root.mark != human_mark:
+                    root = None # Same cells but the other player to move
+            result = mcts.mcts(state, ai_mark, human_mark, config["iterations"], config["time_budget_ms"],
+                               config["exploration"], rng=rng, root=root)
+            if config["reuse_tree"]:
+                self._tree, self._tree_board = result.root, list(state.board)
+        logger.debug("MCTS: %d iterations in %.1f ms, best move seen %d times (value %.2f)",
+                     result.iterations, result.elapsed_ms, result.visits, result.value)
+        if result.move is None: # The game is already won
+            return None, "mcts", result.iterations
+        return result.move + 1, "mcts", result.iterations
+
+    def __getstate__(self):
+        # The tree is only useful in this process; don't ship it to worker processes
+        state = self.__dict__.copy()
+        state["_tree"] = state["_tree_board"] = None
+        return state
@@ -0,0 +1,77 @@
+# symmetry.py
+"""
+Symmetry canonicalization for the 3x3 board.
+
+The board has 8 symmetries (4 rotations, each optionally mirrored). Every
+position is mapped to a canonical representative - the orientation with the
+smallest encoded key - so caches only need to store one entry per class.
+The transform used is returned as well, so moves chosen on the canonical
+board can be mapped back to the original orientation.
+"""
+from bitboard import BitBoard, FULL_MASK
+
+def _build_permutations():
+    """Returns the 8 cell permutations; PERMUTATIONS[t][i] is where cell i moves under t."""
+    coordinate_maps = [
+        lambda r, c: (r, c),         # 0: identity
+        lambda r, c: (c, 2 - r),     # 1: rotate 90 clockwise
+        lambda r, c: (2 - r, 2 - c), # 2: rotate 180
+        lambda r, c: (2 - c, r),     # 3: rotate 270 clockwise
+        lambda r, c: (r, 2 - c),     # 4: mirror left-right
+        lambda r, c: (2 - r, c),     # 5: mirror top-bottom
+        lambda r, c: (c, r),         # 6: mirror main diagonal
+        lambda r, c: (2 - c, 2 - r), # 7: mirror anti-diagonal
+    ]
+    permutations = []
+    for transform in coordinate_maps:
+        perm = []
+        for i in range(9):
+            r, c = transform(i // 3, i % 3)
+            perm.append(r * 3 + c)
+        permutations.append(tuple(perm))
+    return permutations
+
+PERMUTATIONS = _build_permutations()
+INVERSE_PERMUTATIONS = [
+    tuple(perm.index(i) for i in range(9)) for perm in PERMUTATIONS
+]
+
+# MASK_TABLES[t][bits] is the 9-bit pattern `bits` after applying transform t
+MASK_TABLES = [
+    [sum(1 << perm[i] for i in range(9) if bits >> i & 1) for bits in range(FULL_MASK + 1)]
+    for perm in PERMUTATIONS
+]
+
+def transform_bits(bits, transform):
+    """Applies a transform (0-7) to a 9-bit pattern."""
+    return MASK_TABLES[transform][bits]
+
+def canonical_key(own_bits, opp_bits):
+    """
+    Returns (key, transform) for the canonical orientation of a position.
+    The key is own | opp << 9 after applying the transform.
+    """
+    best_key, best_transform = own_bits | opp_bits << 9, 0
+    for transform in range(1, 8):
+        table = MASK_TABLES[transform]
+        key = table[own_bits] | table[opp_bits] << 9
+        if key < best_key:
+            best_key, best_transform = key, transform
+    return best_key, best_transform
+
+def canonicalize(board):
+    """
+    Maps a list board or BitBoard to its canonical representative.
+    Returns (canonical BitBoard, transform).
+    """
+    bb = board if isinstance(board, BitBoard) else BitBoard.from_list(board)
+    key, transform = canonical_key(bb.x_bits, bb.o_bits)
+    return BitBoard(key & FULL_MASK, key >> 9), transform
+
+def to_canonical_index(index, transform):
+    """Maps a cell index (0-8) on the original board to the canonical board."""
+    return PERMUTATIONS[transform][index]
+
+def from_canonical_index(index, transform):
+    """Maps a cell index (0-8) on the canonical board back to the original board."""
+    return INVERSE_PERMUTATIONS[transform][index]
@@ -0,0 +1,53 @@
+# test_batch_eval.py
+"""Checks batch_eval.evaluate_batch against the scalar functions on all 3^9 boards."""
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ai_player import get_ai_move
+from batch_eval import (evaluate_batch, boards_to_array, EMPTY, X, O, BRANCH_CORNER, BRANCH_SIDE)
+from board import get_empty_cells
+from game_logic import check_win, check_draw, WINNING_COMBINATIONS_INFO
+
+BOARDS = [list(cells) for cells in itertools.product(' XO', repeat=9)]
+LINE_INDEX = {(win_type, index): i for i, (win_type, index, _) in enumerate(WINNING_COMBINATIONS_INFO)}
+
+
+@pytest.fixture(scope="module", params=['X', 'O'])
+def evaluated(request):
+    ai_mark = request.param
+    result = evaluate_batch(boards_to_array(BOARDS), ai_mark=ai_mark, rng=np.random.default_rng(0))
+    return ai_mark, result
+
+
+def test_winner_line_and_draw(evaluated):
+    _, result = evaluated
+    for n, board in enumerate(BOARDS):
+        x_win, o_win = check_win(board, 'X'), check_win(board, 'O')
+        assert result['winner'][n] == (X if x_win else (O if o_win else EMPTY)), board
+        assert result['win_line'][n] == (LINE_INDEX[x_win or o_win] if (x_win or o_win) else -1), board
+        assert result['draw'][n] == (check_draw(board) and not x_win and not o_win), board
+
+
+def test_legal_moves(evaluated):
+    _, result = evaluated
+    for n, board in enumerate(BOARDS):
+        assert list(np.flatnonzero(result['legal_moves'][n])) == get_empty_cells(board), board
+
+
+def test_hard_move(evaluated):
+    ai_mark, result = evaluated
+    human_mark = 'X' if ai_mark == 'O' else 'O'
+    for n, board in enumerate(BOARDS):
+        scalar_move = get_ai_move(board, ai_mark, human_mark, "hard")
+        if scalar_move is None: # Full or already won
+            assert result['hard_move'][n] == -1, board
+            continue
+        candidates = np.flatnonzero(result['hard_candidates'][n])
+        assert result['hard_move'][n] in candidates, board
+        if result['hard_branch'][n] in (BRANCH_CORNER, BRANCH_SIDE):
+            assert scalar_move - 1 in candidates, board # Random tie-break: any candidate
+        else:
+            assert result['hard_move'][n] == scalar_move - 1, board
@@ -0,0 +1,53 @@
+# test_game_record.py
+"""Tests for the game record codec and record files in game_record.py."""
+import itertools
+
+import pytest
+
+from game_record import (GameRecord, GameRecorder, InvalidRecord, analyze, decode, encode,
+                         iter_record_bytes, read_games, replay, MAGIC, RECORD_SIZE,
+                         RESULT_UNFINISHED, RESULT_X, RESULT_DRAW)
+
+
+def test_round_trip():
+    for length in range(10):
+        moves = tuple(range(9, 9 - length, -1))
+        for first_player, result in itertools.product('XO', range(4)):
+            data = encode(moves, first_player, result)
+            assert len(data) == RECORD_SIZE
+            assert decode(data) == GameRecord(first_player, moves, result)
+
+
+def test_decode_rejects_position_above_nine():
+    data = (0xA << 8 | 5 << 4).to_bytes(RECORD_SIZE, 'little') # Moves 5, then 10
+    with pytest.raises(InvalidRecord):
+        decode(data)
+
+
+def test_replay_checks_stored_result():
+    won = (1, 4, 2, 5, 3) # X takes the top row
+    replay(decode(encode(won, 'X', RESULT_X)))
+    with pytest.raises(InvalidRecord):
+        replay(decode(encode(won, 'X', RESULT_DRAW)))
+
+
+def test_recorders_share_one_header(tmp_path):
+    path = str(tmp_path / "games.rec")
+    first = GameRecorder(path) # Creates the file and writes the header
+    second = GameRecorder(path) # Appends to the same file without a second header
+    with first, second:
+        first.record((5, 1))
+        second.record((1, 5, 9), 'O')
+    with open(path, 'rb') as f:
+        assert f.read().count(MAGIC) == 1
+    assert sorted(read_games(path)) == [GameRecord('O', (1, 5, 9), RESULT_UNFINISHED),
+                                        GameRecord('X', (5, 1), RESULT_UNFINISHED)]
+
+
+def test_analyze_counts_undecodable_records(tmp_path):
+    path = str(tmp_path / "games.rec")
+    with GameRecorder(path) as recorder:
+        recorder.record((1, 4, 2, 5, 3), 'X', RESULT_X)
+        recorder.write(b'\xff' * RECORD_SIZE)
+    stats = analyze(iter_record_bytes(path))
+    assert (stats['games'], stats['invalid']) == (2, 1)
@@ -0,0 +1,62 @@
+# test_opening_book.py
+"""Tests for the opening book and for PerfectStrategy's use of it."""
+import pytest
+
+import solver
+import strategies
+from opening_book import (OpeningBook, build_book, enumerate_positions, player_to_move,
+                          LOSS, DRAW, WIN)
+from board import get_empty_cells
+from game_logic import check_win
+
+
+@pytest.fixture(scope="module")
+def book(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("book") / "book.bin")
+    build_book(path)
+    book = OpeningBook(path)
+    yield book
+    book.close()
+
+
+def test_book_matches_solver(book):
+    for board in enumerate_positions():
+        to_move = player_to_move(board)
+        other = 'O' if to_move == 'X' else 'X'
+        best_moves, value, _ = book.lookup(board)
+        if check_win(board, other) or not get_empty_cells(board):
+            assert best_moves == ()
+            continue
+        score = solver.evaluate(board, to_move)
+        assert value == (WIN if score > 0 else LOSS if score < 0 else DRAW), board
+        optimal = []
+        for index in get_empty_cells(board):
+            child = board[:]
+            child[index] = to_move
+            if -solver.evaluate(child, other) == score:
+                optimal.append(index)
+        assert list(best_moves) == optimal, board
+
+
+def _count_builds(monkeypatch, book):
+    """Gives strategies a fresh precompute cache with `book`; returns the solver build counter."""
+    builds = []
+    monkeypatch.setattr(strategies, "_precomputed", {})
+    monkeypatch.setitem(strategies._PRECOMPUTE, "opening_book", lambda: book)
+    monkeypatch.setitem(strategies._PRECOMPUTE, "solver", lambda: builds.append(1) or strategies._solve_game_tree())
+    return builds
+
+
+def test_perfect_builds_solver_only_on_book_miss(monkeypatch, book):
+    builds = _count_builds(monkeypatch, book)
+    strategy = strategies.create_strategy("perfect")
+    assert strategy.get_move(list('X        '), 'O', 'X') == 5 # Only the centre holds the draw
+    assert builds == []
+    strategy.get_move(list('    O    '), 'X', 'O') # O moved first: not in the book
+    assert builds == [1]
+
+
+def test_perfect_builds_solver_up_front_without_book(monkeypatch):
+    builds = _count_builds(monkeypatch, None)
+    strategies.create_strategy("perfect")
+    assert builds == [1]
@@ -0,0 +1,52 @@
+# test_relay.py
+"""Tests for the relay frame codec, Mirror and the socket setup in relay.py."""
+import os
+import socket
+import tempfile
+
+import pytest
+
+from relay import (FrameReader, GameRelay, Mirror, RelaySyncError, decode_frame,
+                   encode_move, encode_reset, encode_snapshot, SEQ_MODULO)
+
+
+@pytest.mark.parametrize("frame, decoded", [
+    (encode_move(7, 4, 'O'), ('move', 7, 4, 'O')),
+    (encode_reset(SEQ_MODULO - 1, 'O'), ('reset', SEQ_MODULO - 1, 'O')),
+    (encode_snapshot(3, list('XO  X   O'), 'O'), ('snapshot', 3, list('XO  X   O'), 'O')),
+    (encode_snapshot(0, list('XOX OX'), 'X'), ('snapshot', 0, list('XOX OX'), 'X')), # Partial last byte
+])
+def test_frame_round_trip(frame, decoded):
+    assert decode_frame(frame) == decoded
+
+
+def test_reader_reassembles_split_frames():
+    stream = encode_snapshot(1, [' '] * 9, 'X') + encode_move(2, 0, 'X') + encode_reset(3, 'O')
+    reader = FrameReader()
+    frames = []
+    for i in range(len(stream)): # One byte at a time
+        frames += reader.feed(stream[i:i + 1])
+    assert [frame[0] for frame in frames] == ['snapshot', 'move', 'reset']
+
+
+def test_mirror_follows_deltas_and_rejects_gaps():
+    mirror = Mirror()
+    mirror.apply(('snapshot', 10, [' '] * 9, 'X'))
+    for seq, (cell, mark) in enumerate([(0, 'X'), (3, 'O'), (1, 'X'), (4, 'O'), (2, 'X')], start=11):
+        mirror.apply(('move', seq, cell, mark))
+    assert mirror.game_over and mirror.winner == 'X'
+    with pytest.raises(RelaySyncError):
+        mirror.apply(('move', 17, 5, 'O')) # 16 is missing
+
+
+def test_relay_replaces_only_a_stale_socket():
+    path = os.path.join(tempfile.mkdtemp(), "relay.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path) # Socket file with nobody listening
+    stale.close()
+    relay = GameRelay(path)
+    try:
+        with pytest.raises(OSError):
+            GameRelay(path)
+    finally:
+        relay.close()
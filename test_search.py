@@ -0,0 +1,12 @@
+# test_search.py
+"""Tests for the budgets of the iterative-deepening search in search.py."""
+from game_state import GameState
+from mnk import winning_lines
+from search import _Search
+
+
+def test_clock_is_read_more_often_on_large_boards():
+    small = _Search(GameState(), 50, None)
+    large = _Search(GameState(None, winning_lines(15, 15, 5), 225), 50, None)
+    assert large.time_check_interval < 8 < small.time_check_interval
+
@@ -0,0 +1,27 @@
+# test_server.py
+"""Tests for the checking of client requests (strategy options, moves) in server.py."""
+import pytest
+
+from server import Session, client_strategy_options
+
+
+def test_options_are_clamped():
+    request = {'op': 'new', 'difficulty': 'mcts', 'iterations': 10 ** 9, 'workers': 64, 'exploration': -1}
+    assert client_strategy_options('mcts', request) == {'iterations': 20_000, 'workers': 1, 'exploration': 0.0}
+
+
+@pytest.mark.parametrize("difficulty, option, value", [
+    ('hard', 'scheduler', None), # Game's own keyword arguments are never accepted
+    ('hard', 'iterations', 10), # Not an option of this strategy
+    ('search', 'node_budget', True),
+    ('mcts', 'reuse_tree', 1),
+])
+def test_bad_options_are_refused(difficulty, option, value):
+    with pytest.raises(ValueError):
+        client_strategy_options(difficulty, {'op': 'new', 'difficulty': difficulty, option: value})
+
+
+@pytest.mark.parametrize("position", [True, False, "5", 0, 10])
+def test_invalid_positions_are_refused(position):
+    session = Session(1, lambda message: None, 'hard', None, 0, {})
+    assert session.move(position) == f"invalid position {position!r}"
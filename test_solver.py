@@ -0,0 +1,46 @@
+# test_solver.py
+"""Checks solver.py against a plain minimax over list boards."""
+from functools import lru_cache
+
+import solver
+from board import get_empty_cells
+from game_logic import check_win
+from opening_book import enumerate_positions, player_to_move
+
+
+@lru_cache(maxsize=None)
+def minimax(cells, to_move):
+    """Value for the player to move, on solver.py's scale (win in fewer plies scores higher)."""
+    board = list(cells)
+    other = 'O' if to_move == 'X' else 'X'
+    empty_cells = get_empty_cells(board)
+    if check_win(board, other):
+        return -(len(empty_cells) + 1)
+    if not empty_cells:
+        return 0
+    best = None
+    for index in empty_cells:
+        board[index] = to_move
+        value = -minimax(tuple(board), other)
+        board[index] = ' '
+        best = value if best is None else max(best, value)
+    return best
+
+
+def test_values_match_minimax():
+    for board in enumerate_positions():
+        to_move = player_to_move(board)
+        assert solver.evaluate(board, to_move) == minimax(tuple(board), to_move), board
+
+
+def test_best_move_is_optimal():
+    for board in enumerate_positions():
+        to_move = player_to_move(board)
+        other = 'O' if to_move == 'X' else 'X'
+        move = solver.get_best_move(board, to_move, other)
+        if check_win(board, other) or not get_empty_cells(board):
+            assert move is None, board
+            continue
+        child = board[:]
+        child[move - 1] = to_move
+        assert -minimax(tuple(child), other) == minimax(tuple(board), to_move), board
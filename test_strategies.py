@@ -0,0 +1,68 @@
+# test_strategies.py
+"""Tests for the strategy registry on finished and open positions."""
+import pytest
+
+from ai_player import get_ai_move, get_ai_moves_batch
+from game_state import GameState
+from mnk import winning_lines
+from seeding import derive_rng
+from strategies import create_strategy
+import mcts
+
+WON_BOARD = list('XXX OO   ') # X has won; cells are still empty
+
+
+def test_search_on_won_board_returns_none():
+    assert get_ai_move(WON_BOARD, 'O', 'X', 'search', node_budget=1000) is None
+
+
+def test_search_takes_winning_move():
+    board = list('XX OO    ')
+    assert get_ai_move(board, 'O', 'X', 'search', node_budget=100000) == 6
+
+
+def test_every_strategy_returns_none_on_won_board():
+    for difficulty in ('easy', 'hard', 'impossible', 'search', 'mcts'):
+        assert get_ai_move(WON_BOARD, 'O', 'X', difficulty) is None, difficulty
+
+
+def test_mcts_on_won_board_returns_none():
+    strategy = create_strategy("mcts", iterations=50)
+    # choose_move directly: the strategy itself must not crash on move=None
+    assert strategy.choose_move(WON_BOARD, 'O', 'X', GameState(WON_BOARD))[0] is None
+
+
+def test_batch_matches_scalar_on_won_board():
+    assert get_ai_moves_batch([WON_BOARD, list("X   O    ")], "O", "hard")[0] is None
+
+
+def _board_4x4(cells):
+    """GameState for a 4x4 board with 4 in a row to win."""
+    return GameState(list(cells), winning_lines(4, 4, 4), 16)
+
+
+@pytest.mark.parametrize("name, config", [
+    ("heuristic", {}), ("search", {"node_budget": 20000}), ("mcts", {"iterations": 2000}),
+])
+def test_4x4_three_in_a_row_is_not_a_win(name, config):
+    # X on 0,1,2 only wins on a 3x3 board; O completes its row at cell 8
+    state = _board_4x4('XXX OOO' + ' ' * 9)
+    assert create_strategy(name, **config).get_move(state, 'O', 'X') == 8
+
+
+def test_list_board_must_be_3x3():
+    with pytest.raises(ValueError):
+        create_strategy("heuristic").get_move(list('XXX OOO' + ' ' * 9), 'O', 'X')
+    with pytest.raises(ValueError):
+        create_strategy("perfect").get_move(_board_4x4(' ' * 16), 'O', 'X')
+
+
+def test_parallel_mcts_is_seeded_by_the_rng():
+    state = GameState(list('X   O    '))
+    try:
+        first, second = (mcts.parallel_mcts(state, 'X', 'O', 2, 400, rng=derive_rng(3, "game", 0))
+                         for _ in range(2))
+        assert first[:4] == second[:4] and mcts._pools # move, visits, value, iterations
+    finally:
+        mcts.shutdown_pools()
+    assert not mcts._pools